@@ -1,7 +1,9 @@
 import configparser
-import requests
 from typing import Optional, List, Dict
 
+from canvas_api_utils import get_client
+from canvas_course_index import get_course_index
+
 # --------------------------------------------------
 # Load configuration
 # --------------------------------------------------
@@ -21,6 +23,8 @@ COURSE_ID = int(config[CONFIG_SECTION]['COURSE_ID'])
 API_TOKEN = config[CONFIG_SECTION]['API_TOKEN'].strip()
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]['CANVAS_DOMAIN_URL'].rstrip('/')
 
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN)
+
 # If CANVAS_DOMAIN_URL already includes "https://", this is fine.
 # Example: https://mcc.instructure.com -> https://mcc.instructure.com/api/v1
 CANVAS_BASE_URL = f"{CANVAS_DOMAIN_URL}/api/v1"
@@ -29,42 +33,21 @@ CANVAS_BASE_URL = f"{CANVAS_DOMAIN_URL}/api/v1"
 # --------------------------------------------------
 # Helpers
 # --------------------------------------------------
-def get_headers() -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {API_TOKEN}",
-        "Accept": "application/json"
-    }
-
-
 def find_module_by_name_contains(course_id: int, keyword: str) -> Optional[Dict]:
     """
     Return the first module whose name *contains* the keyword (case-insensitive).
     Example: keyword="Module 2" matches "Module 2 – Week Two".
+    Looked up in the course index, so modules are listed once per run.
     """
-    url = f"{CANVAS_BASE_URL}/courses/{course_id}/modules"
-    params = {"per_page": 100}
-
-    resp = requests.get(url, headers=get_headers(), params=params)
-    resp.raise_for_status()
-
-    keyword = keyword.lower()
-    for module in resp.json():
-        name = (module.get("name") or "").lower()
-        if keyword in name:
-            return module
-
-    return None
+    return get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, course_id).find_containing("modules", keyword)
 
 
 def get_module_items(course_id: int, module_id: int) -> List[Dict]:
     """
-    Return all items in a module.
+    Return all items in a module, from the modules-with-items listing loaded
+    once in main() (or one items listing if the module wasn't in it).
     """
-    url = f"{CANVAS_BASE_URL}/courses/{course_id}/modules/{module_id}/items"
-    params = {"per_page": 100}
-    resp = requests.get(url, headers=get_headers(), params=params)
-    resp.raise_for_status()
-    return resp.json()
+    return get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, course_id).module_items(module_id)
 
 
 def header_exists_in_module(items: List[Dict], title: str) -> bool:
@@ -95,15 +78,21 @@ def create_subheader_item(
         "module_item[published]": True,
     }
 
-    resp = requests.post(url, headers=get_headers(), data=data)
+    resp = CLIENT.post(url, data=data)
     resp.raise_for_status()
-    return resp.json()
+    created = resp.json()
+    get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, course_id).add_module_item(module_id, created)
+    return created
 
 
 # --------------------------------------------------
 # Main
 # --------------------------------------------------
 def main():
+    # Every module and its items in one paginated pass; the loop below
+    # works against that instead of listing per module.
+    get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, COURSE_ID).load_modules_with_items()
+
     for n in range(2, 11):  # Modules 2–10 inclusive
         print("=" * 60)
         module_keyword = f"Module {n}"
@@ -136,7 +125,7 @@ def main():
             )
             print(f"    Created (item id={created_disc.get('id')}, position={created_disc.get('position')})")
 
-        # 4) Refresh items (optional but safer if you care about positions)
+        # 4) Refresh items (the header we just added is recorded in the index)
         items = get_module_items(COURSE_ID, module_id)
 
         # 5) Ensure "Assignments" header at position 3
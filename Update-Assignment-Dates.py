@@ -18,12 +18,16 @@ All assignments sharing the same chapter number receive the same:
     lock_at   (Available Until)
 """
 
+import asyncio
 import configparser
-import requests
 import re
 from datetime import datetime
 from zoneinfo import ZoneInfo  # NEW: for DST-aware timestamps
 
+from canvas_api_async import AsyncCanvasClient, gather_settled
+from canvas_api_utils import get_client
+from canvas_bulk_dates import bulk_update_assignment_dates
+
 # --------------------------------------------------------------------
 # CONFIG
 # --------------------------------------------------------------------
@@ -37,6 +41,13 @@ AVAILABLE_TIME = "00:00:00"
 DUE_TIME = "23:59:00"
 
 DRY_RUN = False  # flip to True for testing if you want
+# Send all date changes through assignments/bulk_update (one async job per
+# 100 assignments). False sends one PUT per assignment as before.
+BULK_UPDATE = True
+# With BULK_UPDATE off, send the single PUTs concurrently through the
+# asyncio client (ASYNC_CONCURRENCY in flight) instead of one at a time.
+USE_ASYNC = False
+ASYNC_CONCURRENCY = 50
 
 # Per-chapter dates (chapter N == module N)
 # Format: "M/D"
@@ -67,37 +78,16 @@ COURSE_ID = int(config[CONFIG_SECTION]["COURSE_ID"])
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"].rstrip("/")
 
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN)
+
 
 # --------------------------------------------------------------------
 # Canvas helpers
 # --------------------------------------------------------------------
 
-def canvas_headers():
-    return {"Authorization": f"Bearer {API_TOKEN}", "Accept": "application/json"}
-
-
 def list_assignments(course_id):
-    assignments = []
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/assignments"
-    params = {"per_page": 100}
-
-    while url:
-        r = requests.get(url, headers=canvas_headers(), params=params)
-        r.raise_for_status()
-        assignments.extend(r.json())
-
-        next_url = None
-        link = r.headers.get("Link", "")
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                next_url = part[part.find("<") + 1: part.find(">")]
-                break
-
-        url = next_url
-        params = {}
-
-    return assignments
+    return CLIENT.paginate_all(url)
 
 
 def update_assignment_dates(course_id, assignment_id, unlock_at, due_at):
@@ -107,11 +97,26 @@ def update_assignment_dates(course_id, assignment_id, unlock_at, due_at):
         "assignment[lock_at]": due_at,  # Available Until = Due Date
     }
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}"
-    r = requests.put(url, headers=canvas_headers(), data=payload)
+    r = CLIENT.put(url, data=payload)
     r.raise_for_status()
     return r.json()
 
 
+async def update_assignment_dates_async(course_id, updates):
+    """Send every update's PUT concurrently; returns (json, error) per update."""
+    async with AsyncCanvasClient(CANVAS_DOMAIN_URL, API_TOKEN, concurrency=ASYNC_CONCURRENCY) as client:
+        async def put_one(u):
+            r = await client.put(client.course_url(course_id, f"assignments/{u['id']}"), data={
+                "assignment[unlock_at]": u["unlock_at"],
+                "assignment[due_at]": u["due_at"],
+                "assignment[lock_at]": u["lock_at"],
+            })
+            r.raise_for_status()
+            return r.json()
+
+        return await gather_settled([put_one(u) for u in updates])
+
+
 # --------------------------------------------------------------------
 # Helper: build Canvas ISO timestamp (DST-aware)
 # --------------------------------------------------------------------
@@ -155,6 +160,7 @@ def main():
     print(f"Updating assignments for COURSE_ID={COURSE_ID} (DRY_RUN={DRY_RUN})\n")
 
     assignments = list_assignments(COURSE_ID)
+    pending = []
 
     for a in assignments:
         name = a.get("name", "")
@@ -187,11 +193,42 @@ def main():
             print("        (DRY RUN: no changes applied)\n")
             continue
 
+        if BULK_UPDATE or USE_ASYNC:
+            pending.append({
+                "id": assignment_id,
+                "unlock_at": unlock_at_iso,
+                "due_at": due_at_iso,
+                "lock_at": due_at_iso,  # Available Until = Due Date
+            })
+            print()
+            continue
+
         updated = update_assignment_dates(COURSE_ID, assignment_id, unlock_at_iso, due_at_iso)
         print(f"        [UPDATED] unlock_at: {updated.get('unlock_at')}")
         print(f"        [UPDATED] due_at:   {updated.get('due_at')}")
         print(f"        [UPDATED] lock_at:  {updated.get('lock_at')}\n")
 
+    if pending and not BULK_UPDATE:
+        print(f"Sending {len(pending)} date changes concurrently...")
+        results = asyncio.run(update_assignment_dates_async(COURSE_ID, pending))
+        for u, (updated, error) in zip(pending, results):
+            if error:
+                print(f"  [FAILED] assignment {u['id']}: {error}")
+            else:
+                print(f"  [UPDATED] '{updated.get('name')}' due_at: {updated.get('due_at')}")
+    elif pending:
+        print(f"Sending {len(pending)} date changes via bulk_update...")
+        report = bulk_update_assignment_dates(
+            CLIENT,
+            COURSE_ID,
+            pending,
+            lambda u: update_assignment_dates(COURSE_ID, u["id"], u["unlock_at"], u["due_at"]),
+        )
+        print(f"  [UPDATED] via bulk_update: {len(report['bulk'])}")
+        print(f"  [UPDATED] via single PUT:  {len(report['fallback'])}")
+        if report["failed"]:
+            print(f"  [FAILED] {len(report['failed'])}: {report['failed']}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
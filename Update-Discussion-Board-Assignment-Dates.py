@@ -16,11 +16,15 @@ Logic:
     assignment[lock_at]               = Due Date
 """
 
+import asyncio
 import configparser
-import requests
-import re
 from datetime import datetime
 
+from canvas_api_async import AsyncCanvasClient, gather_settled
+from canvas_api_utils import get_client
+from canvas_bulk_dates import bulk_update_assignment_dates
+from canvas_course_index import module_number
+
 # --------------------------------------------------------------------
 # Config
 # --------------------------------------------------------------------
@@ -34,6 +38,13 @@ AVAILABLE_TIME = "00:00:00"
 DUE_TIME = "23:59:00"
 
 DRY_RUN = False            # set to False to actually update Canvas
+# Graded-discussion assignment dates go through assignments/bulk_update in
+# one job; False sends one assignment PUT per discussion as before.
+BULK_UPDATE = True
+# Send the per-discussion PUTs concurrently through the asyncio client
+# (ASYNC_CONCURRENCY in flight) instead of one after another.
+USE_ASYNC = False
+ASYNC_CONCURRENCY = 50
 
 # Per-module dates (same as you provided)
 # Format: "M/D"
@@ -67,45 +78,19 @@ COURSE_ID = int(config[CONFIG_SECTION]["COURSE_ID"])
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"].rstrip("/")
 
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN)
+
 
 # --------------------------------------------------------------------
 # Canvas helpers
 # --------------------------------------------------------------------
 
-def canvas_headers():
-    return {
-        "Authorization": f"Bearer {API_TOKEN}",
-        "Accept": "application/json",
-    }
-
-
 def list_discussions(course_id: int):
     """
     List all discussion topics for a course (handles pagination).
     """
-    topics = []
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/discussion_topics"
-    params = {"per_page": 100}
-
-    while url:
-        r = requests.get(url, headers=canvas_headers(), params=params)
-        r.raise_for_status()
-        topics.extend(r.json())
-
-        link = r.headers.get("Link", "")
-        next_url = None
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                start = part.find("<") + 1
-                end = part.find(">")
-                next_url = part[start:end]
-                break
-
-        url = next_url
-        params = {}
-
-    return topics
+    return CLIENT.paginate_all(url)
 
 
 def update_discussion_dates(course_id: int, topic_id: int,
@@ -119,7 +104,7 @@ def update_discussion_dates(course_id: int, topic_id: int,
         "discussion_topic[delayed_post_at]": delayed_post_at_iso,
         "discussion_topic[lock_at]": lock_at_iso,
     }
-    r = requests.put(url, headers=canvas_headers(), data=payload)
+    r = CLIENT.put(url, data=payload)
     r.raise_for_status()
     return r.json()
 
@@ -128,29 +113,8 @@ def list_assignments(course_id: int):
     """
     List all assignments for a course (used for graded discussions with assignment_id).
     """
-    assignments = []
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/assignments"
-    params = {"per_page": 100}
-
-    while url:
-        r = requests.get(url, headers=canvas_headers(), params=params)
-        r.raise_for_status()
-        assignments.extend(r.json())
-
-        link = r.headers.get("Link", "")
-        next_url = None
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                start = part.find("<") + 1
-                end = part.find(">")
-                next_url = part[start:end]
-                break
-
-        url = next_url
-        params = {}
-
-    return assignments
+    return CLIENT.paginate_all(url)
 
 
 def update_assignment_dates(course_id: int, assignment_id: int,
@@ -164,11 +128,43 @@ def update_assignment_dates(course_id: int, assignment_id: int,
         "assignment[due_at]": due_at_iso,
         "assignment[lock_at]": due_at_iso,  # Available Until = Due Date
     }
-    r = requests.put(url, headers=canvas_headers(), data=payload)
+    r = CLIENT.put(url, data=payload)
     r.raise_for_status()
     return r.json()
 
 
+async def update_dates_async(course_id: int, topic_updates, assignment_updates):
+    """
+    Send every discussion (and non-bulk assignment) date PUT concurrently.
+
+    Returns (topic_results, assignment_results), each a list of
+    (updated_json, error) in input order.
+    """
+    async with AsyncCanvasClient(CANVAS_DOMAIN_URL, API_TOKEN, concurrency=ASYNC_CONCURRENCY) as client:
+        async def put_json(url, data):
+            r = await client.put(url, data=data)
+            r.raise_for_status()
+            return r.json()
+
+        topic_calls = [
+            put_json(client.course_url(course_id, f"discussion_topics/{u['id']}"), {
+                "discussion_topic[delayed_post_at]": u["delayed_post_at"],
+                "discussion_topic[lock_at]": u["lock_at"],
+            })
+            for u in topic_updates
+        ]
+        assignment_calls = [
+            put_json(client.course_url(course_id, f"assignments/{u['id']}"), {
+                "assignment[unlock_at]": u["unlock_at"],
+                "assignment[due_at]": u["due_at"],
+                "assignment[lock_at]": u["lock_at"],
+            })
+            for u in assignment_updates
+        ]
+        results = await gather_settled(topic_calls + assignment_calls)
+    return results[:len(topic_calls)], results[len(topic_calls):]
+
+
 # --------------------------------------------------------------------
 # Helpers
 # --------------------------------------------------------------------
@@ -189,10 +185,7 @@ def extract_module_from_title(title: str):
       'Module 10 - Something'
     Returns int or None.
     """
-    m = re.search(r"Module\s+(\d+)", title, re.IGNORECASE)
-    if not m:
-        return None
-    return int(m.group(1))
+    return module_number(title)
 
 
 # --------------------------------------------------------------------
@@ -205,6 +198,10 @@ def main():
 
     topics = list_discussions(COURSE_ID)
     assignments = {a["id"]: a for a in list_assignments(COURSE_ID)}
+    pending = []
+    # USE_ASYNC: PUTs collected here and sent together after the loop.
+    topic_updates = []
+    assignment_updates = []
 
     for topic in topics:
         title = topic.get("title", "")
@@ -244,13 +241,38 @@ def main():
             continue
 
         # Update discussion dates
-        updated_topic = update_discussion_dates(COURSE_ID, topic_id,
-                                                delayed_post_at_iso, lock_at_iso)
-        print(f"        [UPDATED] Discussion delayed_post_at: {updated_topic.get('delayed_post_at')}")
-        print(f"        [UPDATED] Discussion lock_at:        {updated_topic.get('lock_at')}")
+        if USE_ASYNC:
+            topic_updates.append({
+                "id": topic_id,
+                "title": title,
+                "delayed_post_at": delayed_post_at_iso,
+                "lock_at": lock_at_iso,
+            })
+            print("        Discussion dates queued for async update.")
+        else:
+            updated_topic = update_discussion_dates(COURSE_ID, topic_id,
+                                                    delayed_post_at_iso, lock_at_iso)
+            print(f"        [UPDATED] Discussion delayed_post_at: {updated_topic.get('delayed_post_at')}")
+            print(f"        [UPDATED] Discussion lock_at:        {updated_topic.get('lock_at')}")
 
         # If graded discussion, also update its assignment
-        if assignment_id and assignment_id in assignments:
+        if assignment_id and assignment_id in assignments and BULK_UPDATE:
+            pending.append({
+                "id": assignment_id,
+                "unlock_at": unlock_at_iso,
+                "due_at": due_at_iso,
+                "lock_at": due_at_iso,
+            })
+            print("        Assignment dates queued for bulk_update.\n")
+        elif assignment_id and assignment_id in assignments and USE_ASYNC:
+            assignment_updates.append({
+                "id": assignment_id,
+                "unlock_at": unlock_at_iso,
+                "due_at": due_at_iso,
+                "lock_at": due_at_iso,
+            })
+            print("        Assignment dates queued for async update.\n")
+        elif assignment_id and assignment_id in assignments:
             updated_assignment = update_assignment_dates(
                 COURSE_ID,
                 assignment_id,
@@ -263,6 +285,37 @@ def main():
         else:
             print("        No linked assignment to update.\n")
 
+    if topic_updates or assignment_updates:
+        print(f"Sending {len(topic_updates) + len(assignment_updates)} date changes concurrently...")
+        topic_results, assignment_results = asyncio.run(
+            update_dates_async(COURSE_ID, topic_updates, assignment_updates)
+        )
+        for u, (updated, error) in zip(topic_updates, topic_results):
+            if error:
+                print(f"  [FAILED] Discussion '{u['title']}': {error}")
+            else:
+                print(f"  [UPDATED] Discussion '{u['title']}': "
+                      f"{updated.get('delayed_post_at')} → {updated.get('lock_at')}")
+        for u, (updated, error) in zip(assignment_updates, assignment_results):
+            if error:
+                print(f"  [FAILED] Assignment {u['id']}: {error}")
+            else:
+                print(f"  [UPDATED] Assignment {u['id']}: due_at {updated.get('due_at')}")
+        print()
+
+    if pending:
+        print(f"Sending {len(pending)} graded-discussion date changes via bulk_update...")
+        report = bulk_update_assignment_dates(
+            CLIENT,
+            COURSE_ID,
+            pending,
+            lambda u: update_assignment_dates(COURSE_ID, u["id"], u["unlock_at"], u["due_at"]),
+        )
+        print(f"  [UPDATED] via bulk_update: {len(report['bulk'])}")
+        print(f"  [UPDATED] via single PUT:  {len(report['fallback'])}")
+        if report["failed"]:
+            print(f"  [FAILED] {len(report['failed'])}: {report['failed']}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,12 @@
 import configparser
-import requests
 from typing import Optional, Dict, List, Tuple
 
+import requests
+
+from canvas_api_utils import DEFAULT_MAX_WORKERS, get_client, run_concurrently
+from canvas_course_index import get_course_index
+from canvas_response_cache import cache_from_config
+
 # --------------------------------------------------
 # Load configuration
 # --------------------------------------------------
@@ -21,6 +26,11 @@ COURSE_ID = int(config[CONFIG_SECTION]["COURSE_ID"])
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"]
 
+MAX_WORKERS = int(config[CONFIG_SECTION].get("MAX_WORKERS", DEFAULT_MAX_WORKERS))
+
+# Listings are revalidated with ETags instead of re-downloaded each run.
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN, cache=cache_from_config(config[CONFIG_SECTION]))
+
 
 # --------------------------------------------------
 # Desired module titles for 1–10
@@ -44,26 +54,6 @@ MODULE_NUMBERS: List[int] = list(NEW_TITLES.keys())
 # --------------------------------------------------
 # Helpers
 # --------------------------------------------------
-def get_headers() -> dict:
-    return {
-        "Authorization": f"Bearer {API_TOKEN}",
-        "Accept": "application/json",
-    }
-
-
-def get_all_modules(course_id: int) -> list:
-    """
-    Retrieve all modules (up to 100) for this course.
-    If you have more than 100, we can add pagination.
-    """
-    url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/modules"
-    params = {"per_page": 100}
-
-    resp = requests.get(url, headers=get_headers(), params=params)
-    resp.raise_for_status()
-    return resp.json()
-
-
 def find_module_by_number_prefix(course_id: int, module_number: int) -> Optional[dict]:
     """
     Find the first module whose name starts with 'Module {module_number}'.
@@ -71,13 +61,12 @@ def find_module_by_number_prefix(course_id: int, module_number: int) -> Optional
     Example match:
       'Module 1 - 1.0 Penetration Testing: Before You Begin'
       'Module 1' (plain)
+    but not 'Module 10 - ...'. Modules are listed once per run through the
+    course index.
     """
-    prefix = f"Module {module_number}"
-    modules = get_all_modules(course_id)
-
-    for module in modules:
-        name = module.get("name", "")
-        if name.startswith(prefix):
+    index = get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, course_id)
+    for module in index.for_module("modules", module_number):
+        if module.get("name", "").startswith("Module "):
             return module
 
     return None
@@ -93,7 +82,7 @@ def update_module_name(course_id: int, module_id: int, new_name: str) -> dict:
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/modules/{module_id}"
     data = {"module[name]": new_name}
 
-    resp = requests.put(url, headers=get_headers(), data=data)
+    resp = CLIENT.put(url, data=data)
     resp.raise_for_status()
     return resp.json()
 
@@ -105,40 +94,52 @@ def main():
     print(f"Renaming modules 1–10 in course {COURSE_ID}...\n")
 
     successes: List[Tuple[str, str]] = []
+    unchanged: List[str] = []
     failures: List[Tuple[str, str]] = []
+    renames: List[Tuple[str, dict, str]] = []
 
+    # Match every number against the one module listing first...
     for number in MODULE_NUMBERS:
         new_title = NEW_TITLES[number]
         prefix = f"Module {number}"
 
-        print(f"--- Processing modules starting with {prefix!r} ---")
-        print(f"  New desired title: {new_title!r}")
-
         try:
             module = find_module_by_number_prefix(COURSE_ID, number)
-            if not module:
-                msg = f"No module found whose name starts with {prefix!r}."
-                print("  ERROR:", msg)
-                failures.append((prefix, msg))
-                print()
-                continue
-
-            old_name = module.get("name", f"(id {module.get('id')})")
-            module_id = module["id"]
-            print(f"  Found module: {old_name!r} (ID: {module_id})")
-            print(f"  Renaming to: {new_title!r}")
-
-            updated = update_module_name(COURSE_ID, module_id, new_title)
-
-            print(f"  ✔ Updated. Canvas now shows: {updated.get('name')!r}")
-            successes.append((old_name, updated.get("name", "")))
-
-        except Exception as e:
-            msg = f"Exception: {e}"
+        except requests.exceptions.RequestException as e:
+            print(f"  ERROR listing modules: {e}")
+            failures.append((prefix, f"Exception: {e}"))
+            break
+
+        if not module:
+            msg = f"No module found whose name starts with {prefix!r}."
+            print(f"  [{prefix}] ERROR:", msg)
+            failures.append((prefix, msg))
+        elif module.get("name") == new_title:
+            print(f"  [{prefix}] Already named {new_title!r}; skipping.")
+            unchanged.append(new_title)
+        else:
+            renames.append((prefix, module, new_title))
+
+    # ...then send only the real renames, MAX_WORKERS at a time.
+    def rename(entry):
+        prefix, module, new_title = entry
+        try:
+            return update_module_name(COURSE_ID, module["id"], new_title), None
+        except requests.exceptions.RequestException as e:
+            return None, e
+
+    if renames:
+        print(f"\nSending {len(renames)} rename(s)...\n")
+    for (prefix, module, new_title), (updated, error) in zip(renames, run_concurrently(rename, renames, MAX_WORKERS)):
+        old_name = module.get("name", f"(id {module.get('id')})")
+        print(f"--- {prefix}: {old_name!r} (ID: {module['id']}) -> {new_title!r}")
+        if error is not None:
+            msg = f"Exception: {error}"
             print("  ERROR:", msg)
             failures.append((prefix, msg))
-
-        print()  # blank line between modules
+            continue
+        print(f"  ✔ Updated. Canvas now shows: {updated.get('name')!r}")
+        successes.append((old_name, updated.get("name", "")))
 
     # Summary
     print("====================================================")
@@ -147,6 +148,10 @@ def main():
     for old, new in successes:
         print(f"    - {old!r}  ->  {new!r}")
 
+    print(f"  Already up to date (no request sent): {len(unchanged)}")
+    for name in unchanged:
+        print(f"    - {name!r}")
+
     if failures:
         print(f"\n  Failures: {len(failures)}")
         for prefix, err in failures:
@@ -22,7 +22,11 @@ Assumptions:
 """
 
 import configparser
-import requests
+
+from canvas_api_utils import get_client
+from canvas_course_index import get_course_index
+from canvas_course_plan import diff_fields
+from canvas_push_hashes import store_from_config
 
 # --------------------------------------------------------------------
 # Settings
@@ -51,6 +55,11 @@ COURSE_ID = int(config[CONFIG_SECTION]["COURSE_ID"])
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"].rstrip("/")
 
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN)
+
+# Hashes of the bodies we pushed (opt-in via PUSH_HASH_PATH; unset, empty or off disables).
+PUSH_HASHES = store_from_config(config[CONFIG_SECTION])
+
 # --------------------------------------------------------------------
 # Module metadata: title, intro, subsections with descriptions
 # --------------------------------------------------------------------
@@ -368,49 +377,25 @@ MODULES = {
 # --------------------------------------------------------------------
 
 
-def canvas_headers():
-    return {
-        "Authorization": f"Bearer {API_TOKEN}",
-        "Accept": "application/json",
-    }
-
-
-def list_pages_for_course(course_id: int):
-    pages = []
+def list_pages_for_course(course_id: int, include_body: bool = False):
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/pages"
-    params = {"per_page": 100}
+    params = {"include[]": "body"} if include_body else None
+    return CLIENT.paginate_all(url, params=params)
 
-    while url:
-        r = requests.get(url, headers=canvas_headers(), params=params)
-        r.raise_for_status()
-        pages.extend(r.json())
 
-        link = r.headers.get("Link", "")
-        next_url = None
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                start = part.find("<") + 1
-                end = part.find(">")
-                next_url = part[start:end]
-                break
-
-        url = next_url
-        params = {}
-
-    return pages
-
-
-def find_page_for_module(course_id: int, module_number: int):
+def find_page_for_module(index, module_number: int):
     """
     Find the Canvas page whose title contains 'Module X' (case-insensitive).
+    'Module 1' does not match 'Module 10 ...'.
     """
-    fragment = f"Module {module_number}".lower()
-    for page in list_pages_for_course(course_id):
-        title = page.get("title", "").lower()
-        if fragment in title:
-            return page
-    return None
+    return index.first_for_module("pages", module_number)
+
+
+def get_page(course_id: int, page_url: str):
+    url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/pages/{page_url}"
+    r = CLIENT.get(url)
+    r.raise_for_status()
+    return r.json()
 
 
 def update_canvas_page_body(course_id: int, page_url: str, html_body: str):
@@ -419,7 +404,7 @@ def update_canvas_page_body(course_id: int, page_url: str, html_body: str):
     """
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/pages/{page_url}"
     payload = {"wiki_page[body]": html_body}
-    r = requests.put(url, headers=canvas_headers(), data=payload)
+    r = CLIENT.put(url, data=payload)
     r.raise_for_status()
     return r.json()
 
@@ -473,11 +458,18 @@ def get_module_html(module_number: int) -> str:
 def main():
     print(f"Running update for course {COURSE_ID} (DRY_RUN={DRY_RUN})")
 
+    # One listing gives us the current state of every page. With the push
+    # record the bodies can stay out of it: a page we pushed and nobody has
+    # edited since is recognized by body hash + updated_at.
+    index = get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, COURSE_ID)
+    index.preload("pages", list_pages_for_course(COURSE_ID, include_body=PUSH_HASHES is None))
+    updated = unchanged = 0
+
     for module_number in range(1, 11):
         print("-" * 70)
         print(f"Processing Module {module_number}...")
 
-        page = find_page_for_module(COURSE_ID, module_number)
+        page = find_page_for_module(index, module_number)
         if not page:
             print(f"  [WARN] No Canvas page found with 'Module {module_number}' in title.")
             continue
@@ -485,14 +477,34 @@ def main():
         html = get_module_html(module_number)
         print(f"  Found page: {page['title']} (slug: {page['url']})")
 
+        if PUSH_HASHES and PUSH_HASHES.is_current(COURSE_ID, "pages", page["url"], html, page.get("updated_at")):
+            print("  [SKIP] Page body unchanged since our last push.")
+            unchanged += 1
+            continue
+
+        if "body" not in page:
+            page = get_page(COURSE_ID, page["url"])
+        if not diff_fields({"body": html}, page, ["body"]):
+            print("  [SKIP] Page body already up to date.")
+            if PUSH_HASHES:
+                PUSH_HASHES.record(COURSE_ID, "pages", page["url"], html, page.get("updated_at"))
+            unchanged += 1
+            continue
+
         if DRY_RUN:
             print("  [DRY RUN] Would update with HTML:")
             print(html)
             continue
 
-        update_canvas_page_body(COURSE_ID, page["url"], html)
+        updated_page = update_canvas_page_body(COURSE_ID, page["url"], html)
+        if PUSH_HASHES:
+            PUSH_HASHES.record(COURSE_ID, "pages", page["url"], html, updated_page.get("updated_at"))
+        updated += 1
         print("  [OK] Page updated.")
 
+    print("-" * 70)
+    print(f"Updated: {updated}  Unchanged: {unchanged}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
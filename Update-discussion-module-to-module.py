@@ -1,7 +1,10 @@
 import configparser
-import requests
 from typing import Optional, List
 
+from canvas_api_utils import get_client
+from canvas_course_index import get_course_index
+from canvas_response_cache import cache_from_config
+
 # --------------------------------------------------
 # Load configuration
 # --------------------------------------------------
@@ -21,65 +24,35 @@ COURSE_ID = int(config[CONFIG_SECTION]['COURSE_ID'])
 API_TOKEN = config[CONFIG_SECTION]['API_TOKEN'].strip()
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]['CANVAS_DOMAIN_URL'].rstrip('/')
 
+# Listings are revalidated with ETags instead of re-downloaded each run.
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN, cache=cache_from_config(config[CONFIG_SECTION]))
+
 CANVAS_BASE_URL = f"{CANVAS_DOMAIN_URL}/api/v1"
 
 
 # --------------------------------------------------
 # Helpers
 # --------------------------------------------------
-def get_headers() -> dict:
-    return {
-        "Authorization": f"Bearer {API_TOKEN}",
-        "Accept": "application/json"
-    }
-
-
 def find_module_by_name_contains(course_id: int, keyword: str) -> Optional[dict]:
     """
     Return the first module whose name *contains* the keyword (case-insensitive).
     Example: keyword="Module 2" matches "Module 2 – Week Two".
+    Looked up in the course index, so modules are listed once per run.
     """
-    url = f"{CANVAS_BASE_URL}/courses/{course_id}/modules"
-    params = {"per_page": 100}
-
-    resp = requests.get(url, headers=get_headers(), params=params)
-    resp.raise_for_status()
-
-    keyword = keyword.lower()
-    for module in resp.json():
-        name = (module.get("name") or "").lower()
-        if keyword in name:
-            return module
-
-    return None
+    return get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, course_id).find_containing("modules", keyword)
 
 
 def find_discussion_by_title_contains(course_id: int, keyword: str) -> Optional[dict]:
     """
     Return the first discussion whose title *contains* the keyword (case-insensitive).
-    Example: keyword="Module 2" matches "Module 2 Discussion Board".
+    Example: keyword="Module 2" matches "Module 2 Discussion Board", not "Module 20 ...".
     """
-    url = f"{CANVAS_BASE_URL}/courses/{course_id}/discussion_topics"
-    params = {"per_page": 100}
-
-    resp = requests.get(url, headers=get_headers(), params=params)
-    resp.raise_for_status()
-
-    keyword = keyword.lower()
-    for topic in resp.json():
-        title = (topic.get("title") or "").lower()
-        if keyword in title:
-            return topic
-
-    return None
+    return get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, course_id).find_containing("discussion_topics", keyword)
 
 
 def get_module_items(course_id: int, module_id: int) -> List[dict]:
-    url = f"{CANVAS_BASE_URL}/courses/{course_id}/modules/{module_id}/items"
-    params = {"per_page": 100}
-    resp = requests.get(url, headers=get_headers(), params=params)
-    resp.raise_for_status()
-    return resp.json()
+    # Served from the modules-with-items listing loaded once in main().
+    return get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, course_id).module_items(module_id)
 
 
 def discussion_already_in_module(course_id: int, module_id: int, discussion_id: int) -> bool:
@@ -99,15 +72,21 @@ def add_discussion_to_module(course_id: int, module_id: int, discussion_id: int,
         "module_item[title]": item_title,
     }
 
-    resp = requests.post(url, headers=get_headers(), data=data)
+    resp = CLIENT.post(url, data=data)
     resp.raise_for_status()
-    return resp.json()
+    added = resp.json()
+    get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, course_id).add_module_item(module_id, added)
+    return added
 
 
 # --------------------------------------------------
 # Main
 # --------------------------------------------------
 def main():
+    # Every module and its items in one paginated pass; the loop below
+    # works against that instead of listing per module.
+    get_course_index(CANVAS_DOMAIN_URL, API_TOKEN, COURSE_ID).load_modules_with_items()
+
     for n in range(2, 11):  # Modules 2–10
         print("=" * 60)
         print(f"Processing MODULE {n}...")
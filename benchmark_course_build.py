@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark a full main.py-style course build against the local mock Canvas.
+
+Each run starts a fresh mock server with simulated latency, then creates the
+modules, assignment groups, assignments, pages and discussion topics from
+datafiles/ exactly as main.py would. It reports:
+
+  - wall time
+  - total HTTP requests, and requests per method + resource type
+  - bytes sent / received
+  - p50 / p95 client-side call latency
+
+Use --workers to compare sequential and concurrent builds, and
+--max-requests to fail (exit 1) when a change adds per-item lookups.
+
+Usage:
+  python3 benchmark_course_build.py --course CSTC240 --latency 80 --workers 1 8
+  python3 benchmark_course_build.py --workers 8 --max-requests 120 --json
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import warnings
+from typing import Any, Dict, List
+
+import requests
+
+from canvas_assignment_creator import create_multiple_assignments
+from canvas_assignment_groups_creator import create_multiple_assignment_groups
+from canvas_discussion_board import create_discussion_boards
+from canvas_module_creator import create_multiple_modules
+from canvas_page_creator import create_multiple_pages
+from mock_canvas_server import MockCanvasServer
+
+DATAFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datafiles")
+BENCH_COURSE_ID = 4242
+BENCH_TOKEN = "benchmark-token"
+
+# canvasapi warns about the mock's plain-HTTP URL on every Canvas() call.
+warnings.filterwarnings("ignore", message="Canvas may respond unexpectedly")
+
+
+def read_from_json(file_path: str, data_type: str) -> List[Dict[str, Any]]:
+    with open(file_path, "r") as file:
+        data = json.load(file)
+    return data[data_type]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+@contextlib.contextmanager
+def record_call_latency(samples: List[float]):
+    """Time every requests.Session.send (covers our client and canvasapi)."""
+    original = requests.Session.send
+    lock = threading.Lock()
+
+    def timed_send(session, request, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(session, request, **kwargs)
+        finally:
+            with lock:
+                samples.append(time.perf_counter() - start)
+
+    requests.Session.send = timed_send
+    try:
+        yield
+    finally:
+        requests.Session.send = original
+
+
+def run_build(course: str, workers: int, server_opts: Dict[str, Any], quiet: bool = True) -> Dict[str, Any]:
+    server = MockCanvasServer(**server_opts).start()
+    url = server.url
+    samples: List[float] = []
+
+    def datafile(kind: str) -> str:
+        return os.path.join(DATAFILES_DIR, f"{course}-{kind}.json")
+
+    modules = read_from_json(datafile("module-data"), "MODULE_NAMES")
+    groups = read_from_json(datafile("assignment-groups-data"), "ASSIGNMENT_GROUPS")
+    assignments = read_from_json(datafile("assignment-data"), "ASSIGNMENTS")
+    pages = read_from_json(datafile("pages-data"), "PAGES")
+
+    output = io.StringIO() if quiet else sys.stdout
+    start = time.perf_counter()
+    try:
+        with record_call_latency(samples), contextlib.redirect_stdout(output):
+            create_multiple_modules(BENCH_COURSE_ID, BENCH_TOKEN, url, url, modules, max_workers=workers)
+            create_multiple_assignment_groups(BENCH_COURSE_ID, BENCH_TOKEN, url, groups, max_workers=workers)
+            create_multiple_assignments(BENCH_COURSE_ID, BENCH_TOKEN, url, assignments, max_workers=workers)
+            create_multiple_pages(BENCH_COURSE_ID, BENCH_TOKEN, url, pages, max_workers=workers)
+            if os.path.exists(datafile("discussion-topic-data")):
+                create_discussion_boards(BENCH_COURSE_ID, BENCH_TOKEN, url, datafile("discussion-topic-data"))
+        wall = time.perf_counter() - start
+    finally:
+        with server.stats_lock:
+            stats = json.loads(json.dumps(server.stats))
+        server.stop()
+
+    return {
+        "course": course,
+        "workers": workers,
+        "wall_time_s": round(wall, 3),
+        "requests": stats["requests"],
+        "by_resource": dict(sorted(stats["by_resource"].items())),
+        "by_status": stats["by_status"],
+        "bytes_sent": stats["bytes_in"],
+        "bytes_received": stats["bytes_out"],
+        "throttled": stats["throttled"],
+        "latency_p50_ms": round(percentile(samples, 50) * 1000, 1),
+        "latency_p95_ms": round(percentile(samples, 95) * 1000, 1),
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print("=" * 60)
+    print(f"Course {result['course']} | workers={result['workers']}")
+    print(f"  Wall time:        {result['wall_time_s']:.2f}s")
+    print(f"  HTTP requests:    {result['requests']}  (throttled: {result['throttled']})")
+    print(f"  Bytes sent/recv:  {result['bytes_sent']} / {result['bytes_received']}")
+    print(f"  Call latency:     p50 {result['latency_p50_ms']}ms  p95 {result['latency_p95_ms']}ms")
+    print("  Requests by resource:")
+    for key, count in result["by_resource"].items():
+        print(f"    {key:<32} {count}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark a full course build against the mock Canvas server.")
+    ap.add_argument("--course", default="CSTC240", help="Datafile prefix under datafiles/ (e.g. CSTC240).")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1], help="Worker counts to compare.")
+    ap.add_argument("--latency", type=float, default=80.0, help="Simulated per-request latency (ms).")
+    ap.add_argument("--jitter", type=float, default=20.0, help="Latency jitter (ms).")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--throttle-rate", type=float, default=0.0)
+    ap.add_argument("--no-rate-limit", action="store_true")
+    ap.add_argument("--max-requests", type=int, default=None,
+                    help="Exit 1 if any run issues more HTTP requests than this.")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON.")
+    ap.add_argument("--verbose", action="store_true", help="Show the creators' own output.")
+    args = ap.parse_args()
+
+    server_opts = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+        "rate_limit": not args.no_rate_limit,
+        "seed": 1,
+    }
+
+    results = [run_build(args.course, w, server_opts, quiet=not args.verbose) for w in args.workers]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print_report(result)
+
+    if args.max_requests is not None:
+        over = [r for r in results if r["requests"] > args.max_requests]
+        if over:
+            for r in over:
+                print(f"[!] workers={r['workers']}: {r['requests']} requests exceeds budget of {args.max_requests}",
+                      file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
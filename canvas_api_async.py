@@ -0,0 +1,214 @@
+"""
+asyncio counterpart of CanvasClient, built on httpx.AsyncClient.
+
+Same surface as the synchronous client (url, course_url, get/post/put/
+delete, paginate) plus per-resource list/create/update/delete helpers.
+A semaphore caps how many requests are in flight, and the same
+X-Rate-Limit-Remaining feedback shrinks that cap as the token's bucket
+drains, so a script can gather hundreds of independent PUTs from one
+thread:
+
+    async with AsyncCanvasClient(domain, token, concurrency=50) as client:
+        await asyncio.gather(*(client.update_item(course_id, 'assignments', a_id, body)
+                               for a_id, body in changes))
+
+Scripts opt in with their USE_ASYNC setting; the synchronous path stays
+the default.
+"""
+
+import asyncio
+
+import httpx
+
+from canvas_api_utils import (
+    DEFAULT_PER_PAGE,
+    DEFAULT_TIMEOUT,
+    MAX_RETRIES,
+    RateLimiter,
+    backoff_delay,
+    is_throttled,
+    normalize_base_url,
+    parse_link_header
+)
+
+DEFAULT_CONCURRENCY = 50
+
+# resource -> the form/JSON wrapper Canvas expects on create and update
+RESOURCE_WRAPPERS = {
+    'assignments': 'assignment',
+    'modules': 'module',
+    'pages': 'wiki_page',
+    'discussion_topics': None,
+    'assignment_groups': None,
+    'rubrics': 'rubric',
+}
+
+
+class AsyncRateLimiter(RateLimiter):
+    """RateLimiter whose acquire/release await instead of blocking a thread."""
+
+    def __init__(self, max_concurrency=DEFAULT_CONCURRENCY, **kwargs):
+        super().__init__(max_concurrency=max_concurrency, **kwargs)
+        self._async_cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._async_cond:
+            await self._async_cond.wait_for(lambda: self._in_flight < self.allowed_concurrency())
+            self._in_flight += 1
+            low = self.remaining is not None and self.remaining <= self.low_water
+
+        if low:
+            await asyncio.sleep(self.pause)
+
+    async def release(self, response=None):
+        async with self._async_cond:
+            self._in_flight -= 1
+            if response is not None:
+                self.update(response.headers)
+            self._async_cond.notify_all()
+
+
+class AsyncCanvasClient:
+    """Keep-alive asyncio client for the Canvas REST API."""
+
+    def __init__(
+        self,
+        canvas_domain_url,
+        access_token,
+        concurrency=DEFAULT_CONCURRENCY,
+        timeout=DEFAULT_TIMEOUT,
+        max_retries=MAX_RETRIES
+    ):
+        self.base_url = normalize_base_url(canvas_domain_url)
+        self.api_url = f"{self.base_url}/api/v1"
+        self.max_retries = max_retries
+        self.rate_limiter = AsyncRateLimiter(max_concurrency=concurrency)
+        self.session = httpx.AsyncClient(
+            headers={
+                'Authorization': f'Bearer {access_token.strip()}',
+                'Accept': 'application/json'
+            },
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    def url(self, path):
+        """Resolve an API path (e.g. 'courses/1/modules') or pass a full URL through."""
+        if path.startswith('http'):
+            return path
+        return f"{self.api_url}/{path.lstrip('/')}"
+
+    def course_url(self, course_id, resource_path):
+        """Build a course-scoped URL such as /api/v1/courses/:id/modules."""
+        return self.url(f"courses/{course_id}/{resource_path.lstrip('/')}")
+
+    async def request(self, method, path, **kwargs):
+        """
+        Send one request once the rate limiter lets it through.
+
+        Throttled responses are retried with the same jittered backoff as
+        the synchronous client; other errors are returned for the caller's
+        raise_for_status().
+        """
+        url = self.url(path)
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            response = None
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            finally:
+                await self.rate_limiter.release(response)
+
+            if not is_throttled(response) or attempt >= self.max_retries:
+                return response
+
+            self.rate_limiter.throttled += 1
+            delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+            print(f"Rate limited on {method} {url}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, path, **kwargs):
+        return await self.request('GET', path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request('POST', path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return await self.request('PUT', path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.request('DELETE', path, **kwargs)
+
+    async def paginate(self, path, params=None, per_page=DEFAULT_PER_PAGE):
+        """Yield every item of a paginated Canvas listing, one page at a time."""
+        params = dict(params or {})
+        params.setdefault('per_page', per_page)
+        url = self.url(path)
+
+        while url:
+            response = await self.get(url, params=params)
+            response.raise_for_status()
+
+            data = response.json()
+            if isinstance(data, list):
+                for item in data:
+                    yield item
+            else:
+                yield data
+
+            # The next link already carries the original query string.
+            url = parse_link_header(response.headers.get('Link')).get('next')
+            params = None
+
+    # -- per-resource helpers ----------------------------------------------
+
+    @staticmethod
+    def _wrap(resource, fields):
+        wrapper = RESOURCE_WRAPPERS.get(resource)
+        return {wrapper: fields} if wrapper else fields
+
+    async def list_items(self, course_id, resource, params=None):
+        return [item async for item in self.paginate(self.course_url(course_id, resource), params=params)]
+
+    async def create_item(self, course_id, resource, fields):
+        response = await self.post(self.course_url(course_id, resource), json=self._wrap(resource, fields))
+        response.raise_for_status()
+        return response.json()
+
+    async def update_item(self, course_id, resource, item_id, fields):
+        response = await self.put(self.course_url(course_id, f"{resource}/{item_id}"), json=self._wrap(resource, fields))
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_item(self, course_id, resource, item_id):
+        response = await self.delete(self.course_url(course_id, f"{resource}/{item_id}"))
+        response.raise_for_status()
+        return response.json() if response.content else None
+
+    async def aclose(self):
+        await self.session.aclose()
+
+
+async def gather_settled(coros):
+    """
+    Await every coroutine concurrently, in input order.
+
+    Returns (result, None) or (None, exception) per coroutine so one failed
+    request doesn't cancel or hide the others.
+    """
+    async def settle(coro):
+        try:
+            return await coro, None
+        except (httpx.HTTPError, ValueError) as e:
+            return None, e
+
+    return await asyncio.gather(*(settle(c) for c in coros))
@@ -1,3 +1,55 @@
+import contextvars
+import hashlib
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from canvas_response_cache import course_id_from_url
+
+# Connection tuning shared by every script that talks to Canvas.
+DEFAULT_TIMEOUT = 30
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+DEFAULT_PER_PAGE = 100
+# 1 keeps the original one-at-a-time behaviour; raise it in config to fan out.
+DEFAULT_MAX_WORKERS = 1
+# Pages 2..N of one listing fetched at once by paginate_all (still gated by
+# the rate limiter).
+PREFETCH_WORKERS = 8
+
+# Canvas throttles per token with a leaky bucket (X-Rate-Limit-Remaining).
+# Above RATE_LIMIT_HIGH_WATER we run at full concurrency; below
+# RATE_LIMIT_LOW_WATER we drop to one request at a time and pause briefly
+# so the bucket can drain before the next call.
+RATE_LIMIT_HIGH_WATER = 300.0
+RATE_LIMIT_LOW_WATER = 50.0
+RATE_LIMIT_PAUSE = 1.0
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+# <url>; rel="next"; foo=bar  -- one entry of an RFC 8288 Link header
+_LINK_RE = re.compile(r'<([^>]*)>((?:\s*;\s*[^;,]*)*)')
+
+
+def normalize_base_url(canvas_domain_url):
+    """Return 'https://<domain>' from a bare domain, base URL or API URL."""
+    base = canvas_domain_url.strip().strip('"').rstrip('/')
+    if not base.startswith('http'):
+        base = f"https://{base}"
+
+    if '/api/v1' in base:
+        base = base[:base.index('/api/v1')]
+
+    return base
+
+
 def build_course_api_url(canvas_domain_url, course_id, resource_path):
     """Build a Canvas course-scoped API URL from a domain or base path."""
     base = canvas_domain_url.rstrip('/')
@@ -8,3 +60,382 @@ def build_course_api_url(canvas_domain_url, course_id, resource_path):
         base = f"{base}/api/v1/courses"
 
     return f"{base}/{course_id}/{resource_path.lstrip('/')}"
+
+
+def parse_link_header(value):
+    """
+    Parse a Link header into a {rel: url} dict.
+
+    Handles multiple rel values per entry and commas inside the URL, which
+    the old split(',') loops in the scripts did not.
+    """
+    links = {}
+    for match in _LINK_RE.finditer(value or ''):
+        url, params = match.groups()
+        for param in params.split(';'):
+            key, _, val = param.strip().partition('=')
+            if key.strip().lower() != 'rel':
+                continue
+            for rel in val.strip().strip('"\'').split():
+                links.setdefault(rel, url)
+    return links
+
+
+def page_number(url):
+    """The numeric page= value of a pagination URL, or None (e.g. Canvas bookmarks)."""
+    for key, value in parse_qsl(urlsplit(url or '').query):
+        if key == 'page':
+            return int(value) if value.isdigit() else None
+    return None
+
+
+def with_page(url, number):
+    """url with its page= query value replaced by number."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'page']
+    query.append(('page', str(number)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def is_throttled(response):
+    """True when Canvas rejected the call because the rate-limit bucket is empty."""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and 'rate limit exceeded' in response.text.lower()
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Exponential backoff with jitter, honouring a Retry-After header (up to BACKOFF_CAP) if sent."""
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_CAP)
+        except ValueError:
+            pass
+    delay = min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(delay / 2, delay)
+
+
+class RateLimiter:
+    """
+    Adaptive gate in front of every request made with one token.
+
+    Canvas reports how much of the token's bucket is left in
+    X-Rate-Limit-Remaining. As it drains, the number of requests allowed in
+    flight shrinks from max_concurrency down to 1, so parallel bulk jobs
+    run as fast as the bucket allows instead of tripping 403s.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=POOL_MAXSIZE,
+        high_water=RATE_LIMIT_HIGH_WATER,
+        low_water=RATE_LIMIT_LOW_WATER,
+        pause=RATE_LIMIT_PAUSE
+    ):
+        self.max_concurrency = max_concurrency
+        self.high_water = high_water
+        self.low_water = low_water
+        self.pause = pause
+        self.remaining = None
+        self.last_cost = None
+        self.throttled = 0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def allowed_concurrency(self):
+        if self.remaining is None or self.remaining >= self.high_water:
+            return self.max_concurrency
+        if self.remaining <= self.low_water:
+            return 1
+        span = self.high_water - self.low_water
+        share = (self.remaining - self.low_water) / span
+        return max(1, int(self.max_concurrency * share))
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self.allowed_concurrency():
+                self._cond.wait()
+            self._in_flight += 1
+            low = self.remaining is not None and self.remaining <= self.low_water
+
+        if low:
+            time.sleep(self.pause)
+
+    def release(self, response=None):
+        with self._cond:
+            self._in_flight -= 1
+            if response is not None:
+                self.update(response.headers)
+            self._cond.notify_all()
+
+    def update(self, headers):
+        remaining = headers.get('X-Rate-Limit-Remaining')
+        cost = headers.get('X-Request-Cost')
+        try:
+            if remaining is not None:
+                self.remaining = float(remaining)
+            if cost is not None:
+                self.last_cost = float(cost)
+        except ValueError:
+            pass
+
+
+class CanvasClient:
+    """
+    Keep-alive HTTP client for the Canvas REST API.
+
+    One pooled requests.Session carries the auth header and default timeout,
+    so repeated calls to the same Canvas host reuse TCP/TLS connections
+    instead of paying a fresh handshake per request.
+    """
+
+    def __init__(
+        self,
+        canvas_domain_url,
+        access_token,
+        timeout=DEFAULT_TIMEOUT,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=MAX_RETRIES,
+        cache=None
+    ):
+        self.base_url = normalize_base_url(canvas_domain_url)
+        self.api_url = f"{self.base_url}/api/v1"
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = RateLimiter(max_concurrency=pool_maxsize)
+        # Optional canvas_response_cache.ResponseCache; entries are scoped
+        # to this token so two users never share cached listings.
+        self.cache = cache
+        self.cache_scope = hashlib.sha256(access_token.strip().encode()).hexdigest()[:16]
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {access_token.strip()}',
+            'Accept': 'application/json'
+        })
+
+    def url(self, path):
+        """Resolve an API path (e.g. 'courses/1/modules') or pass a full URL through."""
+        if path.startswith('http'):
+            return path
+        return f"{self.api_url}/{path.lstrip('/')}"
+
+    def course_url(self, course_id, resource_path):
+        """Build a course-scoped URL such as /api/v1/courses/:id/modules."""
+        return self.url(f"courses/{course_id}/{resource_path.lstrip('/')}")
+
+    def request(self, method, path, **kwargs):
+        """
+        Send one request through the rate limiter.
+
+        Throttled responses (403 "Rate Limit Exceeded" or 429) are retried
+        with jittered exponential backoff; Canvas has not applied the call,
+        so this is safe for writes too. Other errors are returned as-is for
+        the caller's raise_for_status().
+
+        With a cache attached, GETs are answered from disk or revalidated
+        with a conditional request, and successful writes invalidate the
+        cached responses of the course they touched.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        url = self.url(path)
+
+        if self.cache is None:
+            return self._send(method, url, **kwargs)
+        if method == 'GET':
+            return self._cached_get(url, **kwargs)
+
+        response = self._send(method, url, **kwargs)
+        if response.ok:
+            # Writes outside a course (e.g. outcomes/:id) may change anything.
+            self.cache.invalidate(self.cache_scope, course_id_from_url(url))
+        return response
+
+    def _send(self, method, url, **kwargs):
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            finally:
+                self.rate_limiter.release(response)
+
+            if not is_throttled(response) or attempt >= self.max_retries:
+                return response
+
+            self.rate_limiter.throttled += 1
+            delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+            print(f"Rate limited on {method} {url}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def _cached_get(self, url, **kwargs):
+        prepared = requests.models.PreparedRequest()
+        prepared.prepare_url(url, kwargs.get('params'))
+        key = prepared.url
+
+        entry = self.cache.get(self.cache_scope, key)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                self.cache.hits += 1
+                return entry.to_response()
+            headers = dict(kwargs.pop('headers', None) or {})
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+            kwargs['headers'] = headers
+
+        response = self._send('GET', url, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated += 1
+            self.cache.touch(self.cache_scope, key)
+            return entry.to_response()
+        self.cache.misses += 1
+        if response.status_code == 200:
+            self.cache.store(self.cache_scope, key, response)
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def paginate(self, path, params=None, per_page=DEFAULT_PER_PAGE):
+        """
+        Yield every item of a paginated Canvas listing, one page at a time.
+
+        Pages are only requested as the caller consumes items, so a lookup
+        that stops at the first match never downloads the rest of the list.
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', per_page)
+        url = self.url(path)
+
+        while url:
+            response = self.get(url, params=params)
+            response.raise_for_status()
+
+            data = response.json()
+            if isinstance(data, list):
+                yield from data
+            else:
+                yield data
+
+            # The next link already carries the original query string.
+            url = parse_link_header(response.headers.get('Link')).get('next')
+            params = None
+
+    def paginate_all(self, path, params=None, per_page=DEFAULT_PER_PAGE, max_workers=PREFETCH_WORKERS):
+        """
+        Return every item of a listing, fetching pages concurrently when possible.
+
+        When the first page's Link header has a rel="last" with a numeric
+        page, pages 2..N are requested at once and reassembled in order, so
+        the listing costs one round trip plus the slowest page rather than
+        N round trips in a row. Bookmark-style links (no page number) fall
+        back to following rel="next" one page at a time.
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', per_page)
+
+        response = self.get(path, params=params)
+        response.raise_for_status()
+        data = response.json()
+        items = data if isinstance(data, list) else [data]
+
+        links = parse_link_header(response.headers.get('Link'))
+        next_url = links.get('next')
+        if not next_url:
+            return items
+
+        first = page_number(next_url)
+        last = page_number(links.get('last'))
+        if first is None or last is None or last < first:
+            return items + self._follow_next(next_url)
+
+        pages = list(run_concurrently(self._get_page, [with_page(next_url, n) for n in range(first, last + 1)], max_workers))
+        for page in pages:
+            items.extend(page.json())
+
+        # The listing grew while we were reading it; pick up the rest in order.
+        tail = parse_link_header(pages[-1].headers.get('Link')).get('next')
+        if tail:
+            items.extend(self._follow_next(tail))
+        return items
+
+    def _get_page(self, url):
+        response = self.get(url)
+        response.raise_for_status()
+        return response
+
+    def _follow_next(self, url):
+        """Items from url and every rel="next" page after it (urls already carry the query)."""
+        items = []
+        while url:
+            response = self._get_page(url)
+            items.extend(response.json())
+            url = parse_link_header(response.headers.get('Link')).get('next')
+        return items
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(canvas_domain_url, access_token, **kwargs):
+    """
+    Return the shared CanvasClient for this host and token, creating it once.
+
+    Helpers that only receive (course_id, access_token, canvas_domain_url)
+    call this so every request in a run goes through the same pool.
+    """
+    key = (normalize_base_url(canvas_domain_url), access_token.strip())
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = CanvasClient(canvas_domain_url, access_token, **kwargs)
+            _clients[key] = client
+        elif kwargs.get('cache') is not None and client.cache is None:
+            client.cache = kwargs['cache']
+        return client
+
+
+def run_concurrently(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Call func(item) for each item on a bounded thread pool.
+
+    Results are yielded in input order regardless of completion order, so
+    callers can print per-item results and summaries exactly as the
+    sequential loops did. max_workers <= 1 runs inline with no pool.
+    Workers run in a copy of the caller's context, so context variables
+    (e.g. the fan-out runner's per-course output) follow the work.
+    """
+    if max_workers is None or max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, func, item) for item in items]
+        for future in futures:
+            yield future.result()
@@ -1,6 +1,13 @@
 import requests
 from datetime import datetime
-from canvas_api_utils import build_course_api_url
+from canvas_api_utils import (
+    DEFAULT_MAX_WORKERS,
+    build_course_api_url,
+    get_client,
+    run_concurrently
+)
+from canvas_build_journal import entry_keys, journaled
+from canvas_course_index import get_course_index
 
 def get_assignment_groups(
     course_id, 
@@ -8,28 +15,14 @@ def get_assignment_groups(
     canvas_domain_url,
     group_name
 ):
-    # Canvas API base URL for assignment groups
-    base_url = build_course_api_url(canvas_domain_url, course_id, "assignment_groups")
-    
-    # Headers for the API request
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+    # Groups come from the shared course index: one listing per run,
+    # not one GET per assignment.
+    index = get_course_index(canvas_domain_url, access_token, course_id)
     
     try:
-        # Send GET request to retrieve assignment groups
-        response = requests.get(base_url, headers=headers)
-        
-        # Raise an exception for HTTP errors
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Loop through assignment groups to find the matching group_name
-        for group in data:
-            if group['name'] == group_name:
-                return group['id']  # Return the ID of the matching assignment group
+        group_id = index.get_id('assignment_groups', group_name)
+        if group_id:
+            return group_id  # Return the ID of the matching assignment group
         
         # If no matching group found, return None
         print(f"Assignment group '{group_name}' not found.")
@@ -50,17 +43,14 @@ def create_canvas_assignment(
     unlock_at,
     description,
     published,
-    assignment_group_id  # Now we pass the group ID instead of name
+    assignment_group_id,  # Now we pass the group ID instead of name
+    position=None
 ):
 
     # Canvas API base URL for creating assignments
     base_url = build_course_api_url(canvas_domain_url, course_id, "assignments")
     
-    # Headers for the API request
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(canvas_domain_url, access_token)
 
     # Prepare payload with the assignment details
     payload = {
@@ -75,15 +65,18 @@ def create_canvas_assignment(
             'assignment_group_id': assignment_group_id  # Use group ID here
         }
     }
+    if position is not None:
+        payload['assignment']['position'] = position
     
     try:
         # Send POST request to create the assignment
-        response = requests.post(base_url, json=payload, headers=headers)
+        response = client.post(base_url, json=payload)
         
         # Raise an exception for HTTP errors
         response.raise_for_status()
 
         data = response.json()
+        get_course_index(canvas_domain_url, access_token, course_id).add('assignments', data)
 
         # Return the JSON response
         return data
@@ -92,16 +85,55 @@ def create_canvas_assignment(
         print(f"Error creating assignment {assignment_name}: {e}")
         return None
 
+def assignment_positions(index, assignments):
+    """
+    Slot within its group for each datafile assignment.
+
+    Parallel creates finish out of order, so every assignment's position is
+    pinned to its datafile order, in sequential runs too so both produce
+    the same layout. Numbering starts after the assignments already in the
+    group that are not in this datafile, so new ones are appended below
+    them and a resumed run puts the rest where a fresh run would have.
+    """
+    names = {a['name'] for a in assignments}
+    existing = {}
+    for item in index.items('assignments'):
+        if item.get('name') not in names:
+            gid = item.get('assignment_group_id')
+            existing[gid] = existing.get(gid, 0) + 1
+
+    positions = []
+    group_counts = {}
+    for assignment in assignments:
+        group_name = assignment.get('assignment_group_name')
+        group_id = index.get_id('assignment_groups', group_name)
+        if group_name not in group_counts:
+            group_counts[group_name] = existing.get(group_id, 0)
+        group_counts[group_name] += 1
+        positions.append(group_counts[group_name])
+    return positions
+
 def create_multiple_assignments(
     course_id, 
     access_token, 
     canvas_domain_url,
-    assignments
+    assignments,
+    max_workers=DEFAULT_MAX_WORKERS,
+    journal=None
 ):
 
     created_assignments = []
+    index = get_course_index(canvas_domain_url, access_token, course_id)
+    keys = entry_keys(course_id, 'assignments', [a['name'] for a in assignments])
+
+    positions = assignment_positions(index, assignments)
+
+    def create_one(entry):
+        assignment, position, key = entry
+        if journal is not None and journal.is_done(key):
+            # Skip the group lookup and date parsing for finished entries.
+            return journal.run(key, None)
 
-    for assignment in assignments:
         assignment_group_name = assignment.get('assignment_group_name')
 
         # Lookup the assignment group ID
@@ -114,7 +146,7 @@ def create_multiple_assignments(
 
         if not assignment_group_id:
             print(f"Skipping assignment '{assignment['name']}' due to missing group.")
-            continue  # Skip this assignment if no matching group ID was found
+            return None  # Skip this assignment if no matching group ID was found
 
         # Convert date strings to datetime objects
         assignment['due_at'] = datetime.fromisoformat(assignment['due_at'])
@@ -122,7 +154,7 @@ def create_multiple_assignments(
         assignment['unlock_at'] = datetime.fromisoformat(assignment['unlock_at'])
 
         # Create the assignment with the assignment group ID
-        result = create_canvas_assignment(
+        result = journaled(journal, key, lambda: create_canvas_assignment(
             course_id, 
             access_token, 
             canvas_domain_url,
@@ -133,16 +165,25 @@ def create_multiple_assignments(
             assignment['unlock_at'], 
             assignment['description'],
             assignment['published'],
-            assignment_group_id  # Pass the found group ID here
-        )
-        
+            assignment_group_id,  # Pass the found group ID here
+            position
+        ), recover=lambda: index.get('assignments', assignment['name']), fields=('id', 'name'))
+        if not result:
+            print(f"Failed to create assignment: {assignment}")
+        return result
+
+    results = run_concurrently(
+        create_one,
+        list(zip(assignments, positions, keys)),
+        max_workers
+    )
+
+    for result in results:
         if result:
             print("Assignment created successfully!")
             print(f"Assignment ID: {result.get('id')}")
             print(f"Assignment Name: {result.get('name')}")
             created_assignments.append(result)
-        else:
-            print(f"Failed to create assignment: {assignment}")
     
     # Print summary of created assignments
     print("\nAssignment Creation Summary:")
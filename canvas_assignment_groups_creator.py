@@ -1,7 +1,14 @@
 import requests
 from datetime import datetime
 import pytz
-from canvas_api_utils import build_course_api_url
+from canvas_api_utils import (
+    DEFAULT_MAX_WORKERS,
+    build_course_api_url,
+    get_client,
+    run_concurrently
+)
+from canvas_build_journal import entry_keys, journaled
+from canvas_course_index import get_course_index
 
 
 def create_assignment_group(
@@ -16,11 +23,7 @@ def create_assignment_group(
 
     base_url = build_course_api_url(canvas_domain_url, course_id, "assignment_groups")
     
-    # Headers for the API request
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(canvas_domain_url, access_token)
 
     # Prepare module payload
     payload = {
@@ -31,12 +34,13 @@ def create_assignment_group(
     
     try:
         # Send POST request to create the module
-        response = requests.post(base_url, json=payload, headers=headers)
+        response = client.post(base_url, json=payload)
         
         # Raise an exception for HTTP errors
         response.raise_for_status()
 
         data = response.json()
+        get_course_index(canvas_domain_url, access_token, course_id).add('assignment_groups', data)
 
         # Return the JSON response
         return data
@@ -50,22 +54,30 @@ def create_multiple_assignment_groups(
     course_id, 
     access_token, 
     canvas_domain_url,
-    assignment_groups
+    assignment_groups,
+    max_workers=DEFAULT_MAX_WORKERS,
+    journal=None
 ):
 
     created_assignments_groups = []
+    index = get_course_index(canvas_domain_url, access_token, course_id)
+    keys = entry_keys(course_id, 'assignment_groups', [g['name'] for g in assignment_groups])
 
-    for i, assignment_group in enumerate(assignment_groups):
-
-        result = create_assignment_group(
+    # Each group carries an explicit position, so creation order doesn't matter.
+    def create_one(entry):
+        assignment_group, key = entry
+        return journaled(journal, key, lambda: create_assignment_group(
             course_id, 
             access_token, 
             canvas_domain_url,
             assignment_group['name'],
             assignment_group['position'],
             assignment_group['group_weight'],  # Handle case where date might not exist
-        )
-        
+        ), recover=lambda: index.get('assignment_groups', assignment_group['name']), fields=('id', 'name'))
+
+    results = run_concurrently(create_one, list(zip(assignment_groups, keys)), max_workers)
+
+    for assignment_group, result in zip(assignment_groups, results):
         if result:
             print("Assignment created successfully!")
             print(f"Assignment ID: {result.get('id')}")
@@ -0,0 +1,157 @@
+"""
+Write-ahead journal that makes course builds resumable.
+
+Every create the creators make is wrapped in journal.run(key, ...). The key
+is stable for a datafile entry (course, resource type and name), so a
+re-run after a crash skips work that already committed and reuses the
+Canvas ids recorded for it. The journal is a JSON-lines file:
+
+  {"key": "4242:assignments:Orientation", "state": "begin", "ts": ...}
+  {"key": "4242:assignments:Orientation", "state": "done", "result": {...}, "ts": ...}
+
+A "begin" with no "done" means we crashed while the request was in flight,
+so Canvas may or may not have the item. Those keys are reconciled with a
+recover() lookup (e.g. by name in the CourseIndex) before creating again.
+
+Delete the journal file to build the course from scratch.
+"""
+
+import json
+import os
+import threading
+import time
+
+import requests
+
+
+def entry_key(course_id, resource, name, occurrence=1):
+    """Idempotency key for one datafile entry."""
+    key = f"{course_id}:{resource}:{name}"
+    return key if occurrence == 1 else f"{key}#{occurrence}"
+
+
+def entry_keys(course_id, resource, names):
+    """Keys for a list of names, numbering repeats so each entry stays distinct."""
+    seen = {}
+    keys = []
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+        keys.append(entry_key(course_id, resource, name, seen[name]))
+    return keys
+
+
+class BuildJournal:
+    def __init__(self, path):
+        self.path = path
+        self.skipped = 0
+        self.recovered = 0
+        self._lock = threading.Lock()
+        self._state = {}
+        self._load()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a')
+        if self._file.tell() and not self._ends_with_newline():
+            # Terminate a torn last line so our first record starts clean.
+            self._file.write('\n')
+            self._file.flush()
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write; the entry it
+                    # belonged to is simply still pending.
+                    continue
+                self._state[record['key']] = record
+
+    def _append(self, record):
+        record['ts'] = time.time()
+        self._state[record['key']] = record
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def is_done(self, key):
+        with self._lock:
+            return self._state.get(key, {}).get('state') == 'done'
+
+    def result(self, key):
+        with self._lock:
+            return self._state.get(key, {}).get('result')
+
+    def run(self, key, create, recover=None, fields=None):
+        """
+        Run create() once per key across runs.
+
+        :param create: callable returning the created item (or id), or a
+                       falsy value on failure (nothing is committed)
+        :param recover: optional callable returning the existing item for
+                        a key whose previous attempt never committed
+        :param fields: for dict results, the keys worth recording (keeps
+                       page bodies and descriptions out of the journal)
+        :return: the result from this run, or the recorded one from an
+                 earlier run
+        """
+        with self._lock:
+            record = self._state.get(key)
+            if record and record['state'] == 'done':
+                self.skipped += 1
+                return record['result']
+            pending = record is not None
+            self._append({'key': key, 'state': 'begin'})
+
+        result = None
+        if pending and recover is not None:
+            try:
+                result = recover()
+            except requests.exceptions.RequestException as e:
+                # Creating blind could duplicate the item; leave it pending.
+                print(f"Could not check whether {key} already exists: {e}")
+                return None
+            if result:
+                with self._lock:
+                    self.recovered += 1
+        if not result:
+            result = create()
+
+        if result:
+            recorded = result
+            if fields and isinstance(result, dict):
+                recorded = {k: result.get(k) for k in fields}
+            with self._lock:
+                self._append({'key': key, 'state': 'done', 'result': recorded})
+        return result
+
+    def summary(self):
+        return f"journal {self.path}: {self.skipped} already done, {self.recovered} recovered"
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def journaled(journal, key, create, recover=None, fields=None):
+    """journal.run(...) when a journal is in use, otherwise just create()."""
+    if journal is None:
+        return create()
+    return journal.run(key, create, recover, fields)
+
+
+def open_journal(path):
+    """BuildJournal for path, or None when journaling is disabled (empty path)."""
+    path = (path or '').strip().strip('"')
+    if not path or path.lower() == 'off':
+        return None
+    return BuildJournal(path)
@@ -0,0 +1,138 @@
+"""
+Bulk assignment date changes through Canvas's asynchronous endpoint.
+
+PUT /api/v1/courses/:course_id/assignments/bulk_update takes the base
+dates for many assignments in one call and returns a Progress object that
+we poll until the job finishes. The job is all-or-nothing: if it fails,
+none of the batch was saved. The assignments it rejects (or the whole
+batch, when it cannot be resubmitted cleanly) fall back to a
+per-assignment PUT supplied by the caller.
+"""
+
+import time
+
+import requests
+
+BULK_UPDATE_BATCH_SIZE = 100
+PROGRESS_POLL_INTERVAL = 1.0
+PROGRESS_TIMEOUT = 300
+
+
+def wait_for_progress(client, progress, poll_interval=PROGRESS_POLL_INTERVAL, timeout=PROGRESS_TIMEOUT):
+    """Poll a Canvas Progress object until it is completed or failed."""
+    url = progress.get("url") or f"progress/{progress['id']}"
+    deadline = time.monotonic() + timeout
+
+    while progress.get("workflow_state") not in ("completed", "failed"):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Progress {progress.get('id')} did not finish within {timeout}s")
+        time.sleep(poll_interval)
+        resp = client.get(url)
+        resp.raise_for_status()
+        progress = resp.json()
+
+    return progress
+
+
+def _errored_ids(progress, batch_ids):
+    """
+    Assignment ids Canvas named in a failed bulk job's results.errors.
+
+    bulk_update is all-or-nothing: a job that does not complete saved
+    none of its batch, so these are only the ids worth not resubmitting.
+    """
+    results = progress.get("results") or {}
+    errors = results.get("errors") if isinstance(results, dict) else None
+    if not isinstance(errors, dict):
+        return []
+    errored = {str(k) for k in errors}
+    return [aid for aid in batch_ids if str(aid) in errored]
+
+
+def _bulk_body(batch):
+    return [
+        {
+            "id": u["id"],
+            "all_dates": [{
+                "base": True,
+                "unlock_at": u["unlock_at"],
+                "due_at": u["due_at"],
+                "lock_at": u["lock_at"],
+            }],
+        }
+        for u in batch
+    ]
+
+
+def _submit(client, url, batch):
+    """Run one bulk job for batch and return its finished Progress."""
+    resp = client.put(url, json=_bulk_body(batch))
+    resp.raise_for_status()
+    return wait_for_progress(client, resp.json())
+
+
+def _apply_batch(client, url, batch):
+    """
+    (applied ids, ids still to apply) for one batch of bulk date changes.
+
+    A job that does not complete saved nothing. When Canvas names the
+    assignments it rejected, the rest are resubmitted once as a new job;
+    otherwise, or if that job fails too, the whole batch is left to the
+    caller's single PUTs.
+    """
+    batch_ids = [u["id"] for u in batch]
+    progress = _submit(client, url, batch)
+    if progress.get("workflow_state") == "completed":
+        return batch_ids, []
+
+    rejected = _errored_ids(progress, batch_ids)
+    rest = [u for u in batch if u["id"] not in rejected]
+    if not rejected or not rest:
+        print(f"  [BULK] batch of {len(batch)} failed; falling back to single PUTs")
+        return [], batch_ids
+
+    print(f"  [BULK] batch of {len(batch)} failed; resubmitting {len(rest)} without the {len(rejected)} rejected")
+    if _submit(client, url, rest).get("workflow_state") != "completed":
+        print("  [BULK] resubmitted batch failed too; falling back to single PUTs")
+        return [], batch_ids
+    return [u["id"] for u in rest], rejected
+
+
+def bulk_update_assignment_dates(client, course_id, updates, fallback_update, batch_size=BULK_UPDATE_BATCH_SIZE):
+    """
+    Apply base-date changes for many assignments in as few calls as possible.
+
+    A batch whose job fails is resubmitted once without the assignments
+    Canvas reported errors for; those, and every assignment of a batch
+    that still does not complete, go through fallback_update.
+
+    :param client: CanvasClient for the course's Canvas host
+    :param course_id: Canvas course ID
+    :param updates: list of dicts with id, unlock_at, due_at, lock_at
+    :param fallback_update: callable(update) doing a single-assignment PUT
+    :return: dict with lists of ids under "bulk", "fallback" and "failed"
+    """
+    report = {"bulk": [], "fallback": [], "failed": []}
+    url = client.course_url(course_id, "assignments/bulk_update")
+    by_id = {u["id"]: u for u in updates}
+
+    for start in range(0, len(updates), batch_size):
+        batch = updates[start:start + batch_size]
+        batch_ids = [u["id"] for u in batch]
+        try:
+            applied, retry_ids = _apply_batch(client, url, batch)
+        except (requests.exceptions.RequestException, TimeoutError) as e:
+            print(f"  [BULK] batch of {len(batch)} could not be applied ({e}); falling back to single PUTs")
+            applied, retry_ids = [], batch_ids
+
+        report["bulk"].extend(applied)
+
+        for aid in retry_ids:
+            try:
+                fallback_update(by_id[aid])
+                report["fallback"].append(aid)
+            except requests.exceptions.RequestException as e:
+                print(f"  [ERROR] assignment {aid}: {e}")
+                report["failed"].append(aid)
+
+    return report
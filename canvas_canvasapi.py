@@ -0,0 +1,78 @@
+"""
+canvasapi.Canvas objects that send through the shared CanvasClient.
+
+canvasapi builds its own requests.Session per Canvas() and lets a 403
+"Rate Limit Exceeded" surface as an exception. get_canvas() swaps that
+session for the pooled CanvasClient of the same host and token, so
+canvasapi calls share its keep-alive connections, rate limiter, throttle
+retries and response cache (writes made through canvasapi invalidate the
+cached listings of their course like any other client write).
+
+Every GET also asks for the maximum page size, so a PaginatedList such as
+course.get_modules() walks a listing in as few round trips as the raw
+requests scripts do:
+
+  canvas = get_canvas(CANVAS_DOMAIN_URL, API_TOKEN)
+  course = canvas.get_course(COURSE_ID)
+  for module in course.get_modules():
+      ...
+"""
+
+from urllib.parse import parse_qsl, urlsplit
+
+import canvasapi
+from canvasapi import Canvas
+
+from canvas_api_utils import DEFAULT_PER_PAGE, get_client, normalize_base_url
+
+
+class ClientSession:
+    """Stands in for the requests.Session inside canvasapi's Requester."""
+
+    def __init__(self, client, per_page=DEFAULT_PER_PAGE):
+        self.client = client
+        self.per_page = per_page
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        # Follow-up pages arrive as Link URLs that already carry per_page.
+        params = list(params or [])
+        query = parse_qsl(urlsplit(url).query)
+        if not any(k == 'per_page' for k, _ in params + query):
+            params.append(('per_page', self.per_page))
+        return self.client.get(url, headers=headers, params=params, **kwargs)
+
+    def post(self, url, headers=None, **kwargs):
+        return self.client.post(url, headers=headers, **kwargs)
+
+    def put(self, url, headers=None, **kwargs):
+        return self.client.put(url, headers=headers, **kwargs)
+
+    def delete(self, url, headers=None, **kwargs):
+        return self.client.delete(url, headers=headers, **kwargs)
+
+    def patch(self, url, headers=None, **kwargs):
+        return self.client.request('PATCH', url, headers=headers, **kwargs)
+
+    def close(self):
+        # The pooled session belongs to the shared client.
+        pass
+
+
+def get_canvas(canvas_domain_url, access_token, per_page=DEFAULT_PER_PAGE):
+    """
+    Return a canvasapi.Canvas whose requests go through get_client().
+
+    canvasapi has no hook for its session, so this replaces the private
+    Requester._session (requirements.txt pins the releases it is known to
+    work with). If a canvasapi release moves it, fail loudly rather than
+    quietly sending through canvasapi's own session.
+    """
+    canvas = Canvas(normalize_base_url(canvas_domain_url), access_token)
+    requester = getattr(canvas, '_Canvas__requester', None)
+    if requester is None or not hasattr(requester, '_session'):
+        raise RuntimeError(
+            f"canvasapi {canvasapi.__version__} has no Canvas requester session to share; "
+            "canvas_canvasapi.get_canvas needs a canvasapi release listed in requirements.txt"
+        )
+    requester._session = ClientSession(get_client(canvas_domain_url, access_token), per_page)
+    return canvas
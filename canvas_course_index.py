@@ -0,0 +1,206 @@
+import re
+import threading
+
+from canvas_api_utils import DEFAULT_MAX_WORKERS, get_client, run_concurrently
+
+# resource -> (field holding the display name, field holding the id)
+RESOURCE_FIELDS = {
+    'assignment_groups': ('name', 'id'),
+    'assignments': ('name', 'id'),
+    'modules': ('name', 'id'),
+    'pages': ('title', 'page_id'),
+    'discussion_topics': ('title', 'id'),
+}
+
+# "Module 1", "module 10 - ...", "Week 3: Module 2 Discussion"; the \b keeps
+# "Module 1" from matching inside "Module 10".
+_MODULE_NUMBER_RE = re.compile(r'\bModule\s+(\d+)\b', re.IGNORECASE)
+_MODULE_KEYWORD_RE = re.compile(r'\s*Module\s+(\d+)\s*', re.IGNORECASE)
+
+
+def module_number(title):
+    """Module number named in a title ('Module 10 - Reporting' -> 10), or None."""
+    match = _MODULE_NUMBER_RE.search(title or '')
+    return int(match.group(1)) if match else None
+
+
+class CourseIndex:
+    """
+    In-memory name -> item lookup for one course.
+
+    Each resource type is listed once, on first use, and then kept current
+    as the creators add items, so resolving e.g. an assignment group name
+    costs one listing per run instead of one GET per assignment.
+
+    Titles are also parsed once into module number -> items, so the
+    updaters that look things up by "Module N" don't re-scan (or re-fetch)
+    a listing per module.
+    """
+
+    def __init__(self, client, course_id):
+        self.client = client
+        self.course_id = course_id
+        self._items = {}
+        self._by_number = {}
+        self._module_items = {}
+        self._lock = threading.RLock()
+
+    def _load(self, resource):
+        if resource not in RESOURCE_FIELDS:
+            raise KeyError(f"Unknown course resource: {resource}")
+
+        with self._lock:
+            if resource not in self._items:
+                url = self.client.course_url(self.course_id, resource)
+                self.preload(resource, self.client.paginate(url))
+            return self._items[resource]
+
+    def preload(self, resource, items):
+        """
+        Index a listing the caller already has (e.g. pages with include[]=body)
+        instead of fetching it again.
+        """
+        if resource not in RESOURCE_FIELDS:
+            raise KeyError(f"Unknown course resource: {resource}")
+
+        name_field, _ = RESOURCE_FIELDS[resource]
+        by_name = {}
+        by_number = {}
+        for item in items:
+            by_name.setdefault(item.get(name_field) or '', item)
+            number = module_number(item.get(name_field))
+            if number is not None:
+                by_number.setdefault(number, []).append(item)
+        with self._lock:
+            self._items[resource] = by_name
+            self._by_number[resource] = by_number
+
+    def items(self, resource):
+        """All known items of one type, in listing/creation order."""
+        with self._lock:
+            return list(self._load(resource).values())
+
+    def get(self, resource, name, ignore_case=False):
+        with self._lock:
+            by_name = self._load(resource)
+            if not ignore_case:
+                return by_name.get(name)
+            wanted = (name or '').lower()
+            for item_name, item in by_name.items():
+                if item_name.lower() == wanted:
+                    return item
+            return None
+
+    def get_id(self, resource, name, ignore_case=False):
+        item = self.get(resource, name, ignore_case)
+        if item is None:
+            return None
+        return item.get(RESOURCE_FIELDS[resource][1])
+
+    def for_module(self, resource, number):
+        """Every item of one type whose title names Module <number>, in listing order."""
+        with self._lock:
+            self._load(resource)
+            return list(self._by_number[resource].get(number, []))
+
+    def first_for_module(self, resource, number):
+        items = self.for_module(resource, number)
+        return items[0] if items else None
+
+    def find_containing(self, resource, keyword):
+        """
+        First item whose name contains keyword (case-insensitive).
+
+        A bare "Module N" keyword is answered from the module number map, so
+        "Module 1" never picks up "Module 10 ..." the way a substring test would.
+        """
+        match = _MODULE_KEYWORD_RE.fullmatch(keyword or '')
+        if match:
+            return self.first_for_module(resource, int(match.group(1)))
+
+        name_field, _ = RESOURCE_FIELDS[resource]
+        wanted = (keyword or '').lower()
+        for item in self.items(resource):
+            if wanted in (item.get(name_field) or '').lower():
+                return item
+        return None
+
+    def load_modules_with_items(self, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        List every module with its items embedded (include[]=items) in one
+        paginated pass, and index both.
+
+        Canvas leaves 'items' off modules with too many items to inline;
+        only those get their own items_url listing.
+        """
+        url = self.client.course_url(self.course_id, 'modules')
+        modules = list(self.client.paginate(url, params={'include[]': 'items'}))
+        self.preload('modules', modules)
+
+        truncated = [m for m in modules if 'items' not in m]
+        fetched = run_concurrently(self._fetch_module_items, truncated, max_workers)
+
+        with self._lock:
+            for module in modules:
+                if 'items' in module:
+                    self._module_items[module['id']] = list(module['items'])
+            for module, items in zip(truncated, fetched):
+                self._module_items[module['id']] = items
+        return modules
+
+    def _fetch_module_items(self, module):
+        url = module.get('items_url') or self.client.course_url(self.course_id, f"modules/{module['id']}/items")
+        return list(self.client.paginate(url))
+
+    def module_items(self, module_id):
+        """Items of one module, from load_modules_with_items or a one-off listing."""
+        with self._lock:
+            if module_id not in self._module_items:
+                self._module_items[module_id] = self._fetch_module_items({'id': module_id})
+            return list(self._module_items[module_id])
+
+    def add_module_item(self, module_id, item):
+        """Record a module item we just created so placement checks see it without a GET."""
+        with self._lock:
+            if module_id in self._module_items:
+                self._module_items[module_id].append(item)
+
+    def add(self, resource, item):
+        """Record an item we just created so later lookups see it without a GET."""
+        name_field, _ = RESOURCE_FIELDS[resource]
+        with self._lock:
+            # Only update types that were already loaded; an unloaded type
+            # will pick the new item up when it is first listed.
+            if resource in self._items:
+                self._items[resource].setdefault(item.get(name_field) or '', item)
+                number = module_number(item.get(name_field))
+                if number is not None:
+                    self._by_number[resource].setdefault(number, []).append(item)
+
+    def invalidate(self, resource=None):
+        with self._lock:
+            if resource is None:
+                self._items.clear()
+                self._by_number.clear()
+                self._module_items.clear()
+            else:
+                self._items.pop(resource, None)
+                self._by_number.pop(resource, None)
+                if resource == 'modules':
+                    self._module_items.clear()
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_course_index(canvas_domain_url, access_token, course_id):
+    """Return the CourseIndex shared by every creator working on this course."""
+    client = get_client(canvas_domain_url, access_token)
+    key = (id(client), str(course_id))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = CourseIndex(client, course_id)
+            _indexes[key] = index
+        return index
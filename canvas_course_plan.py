@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Declarative plan / apply for a course built from the datafiles JSON.
+
+The desired state comes from datafiles/<PREFIX>-*.json. The current state
+comes from one paginated listing per resource type. We compare them field
+by field and only send writes for real differences:
+
+  python3 canvas_course_plan.py plan  --prefix CSTC240   # show the diff, no writes
+  python3 canvas_course_plan.py apply --prefix CSTC240   # create/update what drifted
+
+Items are matched by name (modules, assignment groups, assignments) or
+title (pages, discussion topics). Items in Canvas that are not in the
+datafiles are left alone. Nothing is deleted.
+
+Config: etc/config.txt, section [canvas-lms-test]
+Required keys: COURSE_ID, API_TOKEN, CANVAS_DOMAIN_URL
+"""
+
+import argparse
+import configparser
+import os
+import re
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+import requests
+
+from canvas_api_utils import DEFAULT_MAX_WORKERS, get_client, run_concurrently
+from canvas_discussion_board import DISCUSSION_GROUP_NAME, discussion_topic_payload
+
+CONFIG_PATH = "etc/config.txt"
+CONFIG_SECTION = "canvas-lms-test"
+DATAFILES_DIR = "datafiles"
+
+# Datafile timestamps carry no offset and the creators send them as-is,
+# so Canvas reads them in the course's time_zone. Plans resolve them the
+# same way (course_timezone); NAIVE_TIMEZONE is only the fallback for
+# callers that have no course to ask.
+NAIVE_TIMEZONE = timezone.utc
+# Used when Canvas doesn't report the course's time_zone.
+DEFAULT_TIMEZONE = "America/Detroit"
+
+DATE_FIELDS = {"unlock_at", "due_at", "lock_at"}
+HTML_FIELDS = {"body", "message", "description"}
+
+# resource -> how it is described in the datafiles and in Canvas
+RESOURCES: Dict[str, Dict[str, Any]] = {
+    "assignment_groups": {
+        "file": "assignment-groups-data",
+        "key": "ASSIGNMENT_GROUPS",
+        "match": "name",
+        "fields": ["position", "group_weight"],
+        "wrapper": None,
+        "update_path": "assignment_groups/{id}",
+    },
+    "modules": {
+        "file": "module-data",
+        "key": "MODULE_NAMES",
+        "match": "name",
+        "fields": ["unlock_at", "published"],
+        "wrapper": "module",
+        "update_path": "modules/{id}",
+    },
+    "assignments": {
+        "file": "assignment-data",
+        "key": "ASSIGNMENTS",
+        "match": "name",
+        "fields": ["points_possible", "due_at", "lock_at", "unlock_at",
+                   "description", "published", "assignment_group_id"],
+        "wrapper": "assignment",
+        "update_path": "assignments/{id}",
+    },
+    "pages": {
+        "file": "pages-data",
+        "key": "PAGES",
+        "match": "title",
+        "fields": ["body", "published"],
+        "wrapper": "wiki_page",
+        "update_path": "pages/{url}",
+        "list_params": {"include[]": "body"},
+    },
+    "discussion_topics": {
+        "file": "discussion-topic-data",
+        "key": "DISCUSSION_TOPICS",
+        "match": "title",
+        "fields": ["message", "published", "pinned"],
+        "wrapper": None,
+        "update_path": "discussion_topics/{id}",
+    },
+}
+
+# Groups first so assignments can resolve assignment_group_id.
+APPLY_ORDER = ["assignment_groups", "modules", "assignments", "pages", "discussion_topics"]
+
+
+# --------------------------------------------------------------------
+# Field comparison
+# --------------------------------------------------------------------
+
+def parse_timestamp(value: Any, tz=None) -> Optional[datetime]:
+    """UTC instant for a timestamp; naive values are read in tz (NAIVE_TIMEZONE if None)."""
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz or NAIVE_TIMEZONE)
+    return dt.astimezone(timezone.utc)
+
+
+def course_timezone(client, course_id):
+    """ZoneInfo for the course's time_zone setting (DEFAULT_TIMEZONE if unset)."""
+    resp = client.get(client.url(f"courses/{course_id}"))
+    resp.raise_for_status()
+    return ZoneInfo(resp.json().get("time_zone") or DEFAULT_TIMEZONE)
+
+
+# Elements Canvas may write as <br>, <br/> or <br />, never with an end tag.
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+             "link", "meta", "source", "track", "wbr"}
+
+
+class _CanonicalHTML(HTMLParser):
+    """
+    Re-serializes HTML the same way whatever Canvas's sanitizer did to it:
+    entities decoded, tag and attribute names lowercased, attributes
+    sorted, void elements without a self-closing slash, comments dropped.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = sorted((name, re.sub(r"\s+", " ", value or "").strip()) for name, value in attrs)
+        self.parts.append("<" + tag + "".join(f' {name}="{value}"' for name, value in attrs) + ">")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_TAGS:
+            self.parts.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def normalize_html(value: Any) -> str:
+    """Canonical form of an HTML body, so Canvas's re-serialization isn't seen as a change."""
+    parser = _CanonicalHTML()
+    parser.feed(str(value or ""))
+    parser.close()
+    text = re.sub(r">\s+<", "><", "".join(parser.parts))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def normalize(field: str, value: Any) -> Any:
+    if field in DATE_FIELDS:
+        return parse_timestamp(value)
+    if field in HTML_FIELDS:
+        return normalize_html(value)
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and re.fullmatch(r"-?\d+(\.\d+)?", value):
+        return float(value)
+    return value
+
+
+def diff_fields(desired: Dict[str, Any], current: Dict[str, Any], fields: List[str]) -> Dict[str, tuple]:
+    """Return {field: (current, desired)} for every field whose value really differs."""
+    changes = {}
+    for field in fields:
+        if field not in desired:
+            continue
+        if normalize(field, desired[field]) != normalize(field, current.get(field)):
+            changes[field] = (current.get(field), desired[field])
+    return changes
+
+
+# --------------------------------------------------------------------
+# Desired / current state
+# --------------------------------------------------------------------
+
+def _iso(value: Any, tz=None) -> Optional[str]:
+    dt = parse_timestamp(value, tz)
+    return dt.isoformat() if dt else None
+
+
+def desired_fields(resource: str, entry: Dict[str, Any], tz=None) -> Dict[str, Any]:
+    """
+    Translate one datafile entry into the Canvas fields the creators would send.
+
+    Naive datafile dates are resolved in tz, the course's time zone, so they
+    name the same instants Canvas stored when the creators sent them.
+    """
+    if resource == "modules":
+        return {"name": entry["name"], "unlock_at": _iso(entry.get("unlock_date"), tz), "published": True}
+    if resource == "assignment_groups":
+        return {k: entry[k] for k in ("name", "position", "group_weight") if k in entry}
+    if resource == "assignments":
+        fields = {k: entry[k] for k in ("name", "points_possible", "description", "published") if k in entry}
+        for key in DATE_FIELDS:
+            if key in entry:
+                fields[key] = _iso(entry[key], tz)
+        return fields
+    if resource == "pages":
+        return {"title": entry["title"], "body": entry.get("body", ""), "published": True}
+    if resource == "discussion_topics":
+        return {k: entry[k] for k in ("title", "message", "published", "pinned") if k in entry}
+    raise KeyError(resource)
+
+
+def load_desired(prefix: str, datafiles_dir: str = DATAFILES_DIR) -> Dict[str, List[Dict[str, Any]]]:
+    import json
+
+    desired = {}
+    for resource, spec in RESOURCES.items():
+        path = os.path.join(datafiles_dir, f"{prefix}-{spec['file']}.json")
+        if not os.path.exists(path):
+            continue
+        with open(path, "r") as f:
+            desired[resource] = json.load(f)[spec["key"]]
+    return desired
+
+
+def fetch_current(client, course_id, resources) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """One paginated listing per resource type, keyed by name/title."""
+    current = {}
+    for resource in resources:
+        spec = RESOURCES[resource]
+        url = client.course_url(course_id, resource)
+        by_key = {}
+        for item in client.paginate(url, params=spec.get("list_params")):
+            by_key.setdefault(item.get(spec["match"]) or "", item)
+        current[resource] = by_key
+    return current
+
+
+def resources_to_read(desired) -> List[str]:
+    """Resource listings a plan needs, in APPLY_ORDER."""
+    # Assignments and graded discussions need the group listing to resolve group ids.
+    resources = set(desired)
+    if resources & {"assignments", "discussion_topics"}:
+        resources.add("assignment_groups")
+    return [r for r in APPLY_ORDER if r in resources]
+
+
+# --------------------------------------------------------------------
+# Plan
+# --------------------------------------------------------------------
+
+class Change:
+    def __init__(self, resource, action, key, desired, raw, current=None, fields=None):
+        self.resource = resource
+        self.action = action          # "create" or "update"
+        self.key = key
+        self.desired = desired        # Canvas fields we want
+        self.raw = raw                # the datafile entry
+        self.current = current        # Canvas item, for updates
+        self.fields = fields or {}    # {field: (current, desired)}
+
+
+def build_plan(desired, current, tz=None) -> List[Change]:
+    changes: List[Change] = []
+    group_ids = {name: g.get("id") for name, g in current.get("assignment_groups", {}).items()}
+
+    for resource in APPLY_ORDER:
+        spec = RESOURCES[resource]
+        existing = current.get(resource, {})
+        for entry in desired.get(resource, []):
+            fields = desired_fields(resource, entry, tz)
+            key = fields[spec["match"]]
+
+            if resource == "assignments":
+                # Unknown group id means the group is still to be created.
+                fields["assignment_group_id"] = group_ids.get(entry.get("assignment_group_name"))
+
+            item = existing.get(key)
+            if item is None:
+                changes.append(Change(resource, "create", key, fields, entry))
+                continue
+
+            diff = diff_fields(fields, item, spec["fields"])
+            if diff:
+                changes.append(Change(resource, "update", key, fields, entry, item, diff))
+    return changes
+
+
+def _short(value: Any, limit: int = 60) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def print_plan(changes: List[Change]) -> None:
+    if not changes:
+        print("No changes. Canvas matches the datafiles.")
+        return
+    for change in changes:
+        marker = "+" if change.action == "create" else "~"
+        print(f"{marker} {change.resource}: {change.key!r}")
+        for field, (old, new) in change.fields.items():
+            print(f"    {field}: {_short(old)} -> {_short(new)}")
+    creates = sum(1 for c in changes if c.action == "create")
+    print(f"\nPlan: {creates} to create, {len(changes) - creates} to update.")
+
+
+# --------------------------------------------------------------------
+# Apply
+# --------------------------------------------------------------------
+
+def _payload(resource: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    wrapper = RESOURCES[resource]["wrapper"]
+    return {wrapper: fields} if wrapper else fields
+
+
+def _apply_one(client, course_id, change: Change, group_ids: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    spec = RESOURCES[change.resource]
+    fields = dict(change.desired)
+    if change.resource == "assignments":
+        fields["assignment_group_id"] = group_ids.get(change.raw.get("assignment_group_name"))
+
+    if change.action == "create" and change.resource == "discussion_topics":
+        # Same graded topic create_discussion_boards makes, not a bare one.
+        group_id = _group_id(group_ids, DISCUSSION_GROUP_NAME)
+        resp = client.post(client.course_url(course_id, change.resource),
+                           json=discussion_topic_payload(change.raw, group_id))
+    elif change.action == "create":
+        sent = fields
+        if change.resource == "modules":
+            # Canvas ignores published on create; it goes in the PUT below.
+            sent = {k: v for k, v in fields.items() if k != "published"}
+        resp = client.post(client.course_url(course_id, change.resource), json=_payload(change.resource, sent))
+    else:
+        # Only the fields that changed go over the wire.
+        sent = {field: fields[field] for field in change.fields}
+        path = spec["update_path"].format(**change.current)
+        resp = client.put(client.course_url(course_id, path), json=_payload(change.resource, sent))
+    resp.raise_for_status()
+    created = resp.json()
+
+    if change.resource == "modules" and change.action == "create":
+        # Publish with a follow-up PUT unless the account already did.
+        if fields.get("published") and not created.get("published"):
+            module_url = client.course_url(course_id, f"modules/{created['id']}")
+            resp = client.put(module_url, json={"module": {"published": True}})
+            resp.raise_for_status()
+            created = resp.json()
+
+        # New modules get the same SubHeaders create_multiple_modules adds.
+        for position, (flag, text) in enumerate((("addHomeworkSubHeader", "HomeworkSubHeaderText"),
+                                                 ("addQuizSubHeader", "QuizSubHeaderText")), start=1):
+            if change.raw.get(flag):
+                item_url = client.course_url(course_id, f"modules/{created['id']}/items")
+                client.post(item_url, json={"module_item": {
+                    "type": "SubHeader", "title": change.raw.get(text, ""), "position": position,
+                }}).raise_for_status()
+    return created
+
+
+def _group_id(group_ids: Dict[str, Any], name: str) -> Any:
+    """Assignment group id by name, ignoring case like the creators do."""
+    return next((gid for gname, gid in group_ids.items() if gname.lower() == name.lower()), None)
+
+
+def apply_plan(client, course_id, changes: List[Change], current, max_workers=DEFAULT_MAX_WORKERS) -> Dict[str, int]:
+    group_ids = {name: g.get("id") for name, g in current.get("assignment_groups", {}).items()}
+    report = {"created": 0, "updated": 0, "failed": 0}
+
+    for resource in APPLY_ORDER:
+        batch = [c for c in changes if c.resource == resource]
+        if resource == "discussion_topics" and any(c.action == "create" for c in batch) \
+                and _group_id(group_ids, DISCUSSION_GROUP_NAME) is None:
+            # Created once here, before the topics fan out.
+            resp = client.post(client.course_url(course_id, "assignment_groups"), json={"name": DISCUSSION_GROUP_NAME})
+            resp.raise_for_status()
+            group_ids[DISCUSSION_GROUP_NAME] = resp.json().get("id")
+        # Modules are created one at a time so they keep datafile order.
+        workers = 1 if resource == "modules" else max_workers
+
+        def run(change):
+            try:
+                return change, _apply_one(client, course_id, change, group_ids), None
+            except requests.exceptions.RequestException as e:
+                return change, None, e
+
+        for change, result, error in run_concurrently(run, batch, workers):
+            if error is not None:
+                print(f"  [FAILED] {change.action} {change.resource} {change.key!r}: {error}")
+                report["failed"] += 1
+                continue
+            print(f"  [{change.action.upper()}D] {change.resource} {change.key!r}")
+            report["created" if change.action == "create" else "updated"] += 1
+            if resource == "assignment_groups" and result:
+                group_ids[change.key] = result.get("id")
+
+    return report
+
+
+def load_config():
+    config = configparser.ConfigParser()
+    config.read(CONFIG_PATH)
+    if CONFIG_SECTION not in config:
+        raise KeyError(f"Section [{CONFIG_SECTION}] not found in {CONFIG_PATH}")
+    return config[CONFIG_SECTION]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Plan or apply datafile changes to a Canvas course.")
+    ap.add_argument("mode", choices=["plan", "apply"])
+    ap.add_argument("--prefix", default="CSTC240", help="Datafile prefix, e.g. CSTC240 or CBSY101.")
+    ap.add_argument("--course-id", help="Override COURSE_ID from config.")
+    ap.add_argument("--only", nargs="+", choices=list(RESOURCES), help="Limit to these resource types.")
+    ap.add_argument("--workers", type=int, default=None, help="Parallel writes (defaults to MAX_WORKERS or 1).")
+    args = ap.parse_args()
+
+    cfg = load_config()
+    course_id = args.course_id or cfg["COURSE_ID"]
+    client = get_client(cfg["CANVAS_DOMAIN_URL"], cfg["API_TOKEN"])
+    workers = args.workers or int(cfg.get("MAX_WORKERS", 1))
+
+    desired = load_desired(args.prefix)
+    if args.only:
+        desired = {k: v for k, v in desired.items() if k in args.only}
+
+    print(f"Reading current state of course {course_id}...")
+    current = fetch_current(client, course_id, resources_to_read(desired))
+    changes = build_plan(desired, current, course_timezone(client, course_id))
+    print_plan(changes)
+
+    if args.mode == "apply" and changes:
+        print("\nApplying...")
+        report = apply_plan(client, course_id, changes, current, workers)
+        print(f"\nCreated: {report['created']}  Updated: {report['updated']}  Failed: {report['failed']}")
+
+
+if __name__ == "__main__":
+    main()
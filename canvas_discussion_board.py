@@ -1,7 +1,44 @@
 import json
-from canvasapi import Canvas
 from canvasapi.exceptions import CanvasException
 from datetime import datetime
+from canvas_build_journal import entry_keys, journaled
+from canvas_canvasapi import get_canvas
+from canvas_course_index import get_course_index
+
+DISCUSSION_GROUP_NAME = "Discussion Boards"
+
+
+def discussion_topic_payload(discussion, assignment_group_id):
+    """
+    Create-topic fields for one datafile discussion: a graded topic whose
+    assignment sits in the "Discussion Boards" group with the entry's dates.
+
+    :param discussion: Dictionary containing discussion details
+    :param assignment_group_id: ID of the "Discussion Boards" group
+    :return: dict of discussion_topic fields for POST discussion_topics
+    """
+    return dict(
+        title=discussion["title"],
+        message=discussion["message"],
+        published=discussion["published"],
+        is_announcement=False,
+        pinned=discussion["pinned"],
+        unlock_at=discussion["unlock_at"],
+        due_at=discussion["due_at"],
+        points_possible=discussion["points_possible"],
+        assignment={
+            "name": discussion["title"],
+            "points_possible": discussion["points_possible"],  # Adjust points if needed
+            "grading_type": "points",
+            "submission_types": ["discussion_topic"],
+            "published": discussion["published"],
+            "pinned": discussion["pinned"],
+            "assignment_group_id": assignment_group_id,
+            "lock_at": discussion["lock_at"],  # Using the lock_at from JSON
+            "due_at": discussion["due_at"],
+            "unlock_at":discussion["unlock_at"]
+        }
+    )
 
 def get_or_create_assignment_group(course, group_name):
     """
@@ -18,52 +55,39 @@ def get_or_create_assignment_group(course, group_name):
     new_group = course.create_assignment_group(name=group_name)
     return new_group
 
-def create_discussion_assignment(course, discussion):
+def create_discussion_assignment(course, discussion, assignment_group_id=None):
     """
     Create a discussion topic as an assignment and assign it to the "Discussion Boards" group.
     
     :param course: Canvas course object
     :param discussion: Dictionary containing discussion details
+    :param assignment_group_id: ID of the "Discussion Boards" group, if already resolved
+    :return: The created discussion topic, or None on failure
     """
     try:
         # Get or create the "Discussion Boards" assignment group
-        discussion_group = get_or_create_assignment_group(course, "Discussion Boards")
+        if assignment_group_id is None:
+            assignment_group_id = get_or_create_assignment_group(course, DISCUSSION_GROUP_NAME).id
 
         # Create the discussion topic (which will be our assignment)
         discussion_topic = course.create_discussion_topic(
-            title=discussion["title"],
-            message=discussion["message"],
-            published=discussion["published"],
-            is_announcement=False,
-            pinned=discussion["pinned"],
-            unlock_at=discussion["unlock_at"],
-            due_at=discussion["due_at"],
-            points_possible=discussion["points_possible"],
-            assignment={
-                "name": discussion["title"],
-                "points_possible": discussion["points_possible"],  # Adjust points if needed
-                "grading_type": "points",
-                "submission_types": ["discussion_topic"],
-                "published": discussion["published"],
-                "pinned": discussion["pinned"],
-                "assignment_group_id": discussion_group.id,
-                "lock_at": discussion["lock_at"],  # Using the lock_at from JSON
-                "due_at": discussion["due_at"],
-                "unlock_at":discussion["unlock_at"]
-            }
+            **discussion_topic_payload(discussion, assignment_group_id)
         )
         print(f"Discussion topic '{discussion['title']}' created with ID: {discussion_topic.id}")
+        return discussion_topic
     except CanvasException as e:
         print(f"Failed to create discussion assignment '{discussion['title']}': {e}")
+        return None
 
 def create_discussion_boards(
     course_id,
     access_token,
     canvas_domain_url,
-    json_file_path
+    json_file_path,
+    journal=None
 ):
     
-    canvas = Canvas(canvas_domain_url, access_token)
+    canvas = get_canvas(canvas_domain_url, access_token)
     try:
         course = canvas.get_course(course_id)
     except CanvasException as e:
@@ -78,6 +102,33 @@ def create_discussion_boards(
     with open(json_file_path, 'r') as file:
         data = json.load(file)
 
+    # Resolve the "Discussion Boards" group once for the whole run
+    index = get_course_index(canvas_domain_url, access_token, course_id)
+    group_id = index.get_id('assignment_groups', DISCUSSION_GROUP_NAME, ignore_case=True)
+    if group_id is None:
+        group = course.create_assignment_group(name=DISCUSSION_GROUP_NAME)
+        index.add('assignment_groups', {'id': group.id, 'name': group.name})
+        group_id = group.id
+
+    def create_topic(discussion):
+        topic = create_discussion_assignment(course, discussion, group_id)
+        if topic is None:
+            return None
+        return {'id': topic.id, 'title': topic.title}
+
     # Loop through the discussions and create them
-    for discussion in data["DISCUSSION_TOPICS"]:
-        create_discussion_assignment(course, discussion)
+    created_topics = []
+    keys = entry_keys(course_id, 'discussion_topics', [d['title'] for d in data["DISCUSSION_TOPICS"]])
+    for discussion, key in zip(data["DISCUSSION_TOPICS"], keys):
+        topic = journaled(
+            journal,
+            key,
+            lambda: create_topic(discussion),
+            recover=lambda: index.get('discussion_topics', discussion['title']),
+            fields=('id', 'title')
+        )
+        if topic is not None:
+            index.add('discussion_topics', topic)
+            created_topics.append(topic)
+
+    return created_topics
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Apply one datafile set (or one date shift) to many course sections at once.
+
+Targets come either from --courses (course ids on the host/token in
+[canvas-lms-test]) or from --sections (config sections, each with its own
+COURSE_ID, API_TOKEN and CANVAS_DOMAIN_URL):
+
+  python3 canvas_fan_out.py build --prefix CSTC240 --courses 101 102 103
+  python3 canvas_fan_out.py apply --prefix CBSY101 --sections fall-a fall-b
+  python3 canvas_fan_out.py shift-dates --days 7 --courses 101 102
+
+Modes:
+  build        run the main.py creators (modules, assignment groups,
+               assignments, pages, discussions)
+  plan/apply   canvas_course_plan.py against every course
+  shift-dates  move every assignment's unlock/due/lock dates by --days,
+               through assignments/bulk_update
+
+--parallel-courses courses run at the same time, and each course's creators
+use --course-workers threads. Courses on the same host and token still share
+one pooled client and rate limiter, since Canvas meters the token, not the
+course. So --course-workers caps one course's threads; it is not a separate
+connection budget. Each course's output is buffered and printed as one block
+when it finishes, followed by a combined per-course report.
+"""
+
+import argparse
+import configparser
+import contextvars
+import io
+import json
+import os
+import sys
+import threading
+import time
+from datetime import timedelta, timezone
+
+import canvas_course_plan
+from canvas_api_utils import get_client, run_concurrently
+from canvas_assignment_creator import create_multiple_assignments
+from canvas_assignment_groups_creator import create_multiple_assignment_groups
+from canvas_bulk_dates import bulk_update_assignment_dates
+from canvas_build_journal import open_journal
+from canvas_discussion_board import create_discussion_boards
+from canvas_module_creator import create_multiple_modules
+from canvas_page_creator import create_multiple_pages
+
+CONFIG_PATH = 'etc/config.txt'
+CONFIG_SECTION = 'canvas-lms-test'
+DATAFILES_DIR = 'datafiles'
+DEFAULT_PARALLEL_COURSES = 4
+# build keeps one journal per course here, so a failed course can just be re-run.
+JOURNAL_DIR = 'journal'
+
+# Buffer that print() writes to while a course is being processed.
+_course_output = contextvars.ContextVar('course_output', default=None)
+
+
+class _CourseStdout(io.TextIOBase):
+    """sys.stdout stand-in that routes each course's prints to its own buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buffer = _course_output.get()
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def load_targets(args):
+    """Return a list of (label, course_id, token, domain) to work on."""
+    config = configparser.ConfigParser()
+    config.read(CONFIG_PATH)
+
+    if args.sections:
+        targets = []
+        for name in args.sections:
+            if name not in config:
+                raise KeyError(f"Section [{name}] not found in {CONFIG_PATH}. Available sections: {config.sections()}")
+            section = config[name]
+            targets.append((name, section['COURSE_ID'], section['API_TOKEN'], section['CANVAS_DOMAIN_URL']))
+        return targets
+
+    if CONFIG_SECTION not in config:
+        raise KeyError(f"Section [{CONFIG_SECTION}] not found in {CONFIG_PATH}. Available sections: {config.sections()}")
+    section = config[CONFIG_SECTION]
+    return [(str(cid), str(cid), section['API_TOKEN'], section['CANVAS_DOMAIN_URL']) for cid in args.courses]
+
+
+def read_from_json(file_path, data_type):
+    with open(file_path, 'r') as file:
+        return json.load(file)[data_type]
+
+
+# --------------------------------------------------------------------
+# Per-course jobs. Each returns a list of (step, succeeded, attempted).
+# --------------------------------------------------------------------
+
+def build_course(course_id, token, domain, prefix, workers):
+    def datafile(kind):
+        return os.path.join(DATAFILES_DIR, f"{prefix}-{kind}.json")
+
+    steps = []
+    journal = open_journal(os.path.join(JOURNAL_DIR, f"course-{course_id}.jsonl"))
+    try:
+        modules = read_from_json(datafile('module-data'), 'MODULE_NAMES')
+        created = create_multiple_modules(course_id, token, domain, domain, modules, max_workers=workers, journal=journal)
+        steps.append(('modules', len(created), len(modules)))
+
+        groups = read_from_json(datafile('assignment-groups-data'), 'ASSIGNMENT_GROUPS')
+        created = create_multiple_assignment_groups(course_id, token, domain, groups, max_workers=workers, journal=journal)
+        steps.append(('assignment groups', len(created), len(groups)))
+
+        assignments = read_from_json(datafile('assignment-data'), 'ASSIGNMENTS')
+        created = create_multiple_assignments(course_id, token, domain, assignments, max_workers=workers, journal=journal)
+        steps.append(('assignments', len(created), len(assignments)))
+
+        pages = read_from_json(datafile('pages-data'), 'PAGES')
+        created = create_multiple_pages(course_id, token, domain, pages, max_workers=workers, journal=journal)
+        steps.append(('pages', len(created), len(pages)))
+
+        if os.path.exists(datafile('discussion-topic-data')):
+            topics = read_from_json(datafile('discussion-topic-data'), 'DISCUSSION_TOPICS')
+            created = create_discussion_boards(course_id, token, domain, datafile('discussion-topic-data'), journal=journal)
+            steps.append(('discussions', len(created), len(topics)))
+
+        print(journal.summary())
+    finally:
+        # A stage that raises (or exits) must not leave the journal open.
+        journal.close()
+    return steps
+
+
+def plan_course(course_id, token, domain, prefix, workers, apply):
+    client = get_client(domain, token)
+    desired = canvas_course_plan.load_desired(prefix)
+    current = canvas_course_plan.fetch_current(client, course_id, canvas_course_plan.resources_to_read(desired))
+    tz = canvas_course_plan.course_timezone(client, course_id)
+    changes = canvas_course_plan.build_plan(desired, current, tz)
+    canvas_course_plan.print_plan(changes)
+
+    if not apply:
+        return [('planned changes', len(changes), len(changes))]
+    if not changes:
+        return [('changes', 0, 0)]
+    report = canvas_course_plan.apply_plan(client, course_id, changes, current, workers)
+    return [('changes', report['created'] + report['updated'], len(changes))]
+
+
+def _shift(value, days, tz):
+    """
+    Move a timestamp by whole days on the course's wall clock, so a 11:59 PM
+    due time stays 11:59 PM when the shift crosses a DST change.
+    """
+    dt = canvas_course_plan.parse_timestamp(value)
+    if not dt:
+        return None
+    local = dt.astimezone(tz)
+    return (local + timedelta(days=days)).astimezone(timezone.utc).isoformat()
+
+
+def shift_course_dates(course_id, token, domain, days):
+    client = get_client(domain, token)
+    tz = canvas_course_plan.course_timezone(client, course_id)
+    updates = []
+    for assignment in client.paginate(client.course_url(course_id, 'assignments')):
+        if not any(assignment.get(k) for k in ('unlock_at', 'due_at', 'lock_at')):
+            continue
+        updates.append({
+            'id': assignment['id'],
+            'unlock_at': _shift(assignment.get('unlock_at'), days, tz),
+            'due_at': _shift(assignment.get('due_at'), days, tz),
+            'lock_at': _shift(assignment.get('lock_at'), days, tz),
+        })
+
+    def single_put(update):
+        url = client.course_url(course_id, f"assignments/{update['id']}")
+        body = {'assignment': {k: update[k] for k in ('unlock_at', 'due_at', 'lock_at')}}
+        client.put(url, json=body).raise_for_status()
+
+    print(f"Shifting {len(updates)} assignments by {days} day(s) in {tz.key}...")
+    report = bulk_update_assignment_dates(client, course_id, updates, single_put)
+    print(f"  [UPDATED] via bulk_update: {len(report['bulk'])}")
+    print(f"  [UPDATED] via single PUT:  {len(report['fallback'])}")
+    return [('assignment dates', len(report['bulk']) + len(report['fallback']), len(updates))]
+
+
+# --------------------------------------------------------------------
+# Runner
+# --------------------------------------------------------------------
+
+def run_fan_out(targets, job, parallel_courses=DEFAULT_PARALLEL_COURSES, quiet=False):
+    """
+    Run job(course_id, token, domain) for every target, parallel_courses at a time.
+
+    :return: list of per-course result dicts in target order
+    """
+    print_lock = threading.Lock()
+    real_stdout = sys.stdout
+    sys.stdout = _CourseStdout(real_stdout)
+
+    def run_one(target):
+        label, course_id, token, domain = target
+        buffer = io.StringIO()
+        _course_output.set(buffer)
+        start = time.perf_counter()
+        result = {'course': label, 'course_id': course_id, 'steps': [], 'error': None}
+        try:
+            result['steps'] = job(course_id, token, domain)
+        except (Exception, SystemExit) as e:
+            # The creators exit() when a course can't be fetched; keep going.
+            result['error'] = str(e) or type(e).__name__
+            print(f"[ERROR] {result['error']}")
+        result['seconds'] = round(time.perf_counter() - start, 2)
+        result['ok'] = result['error'] is None and all(done == total for _, done, total in result['steps'])
+
+        with print_lock:
+            status = 'OK' if result['ok'] else 'FAILED'
+            if not quiet:
+                real_stdout.write(f"\n{'=' * 70}\n[{label}] course {course_id}\n{'=' * 70}\n")
+                real_stdout.write(buffer.getvalue())
+            real_stdout.write(f"[{label}] finished in {result['seconds']}s: {status}\n")
+            real_stdout.flush()
+        return result
+
+    try:
+        return list(run_concurrently(run_one, targets, parallel_courses))
+    finally:
+        sys.stdout = real_stdout
+
+
+def print_report(results):
+    print("\nFan-out report:")
+    for result in results:
+        status = 'OK' if result['ok'] else 'FAILED'
+        print(f"  {result['course']:<20} {status:<7} {result['seconds']:>7.2f}s")
+        for step, done, total in result['steps']:
+            print(f"      {step:<20} {done}/{total}")
+        if result['error']:
+            print(f"      error: {result['error']}")
+    failed = [r['course'] for r in results if not r['ok']]
+    print(f"\n{len(results) - len(failed)}/{len(results)} courses succeeded.")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Apply the same build or date shift to many Canvas courses.")
+    ap.add_argument('mode', choices=['build', 'plan', 'apply', 'shift-dates'])
+    target = ap.add_mutually_exclusive_group(required=True)
+    target.add_argument('--courses', nargs='+', help=f"Course ids on the [{CONFIG_SECTION}] host/token.")
+    target.add_argument('--sections', nargs='+', help="Config sections, one per course.")
+    ap.add_argument('--prefix', default='CSTC240', help="Datafile prefix for build/plan/apply.")
+    ap.add_argument('--days', type=int, help="Days to move assignment dates by (shift-dates).")
+    ap.add_argument('--parallel-courses', type=int, default=DEFAULT_PARALLEL_COURSES)
+    ap.add_argument('--course-workers', type=int, default=1,
+                    help="Worker threads per course (courses sharing a token share its rate limiter).")
+    ap.add_argument('--quiet', action='store_true', help="Only print the per-course status and report.")
+    args = ap.parse_args()
+
+    if args.mode == 'shift-dates' and args.days is None:
+        ap.error("shift-dates needs --days")
+
+    if args.mode == 'build':
+        def job(course_id, token, domain):
+            return build_course(course_id, token, domain, args.prefix, args.course_workers)
+    elif args.mode in ('plan', 'apply'):
+        def job(course_id, token, domain):
+            return plan_course(course_id, token, domain, args.prefix, args.course_workers, args.mode == 'apply')
+    else:
+        def job(course_id, token, domain):
+            return shift_course_dates(course_id, token, domain, args.days)
+
+    targets = load_targets(args)
+    print(f"{args.mode}: {len(targets)} course(s), {args.parallel_courses} at a time, "
+          f"{args.course_workers} worker(s) per course")
+    results = run_fan_out(targets, job, args.parallel_courses, args.quiet)
+    print_report(results)
+    if not all(r['ok'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
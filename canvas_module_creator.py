@@ -1,9 +1,14 @@
 from ast import mod
 import requests
 from datetime import datetime, timedelta
-from canvasapi import Canvas
-from canvasapi.exceptions import CanvasException
-from canvas_api_utils import build_course_api_url
+from canvas_api_utils import (
+    DEFAULT_MAX_WORKERS,
+    build_course_api_url,
+    get_client,
+    run_concurrently
+)
+from canvas_build_journal import entry_keys, journaled
+from canvas_course_index import get_course_index
 
 def update_module_publish_status(
     module_name,
@@ -21,23 +26,19 @@ def update_module_publish_status(
         print(f"Error updating module: {e}")
         return None
     
-    # Headers for the API request
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(canvas_domain_url, access_token)
 
+    # name and unlock_at were set when the module was created; this
+    # request only publishes it.
     payload = {
         'module': {
-            'name': module_name,
-            'unlock_at': unlock_date.isoformat(),
             'published': True
         }
     }
     
     try:
         # Send POST request to create the module
-        response = requests.put(base_url, json=payload, headers=headers)
+        response = client.put(base_url, json=payload)
         
         # Raise an exception for HTTP errors
         response.raise_for_status()
@@ -57,25 +58,27 @@ def add_text_headers(
     header_text,
     position
 ):
-    try:
-        # Initialize Canvas object
-        canvas = Canvas(canvas_domain_url, access_token)
-        
-        # Get the course
-        course = canvas.get_course(course_id)
-        
-        # Get the module using the module_id
-        module = course.get_module(module_id)
-        
-        # Add the text header to the module
-        module.create_module_item({
+    # Post straight to the module's items endpoint on the shared client;
+    # we already have the module id, so there is no need to fetch the
+    # course and module (or build a new Canvas session) per header.
+    client = get_client(canvas_domain_url, access_token)
+    url = client.course_url(course_id, f"modules/{module_id}/items")
+
+    payload = {
+        'module_item': {
             'type': 'SubHeader',
             'title': header_text,
             'position': position  # The position of the subheader in the module
-        })
+        }
+    }
+
+    try:
+        response = client.post(url, json=payload)
+        response.raise_for_status()
         print(f"Text header '{header_text}' added to module {module_id} successfully.")
-    
-    except CanvasException as e:
+        return response.json()['id']
+
+    except requests.exceptions.RequestException as e:
         print(f"Failed to add text header: {e}")
         return None  # Optionally return None or something else to signify failure
 
@@ -86,39 +89,38 @@ def create_canvas_module(
     access_token, 
     canvas_domain_url, 
     module_name, 
-    unlock_date
-
+    unlock_date,
+    position=None
 ):
     base_url = build_course_api_url(canvas_domain_url, course_id, "modules")
     
-    # Headers for the API request
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(canvas_domain_url, access_token)
     
-    # Prepare module payload
+    # Prepare module payload. Canvas takes unlock_at and position on
+    # create but ignores published, so new modules still need the
+    # update_module_publish_status PUT; see create_multiple_modules.
     payload = {
         'module': {
-            'name': module_name
+            'name': module_name,
+            'unlock_at': unlock_date.isoformat() if unlock_date else None
         }
     }
+    if position is not None:
+        payload['module']['position'] = position
     
     try:
         # Send POST request to create the module
-        response = requests.post(base_url, json=payload, headers=headers)
+        response = client.post(base_url, json=payload)
         
         # Raise an exception for HTTP errors
         response.raise_for_status()
 
         data = response.json()
         
-        module_id = data["id"]
-        
-        updateresults = update_module_publish_status(module_name,module_id,canvas_domain_url,course_id,access_token,unlock_date)
+        get_course_index(canvas_domain_url, access_token, course_id).add('modules', data)
     
         # Return the JSON response
-        return module_id
+        return data
     
     except requests.exceptions.RequestException as e:
         print(f"Error creating module {module_name}: {e}")
@@ -129,44 +131,99 @@ def create_multiple_modules(
     access_token, 
     canvas_domain_url,
     COLLEGE_CANVAS_DOMAIN,
-    module_names
+    module_names,
+    max_workers=DEFAULT_MAX_WORKERS,
+    journal=None
 ):
     created_modules = []
+    module_ids = []
+    index = get_course_index(canvas_domain_url, access_token, course_id)
+    keys = entry_keys(course_id, 'modules', [m['name'] for m in module_names])
 
-    for i, module_name in enumerate(module_names):
+    # Module POSTs stay sequential: Canvas appends each new module to the
+    # end of the course, so creation order is the module order. A
+    # datafile entry may pin its place with "position".
+    already_published = set()
+    for module_name, key in zip(module_names, keys):
         # Determine unlock date (use None if not provided)
         module_name['unlock_date'] = datetime.fromisoformat(module_name['unlock_date'])
 
-        module_id_result = create_canvas_module(
-            course_id, 
-            access_token, 
-            canvas_domain_url,
-            module_name['name'],
-            module_name['unlock_date'],
-        )
+        def create(module_name=module_name, key=key):
+            module = create_canvas_module(
+                course_id, 
+                access_token, 
+                canvas_domain_url,
+                module_name['name'],
+                module_name['unlock_date'],
+                position=module_name.get('position')
+            )
+            if not module:
+                return None
+            if module.get('published') is True:
+                already_published.add(key)
+            return module['id']
+
+        module_ids.append(journaled(
+            journal,
+            key,
+            create,
+            recover=lambda: index.get_id('modules', module_name['name'])
+        ))
+
+    def finish_module(entry):
+        module_name, module_id, key = entry
+        if not module_id:
+            return None
+
+        # Each follow-up is journaled on its own so a resumed build neither
+        # re-publishes nor adds a second copy of a SubHeader. Canvas
+        # creates modules unpublished, so the PUT is skipped only when the
+        # create response already came back published.
+        if key in already_published:
+            journaled(journal, f"{key}:publish", lambda: {'id': module_id}, fields=('id',))
+        else:
+            journaled(journal, f"{key}:publish", lambda: update_module_publish_status(
+                module_name['name'],
+                module_id,
+                canvas_domain_url,
+                course_id,
+                access_token,
+                module_name['unlock_date']
+            ), fields=('id',))
 
+        # SubHeaders are added one after the other within a module so they
+        # land at positions 1 and 2; different modules run in parallel.
         #add module item if true
         if(module_name['addHomeworkSubHeader'] == True):
-            add_text_headers(
+            journaled(journal, f"{key}:subheader1", lambda: add_text_headers(
                 course_id,
                 access_token, 
                 COLLEGE_CANVAS_DOMAIN,
-                module_id_result,
+                module_id,
                 module_name['HomeworkSubHeaderText'],
                 1
-            )
+            ))
         
         #add module item if true
         if(module_name['addQuizSubHeader'] == True):
-            add_text_headers(
+            journaled(journal, f"{key}:subheader2", lambda: add_text_headers(
                 course_id,
                 access_token, 
                 COLLEGE_CANVAS_DOMAIN,
-                module_id_result,
+                module_id,
                 module_name['QuizSubHeaderText'],
                 2
-            )
-        
+            ))
+
+        return module_id
+
+    results = run_concurrently(
+        finish_module,
+        list(zip(module_names, module_ids, keys)),
+        max_workers
+    )
+
+    for module_name, module_id_result in zip(module_names, results):
         if module_id_result:
             print("Module created successfully!")
             print(f"Module ID:" + str(module_id_result))
@@ -1,6 +1,13 @@
 import requests
 from datetime import datetime, timedelta
-from canvas_api_utils import build_course_api_url
+from canvas_api_utils import (
+    DEFAULT_MAX_WORKERS,
+    build_course_api_url,
+    get_client,
+    run_concurrently
+)
+from canvas_build_journal import entry_keys, journaled
+from canvas_course_index import get_course_index
 
 def create_canvas_page(
     course_id, 
@@ -11,11 +18,7 @@ def create_canvas_page(
 ):
     base_url = build_course_api_url(canvas_domain_url, course_id, "pages")
     
-    # Headers for the API request
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(canvas_domain_url, access_token)
     
     # Prepare module payload
     payload = {
@@ -28,12 +31,13 @@ def create_canvas_page(
     
     try:
         # Send POST request to create the module
-        response = requests.post(base_url, json=payload, headers=headers)
+        response = client.post(base_url, json=payload)
         
         # Raise an exception for HTTP errors
         response.raise_for_status()
 
         data = response.json()
+        get_course_index(canvas_domain_url, access_token, course_id).add('pages', data)
 
         # Return the JSON response
         return data
@@ -46,21 +50,28 @@ def create_multiple_pages(
     course_id, 
     access_token, 
     canvas_domain_url,
-    page_names
+    page_names,
+    max_workers=DEFAULT_MAX_WORKERS,
+    journal=None
 ):
 
     created_pages= []
+    index = get_course_index(canvas_domain_url, access_token, course_id)
+    keys = entry_keys(course_id, 'pages', [p['title'] for p in page_names])
 
-    for i, page_name in enumerate(page_names):
-
-        result = create_canvas_page(
+    def create_one(entry):
+        page_name, key = entry
+        return journaled(journal, key, lambda: create_canvas_page(
             course_id, 
             access_token, 
             canvas_domain_url,
             page_name['title'],
             page_name['body']
-        )
-        
+        ), recover=lambda: index.get('pages', page_name['title']), fields=('page_id', 'url', 'title'))
+
+    results = run_concurrently(create_one, list(zip(page_names, keys)), max_workers)
+
+    for page_name, result in zip(page_names, results):
         if result:
             print("Page created successfully!")
             print(f"Page ID: {result.get('id')}")
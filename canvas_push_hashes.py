@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Record of the page and discussion bodies we last pushed to Canvas.
+
+For each successful upload we keep a sha256 of the normalized HTML and a
+version marker for the item as Canvas returned it: updated_at for pages,
+and content_version() of the stored message for discussion topics, which
+have no updated_at. A later upload of the same item is skipped when the
+freshly generated body hashes the same *and* the live version still
+matches, i.e. nobody has edited the item since we wrote it:
+
+  store = store_from_config(config[CONFIG_SECTION])
+  if store and store.is_current(course_id, 'pages', page['url'], html, page['updated_at']):
+      ...skip...
+  updated = put(...)
+  store.record(course_id, 'pages', page['url'], html, updated['updated_at'])
+
+Run `python3 canvas_push_hashes.py --clear` (or `--course <id>`) to forget
+what was pushed and force the next run to compare against Canvas again.
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from canvas_course_plan import normalize_html, parse_timestamp
+
+DEFAULT_STORE_PATH = ".canvas-pushed.sqlite"
+
+
+def body_hash(html):
+    """Hash of the body as Canvas will compare it (whitespace-insensitive)."""
+    return hashlib.sha256(normalize_html(html).encode('utf-8')).hexdigest()
+
+
+def content_version(html):
+    """Version marker for items without updated_at: a hash of their live body, or None."""
+    if html is None:
+        return None
+    return f"sha256:{body_hash(html)}"
+
+
+def same_version(recorded, live):
+    """True when both markers are known and name the same version of the item."""
+    if recorded in (None, '') or live in (None, ''):
+        return False
+    try:
+        return parse_timestamp(recorded) == parse_timestamp(live)
+    except ValueError:
+        return str(recorded) == str(live)
+
+
+class PushHashStore:
+    """Thread-safe sqlite store of (course, kind, item) -> last pushed body hash."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS pushed ('
+            ' course_id TEXT NOT NULL,'
+            ' kind TEXT NOT NULL,'
+            ' item_id TEXT NOT NULL,'
+            ' hash TEXT NOT NULL,'
+            ' updated_at TEXT,'
+            ' pushed_at REAL NOT NULL,'
+            ' PRIMARY KEY (course_id, kind, item_id))'
+        )
+        self._conn.commit()
+
+    def get(self, course_id, kind, item_id):
+        """(hash, updated_at) recorded for an item, or None."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT hash, updated_at FROM pushed WHERE course_id = ? AND kind = ? AND item_id = ?',
+                (str(course_id), kind, str(item_id))
+            ).fetchone()
+
+    def is_current(self, course_id, kind, item_id, html, updated_at):
+        """
+        True when html is what we last pushed and the item hasn't changed since.
+
+        updated_at is the item's live version marker; a missing marker on
+        either side means we can't tell, so the item is not current.
+        """
+        row = self.get(course_id, kind, item_id)
+        if row is None:
+            return False
+        pushed_hash, pushed_updated_at = row
+        return pushed_hash == body_hash(html) and same_version(pushed_updated_at, updated_at)
+
+    def record(self, course_id, kind, item_id, html, updated_at):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pushed VALUES (?, ?, ?, ?, ?, ?)',
+                (str(course_id), kind, str(item_id), body_hash(html), updated_at, time.time())
+            )
+            self._conn.commit()
+
+    def forget(self, course_id=None):
+        """Drop recorded pushes for one course, or everything."""
+        with self._lock:
+            if course_id is None:
+                self._conn.execute('DELETE FROM pushed')
+            else:
+                self._conn.execute('DELETE FROM pushed WHERE course_id = ?', (str(course_id),))
+            self._conn.commit()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM pushed').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_store(path):
+    """PushHashStore for path, or None when disabled (empty or "off")."""
+    path = (path or '').strip().strip('"')
+    if not path or path.lower() == 'off':
+        return None
+    return PushHashStore(path)
+
+
+def store_from_config(section):
+    """PushHashStore from PUSH_HASH_PATH in a config section (unset, empty or "off" disables)."""
+    return open_store(section.get('PUSH_HASH_PATH', ''))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect or clear the record of bodies pushed to Canvas.")
+    ap.add_argument('--path', default=DEFAULT_STORE_PATH)
+    ap.add_argument('--clear', action='store_true', help='Forget every recorded push.')
+    ap.add_argument('--course', help='Only forget pushes for this course id.')
+    args = ap.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"No push record at {args.path}")
+        return
+
+    store = PushHashStore(args.path)
+    if args.clear or args.course:
+        store.forget(args.course)
+        print(f"Cleared {'course ' + args.course if args.course else 'all entries'}.")
+    print(f"{store.count()} recorded pushes in {args.path}")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of Canvas GET responses with ETag / Last-Modified revalidation.
+
+Entries are keyed by token scope and full request URL (which carries the
+course id and endpoint) and stored in a small sqlite file. A CanvasClient
+given a cache will:
+
+  - serve an entry straight from disk while it is younger than the TTL,
+  - otherwise send If-None-Match / If-Modified-Since and reuse the stored
+    body when Canvas answers 304 Not Modified,
+  - drop every entry for a course after one of its own writes succeeds.
+
+Writes made outside the client (e.g. in the Canvas UI) are not seen;
+run `python3 canvas_response_cache.py --clear` if a listing looks stale.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_PATH = ".canvas-cache.sqlite"
+# 0 = always revalidate with Canvas (cheap 304s), >0 = trust entries for that many seconds.
+DEFAULT_CACHE_TTL = 0
+
+# Only headers that describe the body are replayed from the cache; rate-limit
+# headers belong to the original call.
+CACHED_HEADERS = ('Content-Type', 'Link', 'ETag', 'Last-Modified')
+
+_COURSE_RE = re.compile(r'/api/v1/courses/(\d+)(?:/|$|\?)')
+
+
+def course_id_from_url(url):
+    match = _COURSE_RE.search(url)
+    return match.group(1) if match else None
+
+
+class CachedEntry:
+    def __init__(self, url, etag, last_modified, headers, body, stored_at):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    def age(self):
+        return time.time() - self.stored_at
+
+    def to_response(self):
+        """Rebuild a requests.Response so callers can't tell it came from disk."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = 'utf-8'
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """Thread-safe sqlite store of GET responses."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' scope TEXT NOT NULL,'
+            ' url TEXT NOT NULL,'
+            ' course_id TEXT,'
+            ' etag TEXT,'
+            ' last_modified TEXT,'
+            ' headers TEXT NOT NULL,'
+            ' body BLOB NOT NULL,'
+            ' stored_at REAL NOT NULL,'
+            ' PRIMARY KEY (scope, url))'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_course ON responses (scope, course_id)')
+        self._conn.commit()
+
+    def get(self, scope, url):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, headers, body, stored_at FROM responses WHERE scope = ? AND url = ?',
+                (scope, url)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body, stored_at = row
+        return CachedEntry(url, etag, last_modified, json.loads(headers), body, stored_at)
+
+    def is_fresh(self, entry):
+        return self.ttl > 0 and entry.age() < self.ttl
+
+    def store(self, scope, url, response):
+        """Keep a 200 response if Canvas gave us something to revalidate with."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified or self.ttl > 0):
+            return
+        headers = {k: response.headers[k] for k in CACHED_HEADERS if k in response.headers}
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (scope, url, course_id_from_url(url), etag, last_modified,
+                 json.dumps(headers), response.content, time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, scope, url):
+        """Restart the TTL of an entry Canvas just confirmed with a 304."""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET stored_at = ? WHERE scope = ? AND url = ?',
+                (time.time(), scope, url)
+            )
+            self._conn.commit()
+
+    def invalidate(self, scope=None, course_id=None):
+        """Drop cached responses for one course, one token scope, or everything."""
+        query, args = 'DELETE FROM responses', []
+        clauses = []
+        if scope is not None:
+            clauses.append('scope = ?')
+            args.append(scope)
+        if course_id is not None:
+            clauses.append('course_id = ?')
+            args.append(str(course_id))
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        with self._lock:
+            self._conn.execute(query, args)
+            self._conn.commit()
+
+    def clear(self):
+        self.invalidate()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def cache_from_config(section):
+    """
+    Build a ResponseCache from CACHE_PATH / CACHE_TTL in a config section.
+
+    Caching is opt-in: without CACHE_PATH (or with it empty or "off")
+    this returns None and the client sends every GET as before.
+    """
+    path = section.get('CACHE_PATH', '').strip().strip('"')
+    if not path or path.lower() == 'off':
+        return None
+    return ResponseCache(path, ttl=float(section.get('CACHE_TTL', DEFAULT_CACHE_TTL)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect or clear the on-disk Canvas response cache.")
+    ap.add_argument('--path', default=DEFAULT_CACHE_PATH)
+    ap.add_argument('--clear', action='store_true', help='Delete every cached response.')
+    ap.add_argument('--course', help='Only clear responses for this course id.')
+    args = ap.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"No cache at {args.path}")
+        return
+
+    cache = ResponseCache(args.path)
+    if args.clear or args.course:
+        cache.invalidate(course_id=args.course)
+        print(f"Cleared {'course ' + args.course if args.course else 'all entries'}.")
+    print(f"{cache.count()} cached responses in {args.path}")
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
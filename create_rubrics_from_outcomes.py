@@ -7,24 +7,42 @@ Defaults:
 - Reads Canvas config from etc/config.txt, section [canvas-lms-test].
 - DRY_RUN=True: prints the rubrics it would create; no API writes until flipped.
 - Skips any rubric whose title already exists in the course.
+- Runs as a pipeline on MAX_WORKERS threads: every group's outcome listing
+  is requested at once, each outcome is enriched as soon as its group
+  listing arrives, and its rubric is POSTed as soon as it is enriched.
+- USE_ASYNC=True holds the rubric POSTs back and sends them all at once
+  through the asyncio client when the listings are done.
+- With CACHE_PATH/CACHE_TTL set, outcome records are kept in the on-disk
+  response cache, so later runs revalidate (or skip) them instead of
+  downloading each one again.
 
 API endpoints used:
 - GET  /api/v1/courses/:course_id/outcome_groups
-- GET  /api/v1/outcome_groups/:outcome_group_id/outcomes?include[]=ratings
+- GET  /api/v1/courses/:course_id/outcome_groups/:id/outcomes?outcome_style=full
+- GET  /api/v1/outcomes/:id?include[]=ratings  (only for records the listing left incomplete)
 - GET  /api/v1/courses/:course_id/rubrics
 - POST /api/v1/courses/:course_id/rubrics
 
 Adjust constants below if you need a different config section or a subset of outcomes.
 """
 
+import asyncio
 import configparser
+import contextvars
 import requests
-from typing import Dict, List, Set
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Set, Tuple
 from functools import lru_cache
 
+from canvas_api_async import AsyncCanvasClient, gather_settled
+from canvas_api_utils import DEFAULT_MAX_WORKERS, get_client
+from canvas_response_cache import cache_from_config
+
 CONFIG_PATH = "etc/config.txt"
 CONFIG_SECTION = "canvas-lms-test"
 DRY_RUN = False
+# Send all rubric POSTs at once through the asyncio client instead of on the thread pool.
+USE_ASYNC = False
 
 # If you want to only process certain outcomes, list their IDs here; leave empty to process all.
 LIMIT_TO_OUTCOME_IDS: List[int] = []
@@ -40,87 +58,41 @@ if CONFIG_SECTION not in config:
 COURSE_ID = config[CONFIG_SECTION]["COURSE_ID"]
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"].rstrip("/")
+MAX_WORKERS = int(config[CONFIG_SECTION].get("MAX_WORKERS", DEFAULT_MAX_WORKERS))
 
-
-def headers() -> Dict[str, str]:
-    return {"Authorization": f"Bearer {API_TOKEN}", "Accept": "application/json"}
+# Outcome records change rarely; the response cache keeps them across runs.
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN, cache=cache_from_config(config[CONFIG_SECTION]))
 
 
 def list_outcome_groups() -> List[Dict]:
-    groups: List[Dict] = []
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/outcome_groups"
-    params = {"per_page": 100}
-    while url:
-        resp = requests.get(url, headers=headers(), params=params, timeout=30)
-        resp.raise_for_status()
-        groups.extend(resp.json())
-
-        next_url = None
-        link = resp.headers.get("Link", "")
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                next_url = part[part.find("<") + 1: part.find(">")]
-                break
-        url = next_url
-        params = {}
-    return groups
-
-
-def list_outcomes_from_groups(groups: List[Dict]) -> List[Dict]:
-    seen_ids: Set[int] = set()
-    outcomes: List[Dict] = []
+    return list(CLIENT.paginate(url))
 
-    for g in groups:
-        group_id = g.get("id")
-        if not group_id:
-            continue
-        url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/outcome_groups/{group_id}/outcomes"
-        params = {"per_page": 100}
-        while url:
-            resp = requests.get(url, headers=headers(), params=params, timeout=30)
-            if resp.status_code == 404:
-                break
-            resp.raise_for_status()
-            items = resp.json()
-            for o in items:
-                outcome = o.get("outcome") or o
-                oid = outcome.get("id") if isinstance(outcome, dict) else None
-                if oid and oid not in seen_ids:
-                    seen_ids.add(oid)
-                    outcomes.append(outcome)
-            next_url = None
-            link = resp.headers.get("Link", "")
-            for part in link.split(","):
-                part = part.strip()
-                if 'rel="next"' in part:
-                    next_url = part[part.find("<") + 1: part.find(">")]
-                    break
-            url = next_url
-            params = {}
 
+def list_group_outcomes(group_id) -> List[Dict]:
+    """
+    Outcomes linked into one outcome group ([] if the group is gone).
+
+    outcome_style=full asks Canvas for the whole outcome record (description,
+    ratings, points) in the listing instead of an id/title/url stub.
+    """
+    url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/outcome_groups/{group_id}/outcomes"
+    params = {"outcome_style": "full"}
+    outcomes: List[Dict] = []
+    try:
+        for o in CLIENT.paginate(url, params=params):
+            outcome = o.get("outcome") or o
+            if isinstance(outcome, dict) and outcome.get("id"):
+                outcomes.append(outcome)
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 404:
+            raise
     return outcomes
 
 
 def list_rubrics() -> List[Dict]:
-    rubrics: List[Dict] = []
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/rubrics"
-    params = {"per_page": 100}
-    while url:
-        resp = requests.get(url, headers=headers(), params=params, timeout=30)
-        resp.raise_for_status()
-        rubrics.extend(resp.json())
-
-        next_url = None
-        link = resp.headers.get("Link", "")
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                next_url = part[part.find("<") + 1: part.find(">")]
-                break
-        url = next_url
-        params = {}
-    return rubrics
+    return CLIENT.paginate_all(url)
 
 
 def rubric_exists(title: str, rubrics: List[Dict]) -> bool:
@@ -131,14 +103,19 @@ def rubric_exists(title: str, rubrics: List[Dict]) -> bool:
 def fetch_outcome(outcome_id: int) -> Dict:
     url = f"{CANVAS_DOMAIN_URL}/api/v1/outcomes/{outcome_id}"
     params = {"include[]": "ratings"}
-    resp = requests.get(url, headers=headers(), params=params, timeout=30)
+    resp = CLIENT.get(url, params=params)
     resp.raise_for_status()
     return resp.json()
 
 
+def outcome_is_complete(outcome: Dict) -> bool:
+    """True when a listed outcome already carries what build_payload reads."""
+    return "ratings" in outcome and ("description" in outcome or "display_name" in outcome)
+
+
 def enrich_outcome(outcome: Dict) -> Dict:
     oid = outcome.get("id")
-    if not oid:
+    if not oid or outcome_is_complete(outcome):
         return outcome
     detailed = fetch_outcome(int(oid))
     merged = dict(outcome)
@@ -192,62 +169,146 @@ def build_payload(outcome: Dict) -> Dict[str, str]:
 
 def create_rubric(payload: Dict) -> Dict:
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/rubrics"
-    resp = requests.post(url, headers=headers(), data=payload, timeout=30)
+    resp = CLIENT.post(url, data=payload)
     resp.raise_for_status()
     return resp.json()
 
 
+async def create_rubrics_async(payloads: List[Dict]) -> List[Tuple]:
+    """(created, None) or (None, error) per payload, in order."""
+    async with AsyncCanvasClient(CANVAS_DOMAIN_URL, API_TOKEN) as client:
+        async def create_one(payload: Dict) -> Dict:
+            resp = await client.post(client.course_url(COURSE_ID, "rubrics"), data=payload)
+            resp.raise_for_status()
+            return resp.json()
+
+        return await gather_settled([create_one(p) for p in payloads])
+
+
+def rubric_title(outcome: Dict) -> str:
+    return outcome.get("title", "").strip() or f"Outcome {outcome.get('id')}"
+
+
+def print_created(created: Dict) -> None:
+    body = created.get("rubric") if isinstance(created, dict) else None
+    rid = None
+    rtitle = None
+    if body:
+        rid = body.get("id")
+        rtitle = body.get("title")
+    else:
+        rid = created.get("id") if isinstance(created, dict) else None
+        rtitle = created.get("title") if isinstance(created, dict) else None
+    print(f"  Created rubric id={rid} title='{rtitle}'")
+
+
+def run_pipeline(groups: List[Dict], rubrics: List[Dict], max_workers: int = MAX_WORKERS) -> Dict[str, int]:
+    """
+    List group outcomes -> enrich -> create rubric, each stage fed as soon as
+    the one before it finishes an item, all on one bounded thread pool.
+    """
+    report = {"outcomes": 0, "fetched": 0, "skipped": 0, "prepared": 0, "created": 0, "failed": 0}
+    seen_ids: Set[int] = set()
+    # Titles prepared in this run, so two outcomes sharing a title make one rubric.
+    seen_titles: Set[str] = set()
+    pending = {}
+    # (title, payload) held back for create_rubrics_async when USE_ASYNC is on.
+    queued: List[Tuple[str, Dict]] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        def submit(stage, label, func, *args):
+            future = pool.submit(contextvars.copy_context().run, func, *args)
+            pending[future] = (stage, label)
+
+        def ready(outcome):
+            title = rubric_title(outcome)
+            if rubric_exists(title, rubrics) or title.lower() in seen_titles:
+                print(f"[SKIP] Rubric titled '{title}' already exists.")
+                report["skipped"] += 1
+                return
+            seen_titles.add(title.lower())
+            payload = build_payload(outcome)
+            report["prepared"] += 1
+            if DRY_RUN:
+                print(f"Title: {title}")
+                for k, v in payload.items():
+                    print(f"  {k} = {v}")
+                print("---")
+                return
+            if USE_ASYNC:
+                queued.append((title, payload))
+                return
+            print(f"Creating rubric '{title}'...")
+            submit("create", f"rubric '{title}'", create_rubric, payload)
+
+        for g in groups:
+            if g.get("id"):
+                submit("group", f"outcome group {g['id']}", list_group_outcomes, g["id"])
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, label = pending.pop(future)
+                try:
+                    result = future.result()
+                except requests.exceptions.RequestException as e:
+                    print(f"[FAILED] {label}: {e}")
+                    report["failed"] += 1
+                    continue
+
+                if stage == "group":
+                    for outcome in result:
+                        oid = outcome["id"]
+                        if oid in seen_ids:
+                            continue
+                        seen_ids.add(oid)
+                        if LIMIT_TO_OUTCOME_IDS and oid not in LIMIT_TO_OUTCOME_IDS:
+                            continue
+                        report["outcomes"] += 1
+                        if outcome_is_complete(outcome):
+                            ready(outcome)
+                        else:
+                            # The listing came back as a stub; fetch just this one.
+                            report["fetched"] += 1
+                            submit("enrich", f"outcome {oid}", enrich_outcome, outcome)
+
+                elif stage == "enrich":
+                    ready(result)
+
+                else:
+                    print_created(result)
+                    report["created"] += 1
+
+    if queued:
+        print(f"Creating {len(queued)} rubrics concurrently...")
+        results = asyncio.run(create_rubrics_async([payload for _, payload in queued]))
+        for (title, _), (created, error) in zip(queued, results):
+            if error is not None:
+                print(f"[FAILED] rubric '{title}': {error}")
+                report["failed"] += 1
+                continue
+            print_created(created)
+            report["created"] += 1
+
+    return report
+
+
 def main():
     print(f"Reading outcome groups for course {COURSE_ID}...")
     groups = list_outcome_groups()
-    print(f"Found {len(groups)} outcome groups. Reading outcomes from groups...")
-    outcomes = list_outcomes_from_groups(groups)
-    # Enrich with ratings/description
-    outcomes = [enrich_outcome(o) for o in outcomes]
-
-    if LIMIT_TO_OUTCOME_IDS:
-        outcomes = [o for o in outcomes if o.get("id") in LIMIT_TO_OUTCOME_IDS]
-        print(f"Filtered to {len(outcomes)} outcomes via LIMIT_TO_OUTCOME_IDS")
-
-    print(f"Found {len(outcomes)} outcomes. Loading existing rubrics for duplicate check...")
+    print(f"Found {len(groups)} outcome groups. Loading existing rubrics for duplicate check...")
     rubrics = list_rubrics()
+    if LIMIT_TO_OUTCOME_IDS:
+        print(f"Limiting to {len(LIMIT_TO_OUTCOME_IDS)} outcomes via LIMIT_TO_OUTCOME_IDS")
+    if DRY_RUN:
+        print("DRY RUN: showing payloads and titles...")
 
-    to_create = []
-    for o in outcomes:
-        title = o.get("title", "").strip() or f"Outcome {o.get('id')}"
-        if rubric_exists(title, rubrics):
-            print(f"[SKIP] Rubric titled '{title}' already exists.")
-            continue
-        payload = build_payload(o)
-        to_create.append((title, payload))
+    report = run_pipeline(groups, rubrics, MAX_WORKERS)
 
-    if not to_create:
+    print(f"\nOutcomes: {report['outcomes']} ({report['fetched']} fetched individually)  Skipped (rubric exists): {report['skipped']}  "
+          f"Prepared: {report['prepared']}  Created: {report['created']}  Failed: {report['failed']}")
+    if report["prepared"] == 0:
         print("No new rubrics to create. Done.")
-        return
-
-    print(f"Prepared {len(to_create)} new rubrics.")
-    if DRY_RUN:
-        print("DRY RUN: showing first payload (abbreviated) and titles...")
-        for title, payload in to_create:
-            print(f"Title: {title}")
-            for k, v in payload.items():
-                print(f"  {k} = {v}")
-            print("---")
-        return
-
-    for title, payload in to_create:
-        print(f"Creating rubric '{title}'...")
-        created = create_rubric(payload)
-        body = created.get("rubric") if isinstance(created, dict) else None
-        rid = None
-        rtitle = None
-        if body:
-            rid = body.get("id")
-            rtitle = body.get("title")
-        else:
-            rid = created.get("id") if isinstance(created, dict) else None
-            rtitle = created.get("title") if isinstance(created, dict) else None
-        print(f"  Created rubric id={rid} title='{rtitle}'")
 
 
 if __name__ == "__main__":
@@ -8,14 +8,19 @@ Reads etc/config.txt section [canvas-lms-test] for:
 Edit RUBRIC_IDS below to control which rubrics to delete.
 """
 
+import asyncio
 import configparser
-import requests
 from typing import Dict, List
 
+from canvas_api_async import AsyncCanvasClient, gather_settled
+from canvas_api_utils import get_client
+
 CONFIG_PATH = "etc/config.txt"
 CONFIG_SECTION = "canvas-lms-test"
 # Rubric IDs to delete
 RUBRIC_IDS: List[int] = [66415, 66416, 66418, 66419, 66420, 66421]
+# Send all DELETEs at once through the asyncio client instead of one by one.
+USE_ASYNC = False
 
 config = configparser.ConfigParser()
 config.read(CONFIG_PATH)
@@ -29,20 +34,36 @@ COURSE_ID = config[CONFIG_SECTION]["COURSE_ID"]
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"].rstrip("/")
 
-
-def headers() -> Dict[str, str]:
-    return {"Authorization": f"Bearer {API_TOKEN}", "Accept": "application/json"}
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN)
 
 
 def delete_rubric(rubric_id: int) -> None:
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/rubrics/{rubric_id}"
-    resp = requests.delete(url, headers=headers(), timeout=30)
+    resp = CLIENT.delete(url)
     if resp.status_code not in (200, 202, 204):
         msg = resp.text.strip()
         raise SystemExit(f"Failed to delete rubric {rubric_id}: status {resp.status_code} body={msg}")
 
 
+async def delete_rubrics_async(rubric_ids: List[int]) -> None:
+    async with AsyncCanvasClient(CANVAS_DOMAIN_URL, API_TOKEN) as client:
+        async def delete_one(rid: int) -> str:
+            resp = await client.delete(client.course_url(COURSE_ID, f"rubrics/{rid}"))
+            if resp.status_code not in (200, 202, 204):
+                return f"Failed to delete rubric {rid}: status {resp.status_code} body={resp.text.strip()}"
+            return f"  Deleted rubric {rid}"
+
+        results = await gather_settled([delete_one(rid) for rid in rubric_ids])
+        for rid, (line, error) in zip(rubric_ids, results):
+            print(line if error is None else f"Failed to delete rubric {rid}: {error}")
+
+
 def main():
+    if USE_ASYNC:
+        print(f"Deleting {len(RUBRIC_IDS)} rubrics concurrently...")
+        asyncio.run(delete_rubrics_async(RUBRIC_IDS))
+        return
+
     for rid in RUBRIC_IDS:
         print(f"Deleting rubric {rid}...")
         try:
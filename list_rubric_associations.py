@@ -7,9 +7,10 @@ Prints assignment id/name and any attached rubric ids (from rubric_association o
 """
 
 import configparser
-import requests
 from typing import Dict, List, Any
 
+from canvas_api_utils import get_client
+
 CONFIG_PATH = "etc/config.txt"
 CONFIG_SECTION = "canvas-lms-test"
 
@@ -24,30 +25,13 @@ COURSE_ID = config[CONFIG_SECTION]["COURSE_ID"]
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"].rstrip("/")
 
-
-def headers() -> Dict[str, str]:
-    return {"Authorization": f"Bearer {API_TOKEN}", "Accept": "application/json"}
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN)
 
 
 def list_assignments() -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/assignments"
-    params = {"per_page": 100, "include[]": ["rubric_association", "rubric"]}
-    while url:
-        resp = requests.get(url, headers=headers(), params=params, timeout=30)
-        resp.raise_for_status()
-        items.extend(resp.json())
-
-        next_url = None
-        link = resp.headers.get("Link", "")
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                next_url = part[part.find("<") + 1 : part.find(">")]
-                break
-        url = next_url
-        params = {}
-    return items
+    params = {"include[]": ["rubric_association", "rubric"]}
+    return CLIENT.paginate_all(url, params=params)
 
 
 def extract_rubric_ids(assignment: Dict[str, Any]) -> List[str]:
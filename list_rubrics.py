@@ -10,9 +10,10 @@ first criterion id/points/rating ids for quick inspection.
 """
 
 import configparser
-import requests
 from typing import Dict, List
 
+from canvas_api_utils import get_client
+
 CONFIG_PATH = "/Users/ss/etc/config.txt"
 CONFIG_SECTION = "canvas-lms-test"
 
@@ -28,30 +29,12 @@ COURSE_ID = config[CONFIG_SECTION]["COURSE_ID"]
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"].rstrip("/")
 
-
-def headers() -> Dict[str, str]:
-    return {"Authorization": f"Bearer {API_TOKEN}", "Accept": "application/json"}
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN)
 
 
 def list_rubrics() -> List[Dict]:
-    rubrics: List[Dict] = []
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/rubrics"
-    params = {"per_page": 100}
-    while url:
-        resp = requests.get(url, headers=headers(), params=params, timeout=30)
-        resp.raise_for_status()
-        rubrics.extend(resp.json())
-
-        next_url = None
-        link = resp.headers.get("Link", "")
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                next_url = part[part.find("<") + 1: part.find(">")]
-                break
-        url = next_url
-        params = {}
-    return rubrics
+    return CLIENT.paginate_all(url)
 
 
 def main():
@@ -8,6 +8,7 @@ from canvas_assignment_creator import create_multiple_assignments
 from canvas_assignment_groups_creator import create_multiple_assignment_groups
 from canvas_page_creator import create_multiple_pages
 from canvas_discussion_board import create_discussion_boards
+from canvas_build_journal import open_journal
 
 # Create a config parser object
 config = configparser.ConfigParser()
@@ -27,6 +28,11 @@ if CONFIG_SECTION not in config:
 COURSE_ID = config[CONFIG_SECTION]['COURSE_ID']
 API_TOKEN = config[CONFIG_SECTION]['API_TOKEN']
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]['CANVAS_DOMAIN_URL']
+# Parallel requests per creator; 1 keeps the original one-at-a-time behaviour
+MAX_WORKERS = int(config[CONFIG_SECTION].get('MAX_WORKERS', 1))
+# Records each create so a re-run after a failure skips what already exists.
+# Delete the file to build from scratch; set JOURNAL_PATH empty to turn it off.
+JOURNAL_PATH = config[CONFIG_SECTION].get('JOURNAL_PATH', f'journal/course-{COURSE_ID}.jsonl')
 
 def main():
 
@@ -40,13 +46,16 @@ def main():
     #ASSIGNMENTS = read_from_json("datafiles/<CourseID>-assignment-data.json","ASSIGNMENTS")
     #PAGES = read_from_json("datafiles/CBSY101-pages-data.json","PAGES")
     DISCUSSION_TOPICS_PATH = "datafiles/CBSY101-discussion-topic-data.json"
+    journal = open_journal(JOURNAL_PATH)
     
     # created_modules = create_multiple_modules(
     #     COURSE_ID,
     #     API_TOKEN,
     #     CANVAS_DOMAIN_URL,
     #     COLLEGE_CANVAS_DOMAIN,
-    #     MODULE_NAMES
+    #     MODULE_NAMES,
+    #     max_workers=MAX_WORKERS,
+    #     journal=journal
     # )
 
     # created_assignment_groups = create_multiple_assignment_groups(
@@ -54,6 +63,8 @@ def main():
     #     API_TOKEN, 
     #     CANVAS_DOMAIN_URL,
     #     ASSIGNMENT_GROUPS,
+    #     max_workers=MAX_WORKERS,
+    #     journal=journal
     # )
 
     # created_assignments = create_multiple_assignments(
@@ -61,21 +72,29 @@ def main():
     #     API_TOKEN, 
     #     CANVAS_DOMAIN_URL,
     #     ASSIGNMENTS,
+    #     max_workers=MAX_WORKERS,
+    #     journal=journal
     # )
 
     # created_canvas_page = create_multiple_pages(
     #     COURSE_ID, 
     #     API_TOKEN, 
     #     CANVAS_DOMAIN_URL,
-    #     PAGES
+    #     PAGES,
+    #     max_workers=MAX_WORKERS,
+    #     journal=journal
     # )
 
     discussion_board_test = create_discussion_boards(
         COURSE_ID, 
         API_TOKEN, 
         CANVAS_DOMAIN_URL,
-        DISCUSSION_TOPICS_PATH
+        DISCUSSION_TOPICS_PATH,
+        journal=journal
     )
+
+    if journal is not None:
+        print(journal.summary())
    
 if __name__ == "__main__":
     main()
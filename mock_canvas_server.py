@@ -0,0 +1,949 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of the Canvas REST API this repo uses.
+
+Lets the creators, updaters and rubric scripts run offline so concurrency,
+retry and caching changes can be benchmarked and regression-tested on a
+laptop instead of against a production Canvas course.
+
+Covers:
+  courses/:id, modules (+ items, include[]=items), assignments
+  (+ bulk_update, gradebook_settings), assignment_groups, pages,
+  discussion_topics, rubrics, outcome_groups (+ outcomes), outcomes/:id,
+  late_policy, progress/:id
+
+Simulates:
+  - Link-header pagination (per_page / page, rel=current/next/prev/first/last)
+  - per-request latency with jitter
+  - injected 5xx errors and 429 / 403 "Rate Limit Exceeded" throttling
+  - Canvas's leaky-bucket rate limit with X-Rate-Limit-Remaining and
+    X-Request-Cost headers
+  - weak ETags on GET responses and 304 Not Modified for If-None-Match
+
+Request counts and bytes are available at GET /__mock__/stats and reset
+with POST /__mock__/reset.
+
+Usage:
+  python3 mock_canvas_server.py --port 8765 --latency 80
+  # then point CANVAS_DOMAIN_URL at http://127.0.0.1:8765
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from zoneinfo import ZoneInfo
+
+DEFAULT_PER_PAGE = 10
+MAX_PER_PAGE = 100
+# Canvas omits embedded module items when a module has too many of them.
+MAX_INLINE_ITEMS = 10
+
+BUCKET_SIZE = 700.0
+LEAK_RATE = 10.0        # bucket units drained per second
+PREFLIGHT_COST = 50.0   # charged while a request is in flight, then refunded
+REQUEST_COST = 1.0
+
+INT_FIELDS = {"position", "indent", "points_possible", "group_weight", "content_id", "assignment_group_id"}
+
+
+DATE_FIELDS = {"unlock_at", "due_at", "lock_at", "delayed_post_at"}
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def utc_z(value: Any, time_zone: str) -> Any:
+    """Store a date the way Canvas returns it: UTC with a Z; naive values are course-local."""
+    if not value or not isinstance(value, str):
+        return value
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ZoneInfo(time_zone))
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def with_utc_dates(course: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: utc_z(v, course["time_zone"]) if k in DATE_FIELDS else v for k, v in data.items()}
+
+
+def slugify(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") or "page"
+
+
+def coerce(key: str, value: str) -> Any:
+    lowered = value.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if (key in INT_FIELDS or key.endswith("_id") or key == "id") and re.fullmatch(r"-?\d+", value):
+        return int(value)
+    if key in INT_FIELDS and re.fullmatch(r"-?\d+\.\d+", value):
+        return float(value)
+    return value
+
+
+def parse_form(pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Turn Rails-style form keys (a[b][c], a[]) into nested dicts/lists."""
+    result: Dict[str, Any] = {}
+    for raw_key, value in pairs:
+        parts = re.findall(r"[^\[\]]+|\[\]", raw_key)
+        node = result
+        for i, part in enumerate(parts):
+            last = i == len(parts) - 1
+            nxt = parts[i + 1] if not last else None
+            if last:
+                if part == "[]":
+                    continue
+                node[part] = coerce(part, value)
+            elif nxt == "[]":
+                node.setdefault(part, [])
+                node[part].append(coerce(part, value))
+                break
+            else:
+                node = node.setdefault(part, {})
+    return result
+
+
+class NotFound(Exception):
+    pass
+
+
+class CanvasState:
+    """All courses, keyed by course id, plus global outcomes and progress jobs."""
+
+    def __init__(self, max_inline_items: int = MAX_INLINE_ITEMS):
+        self.lock = threading.RLock()
+        self.ids = itertools.count(1000)
+        self.courses: Dict[int, Dict[str, Any]] = {}
+        self.outcomes: Dict[int, Dict[str, Any]] = {}
+        self.progress: Dict[int, Dict[str, Any]] = {}
+        self.max_inline_items = max_inline_items
+
+    def next_id(self) -> int:
+        return next(self.ids)
+
+    def course(self, course_id: int) -> Dict[str, Any]:
+        with self.lock:
+            if course_id not in self.courses:
+                root_group = self.next_id()
+                # New Canvas courses start with a default "Assignments" group.
+                default_group = self.next_id()
+                self.courses[course_id] = {
+                    "id": course_id,
+                    "name": f"Mock Course {course_id}",
+                    "time_zone": "America/Detroit",
+                    "modules": {},
+                    "module_items": {},
+                    "assignments": {},
+                    "assignment_groups": {default_group: {"id": default_group, "name": "Assignments", "position": 1, "group_weight": 0}},
+                    "pages": {},
+                    "discussion_topics": {},
+                    "rubrics": {},
+                    "outcome_groups": {root_group: {"id": root_group, "title": f"Mock Course {course_id}", "outcome_ids": []}},
+                    "late_policy": None,
+                    "gradebook_settings": {},
+                }
+            return self.courses[course_id]
+
+    def seed_outcomes(self, course_id: int, count: int, groups: int = 1) -> None:
+        """Create `count` outcomes with ratings spread over `groups` outcome groups."""
+        course = self.course(course_id)
+        with self.lock:
+            group_ids = list(course["outcome_groups"])
+            while len(group_ids) < groups:
+                gid = self.next_id()
+                course["outcome_groups"][gid] = {"id": gid, "title": f"Outcome Group {len(group_ids)}", "outcome_ids": []}
+                group_ids.append(gid)
+            for n in range(count):
+                oid = self.next_id()
+                self.outcomes[oid] = {
+                    "id": oid,
+                    "title": f"Outcome {n + 1}",
+                    "display_name": f"Outcome {n + 1}",
+                    "description": f"<p>Students can demonstrate outcome {n + 1}.</p>",
+                    "points_possible": 5,
+                    "mastery_points": 3,
+                    "ratings": [
+                        {"description": "Exceeds", "points": 5},
+                        {"description": "Meets", "points": 3},
+                        {"description": "Does Not Meet", "points": 0},
+                    ],
+                    "url": f"/api/v1/outcomes/{oid}",
+                }
+                course["outcome_groups"][group_ids[n % len(group_ids)]]["outcome_ids"].append(oid)
+
+
+class RateBucket:
+    """Canvas-style leaky bucket: cost accumulates, leaks over time, 403 when full."""
+
+    def __init__(self, size: float, leak_rate: float, preflight: float, cost: float):
+        self.size = size
+        self.leak_rate = leak_rate
+        self.preflight = preflight
+        self.cost = cost
+        self.used = 0.0
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _leak(self) -> None:
+        now = time.monotonic()
+        self.used = max(0.0, self.used - (now - self.stamp) * self.leak_rate)
+        self.stamp = now
+
+    def begin(self) -> bool:
+        with self.lock:
+            self._leak()
+            if self.used + self.preflight > self.size:
+                return False
+            self.used += self.preflight
+            return True
+
+    def end(self) -> Tuple[float, float]:
+        with self.lock:
+            self._leak()
+            self.used = max(0.0, self.used - self.preflight + self.cost)
+            return self.cost, self.remaining()
+
+    def remaining(self) -> float:
+        return max(0.0, self.size - self.used)
+
+
+class MockCanvasServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 resets connections when an async client
+    # opens dozens of sockets at once.
+    request_queue_size = 256
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: bool = True,
+        bucket_size: float = BUCKET_SIZE,
+        leak_rate: float = LEAK_RATE,
+        preflight_cost: float = PREFLIGHT_COST,
+        request_cost: float = REQUEST_COST,
+        max_inline_items: int = MAX_INLINE_ITEMS,
+        seed: Optional[int] = None,
+    ):
+        super().__init__((host, port), MockCanvasHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.bucket = RateBucket(bucket_size, leak_rate, preflight_cost, request_cost) if rate_limit else None
+        self.state = CanvasState(max_inline_items)
+        self.random = random.Random(seed)
+        self.stats_lock = threading.Lock()
+        self.reset_stats()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self) -> None:
+        with self.stats_lock:
+            self.stats = {
+                "requests": 0,
+                "by_method": {},
+                "by_resource": {},
+                "by_status": {},
+                "bytes_in": 0,
+                "bytes_out": 0,
+                "throttled": 0,
+                "injected_errors": 0,
+            }
+
+    def bump(self, key: str) -> None:
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def record(self, method: str, resource: str, status: int, bytes_in: int, bytes_out: int) -> None:
+        with self.stats_lock:
+            s = self.stats
+            s["requests"] += 1
+            s["by_method"][method] = s["by_method"].get(method, 0) + 1
+            key = f"{method} {resource}"
+            s["by_resource"][key] = s["by_resource"].get(key, 0) + 1
+            s["by_status"][str(status)] = s["by_status"].get(str(status), 0) + 1
+            s["bytes_in"] += bytes_in
+            s["bytes_out"] += bytes_out
+
+    def start(self) -> "MockCanvasServer":
+        """Serve in a background thread (for benchmarks and tests)."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class MockCanvasHandler(BaseHTTPRequestHandler):
+    server: MockCanvasServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY,
+    # delayed ACKs add ~40ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt: str, *args: Any) -> None:  # keep benchmark output clean
+        pass
+
+    # -- plumbing -----------------------------------------------------------
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_PATCH(self) -> None:
+        self._dispatch("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def _read_body(self) -> Tuple[bytes, Dict[str, Any], Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        parts = urlsplit(self.path)
+        query = parse_form(parse_qsl(parts.query, keep_blank_values=True))
+        body: Any = {}
+        if raw:
+            if "json" in (self.headers.get("Content-Type") or ""):
+                body = json.loads(raw.decode("utf-8"))
+            else:
+                body = parse_form(parse_qsl(raw.decode("utf-8"), keep_blank_values=True))
+        return raw, query, body
+
+    def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> int:
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+        return len(data)
+
+    def _dispatch(self, method: str) -> None:
+        srv = self.server
+        raw, query, body = self._read_body()
+        path = urlsplit(self.path).path.rstrip("/")
+
+        if path.startswith("/__mock__"):
+            if path == "/__mock__/stats":
+                with srv.stats_lock:
+                    self._send(200, srv.stats)
+            elif path == "/__mock__/reset":
+                srv.reset_stats()
+                self._send(200, {"ok": True})
+            else:
+                self._send(404, {"errors": [{"message": "not found"}]})
+            return
+
+        resource = self._resource_name(path)
+        headers: Dict[str, str] = {}
+
+        if srv.bucket is not None and not srv.bucket.begin():
+            srv.bump("throttled")
+            headers["X-Rate-Limit-Remaining"] = f"{srv.bucket.remaining():.1f}"
+            sent = self._send(403, {"errors": [{"message": "403 Forbidden (Rate Limit Exceeded)"}]}, headers)
+            srv.record(method, resource, 403, len(raw), sent)
+            return
+
+        # The pre-flight charge is held for the whole simulated latency, so
+        # many parallel requests drain the bucket the way they do on Canvas.
+        if srv.latency or srv.jitter:
+            time.sleep(max(0.0, srv.latency + srv.random.uniform(-srv.jitter, srv.jitter)) / 1000.0)
+
+        status, payload = self._injected_failure()
+        if status is None:
+            try:
+                status, payload, extra = self._route(method, path, query, body)
+                headers.update(extra)
+            except NotFound:
+                status, payload = 404, {"errors": [{"message": "The specified resource does not exist."}]}
+            except (KeyError, ValueError, TypeError, AttributeError) as e:
+                status, payload = 400, {"errors": [{"message": f"bad request: {e}"}]}
+
+        # Like Rack::ETag on Canvas: weak ETag on every 200 GET, 304 on a match.
+        if method == "GET" and status == 200:
+            digest = hashlib.md5(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+            headers["ETag"] = f'W/"{digest}"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, payload = 304, None
+
+        if srv.bucket is not None:
+            cost, remaining = srv.bucket.end()
+            headers["X-Request-Cost"] = f"{cost:.4f}"
+            headers["X-Rate-Limit-Remaining"] = f"{remaining:.1f}"
+
+        sent = self._send(status, payload, headers)
+        srv.record(method, resource, status, len(raw), sent)
+
+    def _injected_failure(self) -> Tuple[Optional[int], Any]:
+        srv = self.server
+        roll = srv.random.random()
+        if roll < srv.error_rate:
+            srv.bump("injected_errors")
+            return srv.random.choice((500, 502, 503)), {"errors": [{"message": "injected server error"}]}
+        if roll < srv.error_rate + srv.throttle_rate:
+            srv.bump("throttled")
+            if srv.random.random() < 0.5:
+                return 429, {"errors": [{"message": "Too Many Requests"}]}
+            return 403, {"errors": [{"message": "403 Forbidden (Rate Limit Exceeded)"}]}
+        return None, None
+
+    @staticmethod
+    def _resource_name(path: str) -> str:
+        """Collapse ids out of the path: /api/v1/courses/1/modules/7/items -> modules/items."""
+        segs = [s for s in path.split("/")[3:] if s and not s.isdigit()]
+        if segs and segs[0] == "courses":
+            segs = segs[1:]
+        return "/".join(segs) or "course"
+
+    # -- pagination ---------------------------------------------------------
+
+    def _paginate(self, items: List[Dict[str, Any]], query: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        per_page = min(int(query.get("per_page") or DEFAULT_PER_PAGE), MAX_PER_PAGE)
+        page = max(1, int(query.get("page") or 1))
+        last = max(1, -(-len(items) // per_page))
+        chunk = items[(page - 1) * per_page: page * per_page]
+
+        parts = urlsplit(self.path)
+        base_pairs = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in ("page", "per_page")]
+        host = self.headers.get("Host") or "%s:%s" % self.server.server_address[:2]
+
+        def link(n: int, rel: str) -> str:
+            qs = urlencode(base_pairs + [("page", n), ("per_page", per_page)])
+            return f'<http://{host}{parts.path}?{qs}>; rel="{rel}"'
+
+        links = [link(page, "current")]
+        if page < last:
+            links.append(link(page + 1, "next"))
+        if page > 1:
+            links.append(link(page - 1, "prev"))
+        links.append(link(1, "first"))
+        links.append(link(last, "last"))
+        return 200, chunk, {"Link": ",".join(links)}
+
+    # -- routing ------------------------------------------------------------
+
+    def _route(self, method: str, path: str, query: Dict[str, Any], body: Any) -> Tuple[int, Any, Dict[str, str]]:
+        state = self.server.state
+        segs = path.split("/")[1:]
+        if segs[:2] != ["api", "v1"]:
+            raise NotFound()
+        segs = segs[2:]
+
+        with state.lock:
+            if segs[:1] == ["progress"] and len(segs) == 2:
+                return self._progress(int(segs[1]))
+            if segs[:1] == ["outcomes"] and len(segs) == 2:
+                outcome = state.outcomes.get(int(segs[1]))
+                if outcome is None:
+                    raise NotFound()
+                return 200, dict(outcome), {}
+            if segs[:1] != ["courses"] or len(segs) < 2 or not segs[1].isdigit():
+                raise NotFound()
+
+            course = state.course(int(segs[1]))
+            rest = segs[2:]
+            if not rest:
+                return 200, {"id": course["id"], "name": course["name"], "time_zone": course["time_zone"]}, {}
+
+            handler = getattr(self, f"_r_{rest[0]}", None)
+            if handler is None:
+                raise NotFound()
+            return handler(method, course, rest[1:], query, body)
+
+    def _progress(self, progress_id: int) -> Tuple[int, Any, Dict[str, str]]:
+        progress = self.server.state.progress.get(progress_id)
+        if progress is None:
+            raise NotFound()
+        # Each poll moves the job along: queued -> running -> completed.
+        if progress["workflow_state"] == "queued":
+            progress["workflow_state"] = "running"
+        elif progress["workflow_state"] == "running":
+            progress["workflow_state"] = "completed"
+            progress["completion"] = 100
+        return 200, dict(progress), {}
+
+    def _list_or_404(self, store: Dict[Any, Dict[str, Any]], key: Any) -> Dict[str, Any]:
+        if key not in store:
+            raise NotFound()
+        return store[key]
+
+    # modules ---------------------------------------------------------------
+
+    def _module_json(self, course: Dict[str, Any], module: Dict[str, Any], include_items: bool) -> Dict[str, Any]:
+        out = dict(module)
+        items = course["module_items"].get(module["id"], [])
+        out["items_count"] = len(items)
+        out["items_url"] = f"http://{self.headers.get('Host')}/api/v1/courses/{course['id']}/modules/{module['id']}/items"
+        if include_items and len(items) <= self.server.state.max_inline_items:
+            out["items"] = [dict(i) for i in items]
+        return out
+
+    def _r_modules(self, method, course, rest, query, body):
+        modules = course["modules"]
+        include = query.get("include") or []
+
+        if not rest:
+            if method == "GET":
+                ordered = sorted(modules.values(), key=lambda m: m["position"])
+                return self._paginate([self._module_json(course, m, "items" in include) for m in ordered], query)
+            if method == "POST":
+                data = with_utc_dates(course, body.get("module", body))
+                mid = self.server.state.next_id()
+                module = {
+                    "id": mid,
+                    "name": data.get("name", ""),
+                    "position": len(modules) + 1,
+                    "unlock_at": data.get("unlock_at"),
+                    # Like Canvas, create ignores module[published]; a
+                    # module is published with a follow-up PUT.
+                    "published": False,
+                    "require_sequential_progress": False,
+                }
+                modules[mid] = module
+                course["module_items"][mid] = []
+                if data.get("position"):
+                    self._move(list(modules.values()), module, int(data["position"]))
+                return 200, self._module_json(course, module, False), {}
+
+        module = self._list_or_404(modules, int(rest[0]))
+        if len(rest) == 1:
+            if method == "GET":
+                return 200, self._module_json(course, module, "items" in include), {}
+            if method in ("PUT", "PATCH"):
+                data = with_utc_dates(course, body.get("module", body))
+                for key in ("name", "unlock_at", "published"):
+                    if key in data:
+                        module[key] = data[key]
+                if data.get("position"):
+                    self._move(list(modules.values()), module, int(data["position"]))
+                return 200, self._module_json(course, module, False), {}
+            if method == "DELETE":
+                del modules[module["id"]]
+                course["module_items"].pop(module["id"], None)
+                self._renumber(list(modules.values()))
+                return 200, module, {}
+
+        if rest[1] == "items":
+            items = course["module_items"][module["id"]]
+            if len(rest) == 2:
+                if method == "GET":
+                    return self._paginate([dict(i) for i in items], query)
+                if method == "POST":
+                    data = body.get("module_item", body)
+                    item = {
+                        "id": self.server.state.next_id(),
+                        "module_id": module["id"],
+                        "title": data.get("title", ""),
+                        "type": data.get("type", ""),
+                        "content_id": data.get("content_id"),
+                        "indent": data.get("indent", 0),
+                        "published": bool(data.get("published", False)),
+                        "position": len(items) + 1,
+                    }
+                    items.append(item)
+                    if data.get("position"):
+                        self._move(items, item, int(data["position"]))
+                    return 200, dict(item), {}
+            else:
+                item = next((i for i in items if i["id"] == int(rest[2])), None)
+                if item is None:
+                    raise NotFound()
+                if method == "DELETE":
+                    items.remove(item)
+                    self._renumber(items)
+                    return 200, item, {}
+                if method in ("PUT", "PATCH"):
+                    data = body.get("module_item", body)
+                    item.update({k: v for k, v in data.items() if k != "position"})
+                    if data.get("position"):
+                        self._move(items, item, int(data["position"]))
+                    return 200, dict(item), {}
+        raise NotFound()
+
+    @staticmethod
+    def _renumber(entries: List[Dict[str, Any]]) -> None:
+        for pos, entry in enumerate(sorted(entries, key=lambda e: e["position"]), start=1):
+            entry["position"] = pos
+
+    def _move(self, entries: List[Dict[str, Any]], entry: Dict[str, Any], position: int) -> None:
+        ordered = sorted((e for e in entries if e is not entry), key=lambda e: e["position"])
+        position = max(1, min(position, len(ordered) + 1))
+        ordered.insert(position - 1, entry)
+        for pos, e in enumerate(ordered, start=1):
+            e["position"] = pos
+
+    # assignment groups ----------------------------------------------------
+
+    def _r_assignment_groups(self, method, course, rest, query, body):
+        groups = course["assignment_groups"]
+        if not rest:
+            if method == "GET":
+                ordered = sorted(groups.values(), key=lambda g: g["position"])
+                return self._paginate([dict(g) for g in ordered], query)
+            if method == "POST":
+                data = body.get("assignment_group", body)
+                gid = self.server.state.next_id()
+                group = {
+                    "id": gid,
+                    "name": data.get("name", ""),
+                    "position": data.get("position") or len(groups) + 1,
+                    "group_weight": data.get("group_weight", 0),
+                }
+                groups[gid] = group
+                return 200, dict(group), {}
+        group = self._list_or_404(groups, int(rest[0]))
+        if method == "GET":
+            return 200, dict(group), {}
+        if method in ("PUT", "PATCH"):
+            group.update(body.get("assignment_group", body))
+            return 200, dict(group), {}
+        if method == "DELETE":
+            del groups[group["id"]]
+            for aid in [a["id"] for a in course["assignments"].values() if a["assignment_group_id"] == group["id"]]:
+                del course["assignments"][aid]
+            return 200, group, {}
+        raise NotFound()
+
+    # assignments ----------------------------------------------------------
+
+    def _new_assignment(self, course: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        data = with_utc_dates(course, data)
+        group_id = data.get("assignment_group_id")
+        if group_id not in course["assignment_groups"]:
+            if not course["assignment_groups"]:
+                gid = self.server.state.next_id()
+                course["assignment_groups"][gid] = {"id": gid, "name": "Assignments", "position": 1, "group_weight": 0}
+            group_id = next(iter(course["assignment_groups"]))
+        siblings = [a for a in course["assignments"].values() if a["assignment_group_id"] == group_id]
+        assignment = {
+            "id": self.server.state.next_id(),
+            "name": data.get("name", ""),
+            "description": data.get("description"),
+            "points_possible": data.get("points_possible", 0),
+            "due_at": data.get("due_at"),
+            "lock_at": data.get("lock_at"),
+            "unlock_at": data.get("unlock_at"),
+            "published": bool(data.get("published", False)),
+            "assignment_group_id": group_id,
+            "position": len(siblings) + 1,
+            "submission_types": data.get("submission_types") or ["none"],
+            "updated_at": now_iso(),
+        }
+        course["assignments"][assignment["id"]] = assignment
+        if data.get("position"):
+            self._move(siblings + [assignment], assignment, int(data["position"]))
+        return assignment
+
+    def _r_assignments(self, method, course, rest, query, body):
+        assignments = course["assignments"]
+        if not rest:
+            if method == "GET":
+                ordered = sorted(assignments.values(), key=lambda a: (a["assignment_group_id"], a["position"]))
+                return self._paginate([dict(a) for a in ordered], query)
+            if method == "POST":
+                return 200, dict(self._new_assignment(course, body.get("assignment", body))), {}
+
+        if rest[0] == "bulk_update" and method == "PUT":
+            return self._bulk_update(course, body)
+
+        assignment = self._list_or_404(assignments, int(rest[0]))
+        if len(rest) == 2 and rest[1] == "gradebook_settings":
+            settings = course["gradebook_settings"].setdefault(assignment["id"], {"post_manually": False})
+            if method in ("PUT", "PATCH"):
+                settings.update(body.get("gradebook_setting", body))
+            return 200, dict(settings), {}
+        if len(rest) > 1:
+            raise NotFound()
+        if method == "GET":
+            return 200, dict(assignment), {}
+        if method in ("PUT", "PATCH"):
+            data = with_utc_dates(course, body.get("assignment", body))
+            assignment.update({k: v for k, v in data.items() if k != "position"})
+            assignment["updated_at"] = now_iso()
+            return 200, dict(assignment), {}
+        if method == "DELETE":
+            del assignments[assignment["id"]]
+            return 200, assignment, {}
+        raise NotFound()
+
+    def _bulk_update(self, course, body):
+        entries = body if isinstance(body, list) else []
+        errors = {}
+        for entry in entries:
+            if int(entry.get("id", 0)) not in course["assignments"]:
+                errors[str(entry.get("id"))] = {"errors": ["assignment not found"]}
+        # Like Canvas, the job is all-or-nothing: any error saves none of it.
+        for entry in entries if not errors else []:
+            assignment = course["assignments"][int(entry["id"])]
+            for dates in entry.get("all_dates", []):
+                dates = with_utc_dates(course, dates)
+                if dates.get("base"):
+                    for key in ("unlock_at", "due_at", "lock_at"):
+                        if key in dates:
+                            assignment[key] = dates[key]
+                    assignment["updated_at"] = now_iso()
+        state = self.server.state
+        pid = state.next_id()
+        state.progress[pid] = {
+            "id": pid,
+            "context_id": course["id"],
+            "context_type": "Course",
+            "tag": "assignment_bulk_update",
+            "completion": 0,
+            "workflow_state": "queued",
+            "url": f"http://{self.headers.get('Host')}/api/v1/progress/{pid}",
+            "results": {"errors": errors} if errors else None,
+        }
+        if errors:
+            state.progress[pid]["workflow_state"] = "failed"
+        return 200, dict(state.progress[pid]), {}
+
+    # pages ----------------------------------------------------------------
+
+    def _find_page(self, pages: Dict[str, Dict[str, Any]], key: str) -> Dict[str, Any]:
+        if key in pages:
+            return pages[key]
+        for page in pages.values():
+            if str(page["page_id"]) == key:
+                return page
+        raise NotFound()
+
+    def _r_pages(self, method, course, rest, query, body):
+        pages = course["pages"]
+        if not rest:
+            if method == "GET":
+                listing = sorted(pages.values(), key=lambda p: p["title"].lower())
+                term = (query.get("search_term") or "").lower()
+                if term:
+                    listing = [p for p in listing if term in p["title"].lower()]
+                # Canvas leaves body out of the pages index unless include[]=body.
+                if "body" in (query.get("include") or []):
+                    return self._paginate([dict(p) for p in listing], query)
+                return self._paginate([{k: v for k, v in p.items() if k != "body"} for p in listing], query)
+            if method == "POST":
+                data = body.get("wiki_page", body)
+                slug = base = slugify(data.get("title", ""))
+                n = 1
+                while slug in pages:
+                    n += 1
+                    slug = f"{base}-{n}"
+                page = {
+                    "page_id": self.server.state.next_id(),
+                    "url": slug,
+                    "title": data.get("title", ""),
+                    "body": data.get("body", ""),
+                    "published": bool(data.get("published", False)),
+                    "updated_at": now_iso(),
+                }
+                pages[slug] = page
+                return 200, dict(page), {}
+        page = self._find_page(pages, rest[0])
+        if method == "GET":
+            return 200, dict(page), {}
+        if method in ("PUT", "PATCH"):
+            data = body.get("wiki_page", body)
+            page.update(data)
+            page["updated_at"] = now_iso()
+            return 200, dict(page), {}
+        if method == "DELETE":
+            del pages[page["url"]]
+            return 200, page, {}
+        raise NotFound()
+
+    # discussion topics ----------------------------------------------------
+
+    def _r_discussion_topics(self, method, course, rest, query, body):
+        topics = course["discussion_topics"]
+        if not rest:
+            if method == "GET":
+                listing = sorted(topics.values(), key=lambda t: t["id"])
+                term = (query.get("search_term") or "").lower()
+                if term:
+                    listing = [t for t in listing if term in t["title"].lower()]
+                return self._paginate([dict(t) for t in listing], query)
+            if method == "POST":
+                data = with_utc_dates(course, body.get("discussion_topic", body)) if isinstance(body, dict) else {}
+                assignment_id = None
+                if isinstance(data.get("assignment"), dict):
+                    spec = dict(data["assignment"])
+                    spec.setdefault("name", data.get("title", ""))
+                    spec["submission_types"] = ["discussion_topic"]
+                    assignment_id = self._new_assignment(course, spec)["id"]
+                topic = {
+                    "id": self.server.state.next_id(),
+                    "title": data.get("title", ""),
+                    "message": data.get("message", ""),
+                    "published": bool(data.get("published", False)),
+                    "pinned": bool(data.get("pinned", False)),
+                    "delayed_post_at": data.get("delayed_post_at") or data.get("unlock_at"),
+                    "lock_at": data.get("lock_at"),
+                    "assignment_id": assignment_id,
+                    # Canvas topics carry no updated_at; edits leave these as-is.
+                    "posted_at": now_iso(),
+                    "last_reply_at": None,
+                }
+                topics[topic["id"]] = topic
+                return 200, dict(topic), {}
+        topic = self._list_or_404(topics, int(rest[0]))
+        if method == "GET":
+            return 200, dict(topic), {}
+        if method in ("PUT", "PATCH"):
+            data = with_utc_dates(course, body.get("discussion_topic", body))
+            topic.update(data)
+            return 200, dict(topic), {}
+        if method == "DELETE":
+            del topics[topic["id"]]
+            return 200, topic, {}
+        raise NotFound()
+
+    # rubrics --------------------------------------------------------------
+
+    def _r_rubrics(self, method, course, rest, query, body):
+        rubrics = course["rubrics"]
+        if not rest:
+            if method == "GET":
+                return self._paginate([dict(r) for r in sorted(rubrics.values(), key=lambda r: r["id"])], query)
+            if method == "POST":
+                data = body.get("rubric", body)
+                criteria = []
+                raw = data.get("criteria") or {}
+                for key in sorted(raw, key=lambda k: int(k)):
+                    crit = raw[key]
+                    ratings_raw = crit.get("ratings") or {}
+                    ratings = [
+                        {"id": f"r{self.server.state.next_id()}", **ratings_raw[k]}
+                        for k in sorted(ratings_raw, key=lambda k: int(k))
+                    ]
+                    criteria.append({"id": f"c{self.server.state.next_id()}", **{k: v for k, v in crit.items() if k != "ratings"}, "ratings": ratings})
+                rubric = {
+                    "id": self.server.state.next_id(),
+                    "title": data.get("title", ""),
+                    "points_possible": sum(float(c.get("points") or 0) for c in criteria),
+                    "free_form_criterion_comments": data.get("free_form_criterion_comments", False),
+                    "data": criteria,
+                }
+                rubrics[rubric["id"]] = rubric
+                return 200, {"rubric": dict(rubric)}, {}
+        rubric = self._list_or_404(rubrics, int(rest[0]))
+        if method == "GET":
+            return 200, dict(rubric), {}
+        if method in ("PUT", "PATCH"):
+            data = body.get("rubric", body)
+            rubric.update({k: v for k, v in data.items() if k != "criteria"})
+            return 200, {"rubric": dict(rubric)}, {}
+        if method == "DELETE":
+            del rubrics[rubric["id"]]
+            return 200, rubric, {}
+        raise NotFound()
+
+    # outcomes -------------------------------------------------------------
+
+    def _r_outcome_groups(self, method, course, rest, query, body):
+        groups = course["outcome_groups"]
+        if not rest and method == "GET":
+            return self._paginate([{"id": g["id"], "title": g["title"]} for g in groups.values()], query)
+        group = self._list_or_404(groups, int(rest[0]))
+        if len(rest) == 2 and rest[1] == "outcomes" and method == "GET":
+            full = query.get("outcome_style") == "full"
+            links = []
+            for oid in group["outcome_ids"]:
+                outcome = self.server.state.outcomes[oid]
+                if full:
+                    entry = dict(outcome)
+                else:
+                    entry = {"id": oid, "title": outcome["title"], "url": outcome["url"]}
+                links.append({"outcome_group": {"id": group["id"]}, "outcome": entry})
+            return self._paginate(links, query)
+        if len(rest) == 1 and method == "GET":
+            return 200, {"id": group["id"], "title": group["title"]}, {}
+        raise NotFound()
+
+    # course settings ------------------------------------------------------
+
+    def _r_late_policy(self, method, course, rest, query, body):
+        if method == "GET":
+            if course["late_policy"] is None:
+                raise NotFound()
+            return 200, {"late_policy": dict(course["late_policy"])}, {}
+        if method in ("POST", "PUT", "PATCH"):
+            policy = course["late_policy"] or {"id": self.server.state.next_id(), "course_id": course["id"]}
+            policy.update(body.get("late_policy", body))
+            course["late_policy"] = policy
+            return 200, {"late_policy": dict(policy)}, {}
+        raise NotFound()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Run a local mock Canvas API server.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="Added latency per request (ms).")
+    ap.add_argument("--jitter", type=float, default=0.0, help="+/- random latency jitter (ms).")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 5xx.")
+    ap.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429/403 throttling.")
+    ap.add_argument("--no-rate-limit", action="store_true", help="Disable the leaky-bucket rate limit.")
+    ap.add_argument("--bucket-size", type=float, default=BUCKET_SIZE)
+    ap.add_argument("--leak-rate", type=float, default=LEAK_RATE)
+    ap.add_argument("--preflight-cost", type=float, default=PREFLIGHT_COST)
+    ap.add_argument("--max-inline-items", type=int, default=MAX_INLINE_ITEMS)
+    ap.add_argument("--seed-course", type=int, default=None, help="Course id to seed outcomes into.")
+    ap.add_argument("--seed-outcomes", type=int, default=0, help="Number of outcomes to seed.")
+    args = ap.parse_args()
+
+    server = MockCanvasServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit=not args.no_rate_limit,
+        bucket_size=args.bucket_size,
+        leak_rate=args.leak_rate,
+        preflight_cost=args.preflight_cost,
+        max_inline_items=args.max_inline_items,
+    )
+    if args.seed_course is not None and args.seed_outcomes:
+        server.state.seed_outcomes(args.seed_course, args.seed_outcomes)
+
+    print(f"[+] Mock Canvas listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,30 @@
-from canvasapi import Canvas
-from canvasapi.exceptions import CanvasException
+"""
+Reset a test course: delete every module and page, every assignment in the
+'Assignments' group, and every other assignment group.
+
+Everything is listed once up front and deleted in dependency tiers:
+
+  tier 1  assignments in 'Assignments', pages, modules
+  tier 2  assignment groups other than 'Assignments'
+
+Module items go with their module, and assignments in a deleted group go
+with the group, so neither is deleted one by one. Within a tier, deletes
+run concurrently (MAX_WORKERS) through the shared client's rate limiter.
+"""
 import configparser
+import threading
+
+import requests
+
+from canvas_api_utils import DEFAULT_MAX_WORKERS, get_client, run_concurrently
 
 # Config section used across the project
 CONFIG_PATH = 'etc/config.txt'
 CONFIG_SECTION = 'canvas-lms-test'
 
+# This group survives the reset; only its assignments are removed.
+KEEP_GROUP = 'Assignments'
+
 config = configparser.ConfigParser()
 config.read(CONFIG_PATH)
 
@@ -19,118 +38,97 @@ if CONFIG_SECTION not in config:
 COURSE_ID = config[CONFIG_SECTION]['COURSE_ID']
 API_TOKEN = config[CONFIG_SECTION]['API_TOKEN']
 COLLEGE_CANVAS_DOMAIN = config[CONFIG_SECTION]['CANVAS_DOMAIN_URL']
+MAX_WORKERS = int(config[CONFIG_SECTION].get('MAX_WORKERS', DEFAULT_MAX_WORKERS))
 
-# Initialize Canvas object
-canvas = Canvas(COLLEGE_CANVAS_DOMAIN, API_TOKEN)
+CLIENT = get_client(COLLEGE_CANVAS_DOMAIN, API_TOKEN)
 
-# Get the course
-try:
-    course = canvas.get_course(COURSE_ID)
-except CanvasException as e:
-    print(f"Failed to get course: {e}")
-    exit(1)
 
+def list_course_content(course_id):
+    """One paginated listing per resource type."""
+    return {
+        resource: list(CLIENT.paginate(CLIENT.course_url(course_id, resource)))
+        for resource in ('assignment_groups', 'assignments', 'modules', 'pages')
+    }
 
-def delete_assignments_in_group(canvas_url, api_key, course_id):
+
+def plan_reset(content):
     """
-    Deletes all assignments in the assignment group named 'Assignments'.
+    Turn the course listing into delete tiers.
 
-    :param canvas_url: URL of your Canvas instance
-    :param api_key: Your Canvas API key
-    :param course_id: The ID of the course in Canvas
-    :return: None
+    :return: (tiers, cascaded) where tiers is a list of lists of
+             (resource, label, path) and cascaded counts the items removed
+             along with their parent.
     """
-    # Initialize the Canvas object
-    canvas = Canvas(canvas_url, api_key)
-
-    # Get the course
-    course = canvas.get_course(course_id)
-
-    # Find the 'Assignments' group
-    assignments_group = None
-    for group in course.get_assignment_groups():
-        if group.name == 'Assignments':
-            assignments_group = group
-            break
-
-    if assignments_group:
-        # Get all assignments for the course
-        all_assignments = course.get_assignments()
-        
-        for assignment in all_assignments:
-            if assignment.assignment_group_id == assignments_group.id:
-                # Delete each assignment that belongs to the 'Assignments' group
-                assignment.delete()
-        print("All assignments in 'Assignments' group have been deleted.")
-    else:
-        print("No assignment group named 'Assignments' was found.")
-
-
-def delete_groups_and_assignments(canvas_url, api_key, course_id):
-    
-    # Initialize the Canvas object
-    canvas = Canvas(canvas_url, api_key)
-
-    # Get the course
-    course = canvas.get_course(course_id)
-
-    # Get all assignment groups
-    assignment_groups = course.get_assignment_groups()
-
-    # Get all assignment groups
-    assignment_groups = course.get_assignment_groups()
-
-    for group in assignment_groups:
-        if group.name != 'Assignments':
-            # Delete all other assignment groups
-            group.delete()
-        # else:
-        #     # For the "Assignments" group, delete all assignments
-        #     assignments = group.get_assignments()
-        #     for assignment in assignments:
-        #         assignment.delete()
-
-# Function to delete a module
-
-
-def delete_module(module):
+    keep_ids = {g['id'] for g in content['assignment_groups'] if g.get('name') == KEEP_GROUP}
+    doomed_groups = [g for g in content['assignment_groups'] if g['id'] not in keep_ids]
+    doomed_group_ids = {g['id'] for g in doomed_groups}
+
+    if not keep_ids:
+        print(f"No assignment group named '{KEEP_GROUP}' was found.")
+
+    first = []
+    cascaded = {'group assignments': 0, 'module items': 0}
+
+    for assignment in content['assignments']:
+        if assignment.get('assignment_group_id') in keep_ids:
+            first.append(('assignments', assignment['name'], f"assignments/{assignment['id']}"))
+        elif assignment.get('assignment_group_id') in doomed_group_ids:
+            cascaded['group assignments'] += 1
+
+    for page in content['pages']:
+        first.append(('pages', page['title'], f"pages/{page['url']}"))
+
+    for module in content['modules']:
+        first.append(('modules', module['name'], f"modules/{module['id']}"))
+        cascaded['module items'] += module.get('items_count') or 0
+
+    second = [('assignment_groups', g['name'], f"assignment_groups/{g['id']}") for g in doomed_groups]
+    return [first, second], cascaded
+
+
+def reset_course(course_id, max_workers=MAX_WORKERS):
+    content = list_course_content(course_id)
+    tiers, cascaded = plan_reset(content)
+
+    total = sum(len(tier) for tier in tiers)
+    tally = {}
+    done = [0]
+    lock = threading.Lock()
+
+    def delete(entry):
+        resource, label, path = entry
+        try:
+            resp = CLIENT.delete(CLIENT.course_url(course_id, path))
+            resp.raise_for_status()
+            outcome = 'deleted'
+        except requests.exceptions.RequestException as e:
+            outcome = 'failed'
+            label = f"{label} ({e})"
+
+        with lock:
+            done[0] += 1
+            counts = tally.setdefault(resource, {'deleted': 0, 'failed': 0})
+            counts[outcome] += 1
+            print(f"[{done[0]}/{total}] {outcome.capitalize()} {resource[:-1].replace('_', ' ')} '{label}'")
+
+    for tier in tiers:
+        # The next tier only starts once every delete in this one finished.
+        list(run_concurrently(delete, tier, max_workers))
+
+    print("\nReset summary:")
+    for resource, counts in tally.items():
+        print(f"  {resource:<18} deleted {counts['deleted']:>4}   failed {counts['failed']:>4}")
+    for resource, count in cascaded.items():
+        if count:
+            print(f"  {resource:<18} removed {count:>4}   with their parent")
+    return tally
+
+
+if __name__ == '__main__':
     try:
-        module.delete()
-        print(f"Module '{module.name}' deleted.")
-    except CanvasException as e:
-        print(f"Failed to delete module '{module.name}': {e}")
+        reset_course(COURSE_ID)
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to list course content: {e}")
+        exit(1)
 
-# Function to delete a page
-def delete_page(page):
-    try:
-        page.delete()
-        print(f"Page '{page.title}' deleted.")
-    except CanvasException as e:
-        print(f"Failed to delete page '{page.title}': {e}")
-try:
-    delete_assignments_in_group(COLLEGE_CANVAS_DOMAIN, API_TOKEN, COURSE_ID)
-except CanvasException as e:
-    print(f"Error fetching modules: {e}")
-
-#Fetch all modules and attempt to delete them
-try:
-    for module in course.get_modules():
-        delete_module(module)
-except CanvasException as e:
-    print(f"Error fetching modules: {e}")
-
-# Fetch all pages and attempt to delete them
-try:
-    for page in course.get_pages():
-        delete_page(page)
-except CanvasException as e:
-    print(f"Error fetching pages: {e}")
-
-try:
-    delete_groups_and_assignments(COLLEGE_CANVAS_DOMAIN, API_TOKEN, COURSE_ID)
-except CanvasException as e:
-    print(f"Error deleting assignment groups and assignments: {e}")
-
-
-
-print("Module deletion process completed.")
+    print("Module deletion process completed.")
@@ -0,0 +1,123 @@
+"""
+Regression checks run against mock_canvas_server.py.
+
+Each test gets a fresh in-process mock (and so its own shared client):
+
+  python3 -m pytest -q test_mock_canvas_server.py
+"""
+
+import argparse
+import functools
+import json
+import os
+
+import pytest
+
+import canvas_bulk_dates
+import canvas_course_plan
+from canvas_api_utils import get_client
+from canvas_module_creator import create_multiple_modules
+from mock_canvas_server import MockCanvasServer
+from update_one_discussion import match_topic, run_batch
+
+DATAFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datafiles")
+COURSE_ID = 4242
+TOKEN = "regression-token"
+
+
+def read_datafile(name, key):
+    with open(os.path.join(DATAFILES_DIR, name), "r", encoding="utf-8") as f:
+        return json.load(f)[key] if key else json.load(f)
+
+
+@pytest.fixture
+def server():
+    srv = MockCanvasServer(rate_limit=False).start()
+    yield srv
+    srv.stop()
+
+
+@pytest.fixture
+def client(server):
+    return get_client(server.url, TOKEN)
+
+
+def resource_count(server, key):
+    return server.stats["by_resource"].get(key, 0)
+
+
+def test_built_modules_end_up_published(server, client):
+    modules = read_datafile("CSTC240-module-data.json", "MODULE_NAMES")
+
+    created = create_multiple_modules(COURSE_ID, TOKEN, server.url, server.url, modules, max_workers=4)
+
+    listed = client.get(client.course_url(COURSE_ID, "modules")).json()
+    assert len(created) == len(modules)
+    assert [m["name"] for m in listed] == [m["name"] for m in modules]
+    assert all(m["published"] for m in listed)
+
+
+def test_bulk_date_fallback_leaves_no_assignment_unapplied(server, client, monkeypatch):
+    monkeypatch.setattr(canvas_bulk_dates, "wait_for_progress",
+                        functools.partial(canvas_bulk_dates.wait_for_progress, poll_interval=0.01))
+    url = client.course_url(COURSE_ID, "assignments")
+    ids = [client.post(url, json={"assignment": {"name": f"A{i}"}}).json()["id"] for i in range(5)]
+    due = "2026-02-01T04:59:00Z"
+    # An id Canvas doesn't know fails the whole bulk job.
+    updates = [{"id": aid, "unlock_at": None, "due_at": due, "lock_at": None} for aid in ids + [999999]]
+
+    def single_put(update):
+        client.put(client.course_url(COURSE_ID, f"assignments/{update['id']}"),
+                   json={"assignment": {"due_at": update["due_at"]}}).raise_for_status()
+
+    report = canvas_bulk_dates.bulk_update_assignment_dates(client, COURSE_ID, updates, single_put)
+
+    assert sorted(report["bulk"] + report["fallback"]) == sorted(ids)
+    assert report["failed"] == [999999]
+    assert all(a["due_at"] == due for a in client.get(url).json())
+
+
+def test_unchanged_discussions_are_skipped(server, client, tmp_path):
+    payload = read_datafile("CSTC240_discussions_payload.json", None)[:2]
+    topics_url = client.course_url(COURSE_ID, "discussion_topics")
+    topic_ids = [client.post(topics_url, json={"title": item["discussion_title"], "message": "<p>draft</p>"}).json()["id"]
+                 for item in payload]
+    args = argparse.Namespace(
+        course_id=str(COURSE_ID), all=True, modules=None, dry_run=False, use_async=False,
+        workers=4, hash_store=str(tmp_path / "pushed.sqlite"), force=False,
+    )
+
+    run_batch(args, server.url, TOKEN, payload)
+    assert resource_count(server, "PUT discussion_topics") == 2
+
+    # Same bodies, untouched in Canvas: nothing is sent.
+    run_batch(args, server.url, TOKEN, payload)
+    assert resource_count(server, "PUT discussion_topics") == 2
+
+    # An edit made in the Canvas UI is noticed and overwritten.
+    client.put(client.course_url(COURSE_ID, f"discussion_topics/{topic_ids[0]}"),
+               json={"message": "<p>edited by hand</p>"}).raise_for_status()
+    run_batch(args, server.url, TOKEN, payload)
+    assert resource_count(server, "PUT discussion_topics") == 4
+
+
+def test_plan_is_empty_after_apply(server, client):
+    desired = canvas_course_plan.load_desired("CSTC240", DATAFILES_DIR)
+    resources = canvas_course_plan.resources_to_read(desired)
+    tz = canvas_course_plan.course_timezone(client, COURSE_ID)
+
+    current = canvas_course_plan.fetch_current(client, COURSE_ID, resources)
+    changes = canvas_course_plan.build_plan(desired, current, tz)
+    assert changes
+    canvas_course_plan.apply_plan(client, COURSE_ID, changes, current)
+
+    # Canvas hands dates back as UTC "Z" strings; they still match the datafiles.
+    current = canvas_course_plan.fetch_current(client, COURSE_ID, resources)
+    assert canvas_course_plan.build_plan(desired, current, tz) == []
+
+
+def test_module_1_never_matches_module_10():
+    topics = [{"id": 10, "title": "Module 10 Discussion Board"}, {"id": 1, "title": "Module 1 Discussion Board: Scoping"}]
+
+    assert match_topic(topics, "Module 1 Discussion Board")["id"] == 1
+    assert match_topic(topics[:1], "Module 1 Discussion Board") is None
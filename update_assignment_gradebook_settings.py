@@ -16,20 +16,12 @@ import argparse
 import configparser
 from typing import Any, Dict
 
-import requests
+from canvas_api_utils import get_client
 
 CONFIG_PATH = "/Users/ss/etc/config.txt"
 CONFIG_SECTION = "canvas-lms-test"
 
 
-def canvas_headers(api_token: str) -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {api_token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-
-
 def gradebook_settings_url(canvas_domain_url: str, course_id: str, assignment_id: str) -> str:
     base = canvas_domain_url.rstrip("/")
     if not base.startswith("http"):
@@ -47,7 +39,7 @@ def load_config():
 
 def get_gradebook_settings(course_id: str, assignment_id: str, api_token: str, canvas_domain_url: str) -> Dict[str, Any]:
     url = gradebook_settings_url(canvas_domain_url, course_id, assignment_id)
-    resp = requests.get(url, headers=canvas_headers(api_token))
+    resp = get_client(canvas_domain_url, api_token).get(url)
     resp.raise_for_status()
     return resp.json()
 
@@ -55,7 +47,7 @@ def get_gradebook_settings(course_id: str, assignment_id: str, api_token: str, c
 def update_gradebook_settings(course_id: str, assignment_id: str, api_token: str, canvas_domain_url: str, post_manually: bool) -> Dict[str, Any]:
     url = gradebook_settings_url(canvas_domain_url, course_id, assignment_id)
     payload = {"gradebook_setting": {"post_manually": post_manually}}
-    resp = requests.put(url, headers=canvas_headers(api_token), json=payload)
+    resp = get_client(canvas_domain_url, api_token).put(url, json=payload)
     resp.raise_for_status()
     return resp.json()
 
@@ -15,6 +15,8 @@ from typing import Any, Dict
 
 import requests
 
+from canvas_api_utils import get_client
+
 CONFIG_PATH = "/Users/ss/etc/config.txt"
 CONFIG_SECTION = "canvas-lms-test"
 
@@ -26,14 +28,6 @@ LATE_MINIMUM_PERCENT = 0
 DISABLE_LATE_DEDUCTION = True  # keep late submission penalties off
 
 
-def canvas_headers(api_token: str) -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {api_token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-
-
 def late_policy_url(canvas_domain_url: str, course_id: str) -> str:
     base = canvas_domain_url.rstrip("/")
     if not base.startswith("http"):
@@ -43,7 +37,7 @@ def late_policy_url(canvas_domain_url: str, course_id: str) -> str:
 
 def get_late_policy(course_id: str, api_token: str, canvas_domain_url: str) -> Dict[str, Any]:
     url = late_policy_url(canvas_domain_url, course_id)
-    response = requests.get(url, headers=canvas_headers(api_token))
+    response = get_client(canvas_domain_url, api_token).get(url)
     response.raise_for_status()
     return response.json()
 
@@ -62,7 +56,7 @@ def set_auto_zero_late_policy(course_id: str, api_token: str, canvas_domain_url:
     if DISABLE_LATE_DEDUCTION:
         payload["late_policy"]["late_submission_deduction_enabled"] = False
 
-    response = requests.put(url, headers=canvas_headers(api_token), json=payload)
+    response = get_client(canvas_domain_url, api_token).put(url, json=payload)
     response.raise_for_status()
     return response.json()
 
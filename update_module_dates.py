@@ -1,10 +1,10 @@
 import configparser
 from datetime import datetime
 import requests
-from canvasapi import Canvas
 from canvasapi.exceptions import CanvasException
 
-from canvas_api_utils import build_course_api_url
+from canvas_api_utils import build_course_api_url, get_client
+from canvas_canvasapi import get_canvas
 
 # Year used when parsing the mm/dd values below.
 # Adjust this to the correct academic year before running.
@@ -37,10 +37,7 @@ def parse_mmdd(mmdd: str) -> datetime:
 def update_module_dates(course_id, access_token, canvas_domain_url, module_id, unlock_at, lock_at):
     """PUT updated unlock/lock dates for a module."""
     url = build_course_api_url(canvas_domain_url, course_id, f"modules/{module_id}")
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
+    client = get_client(canvas_domain_url, access_token)
     payload = {
         "module": {
             "unlock_at": unlock_at.isoformat(),
@@ -52,7 +49,7 @@ def update_module_dates(course_id, access_token, canvas_domain_url, module_id, u
     if payload["module"]["lock_at"] is None:
         payload["module"].pop("lock_at")
 
-    response = requests.put(url, json=payload, headers=headers)
+    response = client.put(url, json=payload)
     response.raise_for_status()
     return response.json()
 
@@ -67,7 +64,9 @@ def main():
     access_token = config[CONFIG_SECTION]["API_TOKEN"]
     canvas_domain_url = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"]
 
-    canvas = Canvas(canvas_domain_url, access_token)
+    # Shares the pooled client, so the module listing and the PUTs below
+    # ride one session and rate limiter, 100 modules per page.
+    canvas = get_canvas(canvas_domain_url, access_token)
     try:
         course = canvas.get_course(course_id)
     except CanvasException as exc:
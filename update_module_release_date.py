@@ -1,7 +1,9 @@
 import configparser
-import requests
 from datetime import datetime, timezone, timedelta
 
+from canvas_api_utils import get_client
+from canvas_response_cache import cache_from_config
+
 
 # --------------------------------------------------
 # Load configuration
@@ -21,6 +23,10 @@ if CONFIG_SECTION not in config:
 COURSE_ID = int(config[CONFIG_SECTION]['COURSE_ID'])
 API_TOKEN = config[CONFIG_SECTION]['API_TOKEN']
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]['CANVAS_DOMAIN_URL']
+
+# With CACHE_PATH set, the module listing is revalidated with ETags
+# instead of re-downloaded each run.
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN, cache=cache_from_config(config[CONFIG_SECTION]))
 SEMESTER_YEAR = int(config[CONFIG_SECTION].get('SEMESTER_YEAR', 2026))
 
 
@@ -66,25 +72,19 @@ def parse_mmdd_to_iso(mmdd: str, year: int) -> str:
     return dt.isoformat()
 
 
-def get_headers() -> dict:
-    return {
-        "Authorization": f"Bearer {API_TOKEN}",
-        "Accept": "application/json"
-    }
-
-
-def find_module_by_name(course_id: int, module_name: str):
+def list_modules(course_id: int):
     """
-    Return module object by its name, or None if not found.
-    Assumes < 100 modules in course (adjust per_page if needed).
+    Every module in the course, from one paginated listing.
     """
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/modules"
-    params = {"per_page": 100}
+    return CLIENT.paginate_all(url)
 
-    resp = requests.get(url, headers=get_headers(), params=params)
-    resp.raise_for_status()
 
-    for module in resp.json():
+def find_module_by_name(modules, module_name: str):
+    """
+    Return module object by its name from a listing, or None if not found.
+    """
+    for module in modules:
         if module.get("name") == module_name:
             return module
 
@@ -98,7 +98,7 @@ def update_module_unlock_date(course_id: int, module_id: int, unlock_at_iso: str
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{course_id}/modules/{module_id}"
     data = {"module[unlock_at]": unlock_at_iso}
 
-    resp = requests.put(url, headers=get_headers(), data=data)
+    resp = CLIENT.put(url, data=data)
     resp.raise_for_status()
     return resp.json()
 
@@ -112,11 +112,14 @@ def main():
     successes = []
     failures = []
 
+    # One listing for the whole schedule; names are looked up in memory.
+    modules = list_modules(COURSE_ID)
+
     for module_name, date_str in MODULE_SCHEDULE.items():
         try:
             print(f"--- Processing {module_name!r} (date {date_str}) ---")
 
-            module = find_module_by_name(COURSE_ID, module_name)
+            module = find_module_by_name(modules, module_name)
             if not module:
                 msg = f"Module {module_name!r} not found in course {COURSE_ID}."
                 print("  ERROR:", msg)
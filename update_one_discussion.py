@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 """
-Update ONE Canvas discussion topic at a time using a JSON payload file.
+Update Canvas discussion topics from a JSON payload file, one module or many.
 
 Typical flow:
   1) You identify the discussion by title (or provide topic_id directly).
   2) Script loads the payload for a given module number (1-10).
   3) Script updates discussion_topic[message] via Canvas API.
 
+Batch mode (--all or --modules 1-10) lists the course's discussion topics
+once, matches every selected payload entry against that listing, and sends
+the updates concurrently:
+
+  python3 update_one_discussion.py --course-id 12345 --all --payload ... [--dry-run]
+  python3 update_one_discussion.py --course-id 12345 --modules 1-3,7 --payload ...
+
 Requirements:
   pip install requests
 
@@ -17,12 +24,21 @@ Auth:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
+import re
 import sys
 from typing import Any, Dict, List, Optional, Tuple
+
 import requests
 
+from canvas_api_async import AsyncCanvasClient, gather_settled
+from canvas_api_utils import get_client, run_concurrently
+from canvas_push_hashes import DEFAULT_STORE_PATH, content_version, open_store
+
+DEFAULT_WORKERS = 8
+
 
 def die(msg: str, code: int = 2) -> None:
     print(f"[!] {msg}", file=sys.stderr)
@@ -44,23 +60,54 @@ def pick_module(payload: List[Dict[str, Any]], module_num: int) -> Dict[str, Any
     die(f"Module {module_num} not found in payload.")
 
 
-def canvas_headers(token: str) -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-    }
+def parse_modules(spec: str) -> List[int]:
+    """'1-3,7' -> [1, 2, 3, 7]"""
+    modules = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        try:
+            lo, hi = int(start), int(end or start)
+        except ValueError:
+            die(f"Bad --modules value: {spec!r} (expected e.g. 1-10 or 1,3,5)")
+        modules.update(range(min(lo, hi), max(lo, hi) + 1))
+    return sorted(modules)
 
 
-def find_discussion_topic_id(
+def list_discussion_topics(base_url: str, course_id: str, token: str) -> List[Dict[str, Any]]:
+    client = get_client(base_url, token)
+    return list(client.paginate(client.course_url(course_id, "discussion_topics")))
+
+
+def match_topic(topics: List[Dict[str, Any]], title: str) -> Optional[Dict[str, Any]]:
+    """
+    Topic for a payload title in an in-memory listing: the exact
+    (case-insensitive) title first, else the first title that contains it
+    as whole words, so "Module 1" never matches "Module 10".
+    """
+    wanted = title.strip().lower()
+    for t in topics:
+        if str(t.get("title", "")).strip().lower() == wanted:
+            return t
+    contains = re.compile(rf"(?<!\w){re.escape(wanted)}(?!\w)")
+    for t in topics:
+        if contains.search(str(t.get("title", "")).lower()):
+            return t
+    return None
+
+
+def find_discussion_topic(
     base_url: str, course_id: str, token: str, title: str
-) -> Optional[int]:
+) -> Optional[Dict[str, Any]]:
     """
     Canvas: GET /api/v1/courses/:course_id/discussion_topics?search_term=...
     Returns first exact title match if found; else first partial match.
     """
     url = f"{base_url}/api/v1/courses/{course_id}/discussion_topics"
     params = {"per_page": 100, "search_term": title}
-    r = requests.get(url, headers=canvas_headers(token), params=params, timeout=30)
+    r = get_client(base_url, token).get(url, params=params)
     if r.status_code != 200:
         die(f"Failed to search discussion topics ({r.status_code}): {r.text[:500]}")
     topics = r.json()
@@ -70,10 +117,34 @@ def find_discussion_topic_id(
     # exact match first
     for t in topics:
         if str(t.get("title", "")).strip().lower() == title.strip().lower():
-            return int(t["id"])
+            return t
 
     # else first result
-    return int(topics[0]["id"])
+    return topics[0]
+
+
+def find_discussion_topic_id(
+    base_url: str, course_id: str, token: str, title: str
+) -> Optional[int]:
+    topic = find_discussion_topic(base_url, course_id, token, title)
+    return int(topic["id"]) if topic else None
+
+
+def get_discussion(base_url: str, course_id: str, token: str, topic_id: int) -> Dict[str, Any]:
+    url = f"{base_url}/api/v1/courses/{course_id}/discussion_topics/{topic_id}"
+    r = get_client(base_url, token).get(url)
+    if r.status_code != 200:
+        die(f"Failed to fetch discussion topic {topic_id} ({r.status_code}): {r.text[:500]}")
+    return r.json()
+
+
+def topic_version(topic: Dict[str, Any]) -> Optional[str]:
+    """
+    Push-record version of a topic. Discussion topics carry no updated_at,
+    so the version is a hash of the message Canvas stored; an edit in the
+    UI changes it.
+    """
+    return content_version(topic.get("message"))
 
 
 def update_discussion(
@@ -88,21 +159,135 @@ def update_discussion(
     data = {"discussion_topic[message]": message_html}
 
     payload = {"message": message_html}
-    r = requests.put(url, headers={**canvas_headers(token), "Content-Type": "application/json"}, json=payload, timeout=30)
+    r = get_client(base_url, token).put(url, json=payload)
 
-    #r = requests.put(url, headers=canvas_headers(token), data=data, timeout=30)
+    #r = get_client(base_url, token).put(url, data=data)
     if r.status_code not in (200, 201):
         die(f"Update failed ({r.status_code}): {r.text[:800]}")
     return r.json()
 
 
+def plan_batch(
+    payload: List[Dict[str, Any]], modules: List[int], topics: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[int, Dict[str, Any], str]], List[str]]:
+    """Pair each selected module with its topic; returns (updates, problems)."""
+    by_module = {}
+    for item in payload:
+        by_module.setdefault(int(item.get("module", -1)), item)
+
+    updates, problems = [], []
+    for module_num in modules:
+        item = by_module.get(module_num)
+        if item is None:
+            problems.append(f"Module {module_num}: not found in payload.")
+            continue
+        title = item.get("discussion_title")
+        message_html = item.get("message_html")
+        if not title or not message_html:
+            problems.append(f"Module {module_num}: payload entry needs discussion_title and message_html.")
+            continue
+        topic = match_topic(topics, title)
+        if topic is None:
+            problems.append(f"Module {module_num}: no discussion topic matching title {title!r}.")
+            continue
+        updates.append((module_num, topic, message_html))
+    return updates, problems
+
+
+def send_batch(base_url: str, course_id: str, token: str, updates, workers: int):
+    """PUT every message on a thread pool; returns (updated topic, error string) per update."""
+    client = get_client(base_url, token)
+
+    def put_one(update):
+        _, topic, message_html = update
+        url = client.course_url(course_id, f"discussion_topics/{topic['id']}")
+        try:
+            r = client.put(url, json={"message": message_html})
+        except requests.exceptions.RequestException as e:
+            return None, str(e)
+        if r.status_code not in (200, 201):
+            return None, f"{r.status_code}: {r.text[:200]}"
+        return r.json(), None
+
+    return list(run_concurrently(put_one, updates, workers))
+
+
+async def send_batch_async(base_url: str, course_id: str, token: str, updates, workers: int):
+    """Same as send_batch, through the asyncio client."""
+    async with AsyncCanvasClient(base_url, token, concurrency=workers) as client:
+        results = await gather_settled([
+            client.update_item(course_id, "discussion_topics", topic["id"], {"message": message_html})
+            for _, topic, message_html in updates
+        ])
+    return [(updated, None if error is None else str(error)) for updated, error in results]
+
+
+def run_batch(args, base_url: str, token: str, payload: List[Dict[str, Any]]) -> None:
+    if args.all:
+        modules = sorted({int(item.get("module", -1)) for item in payload})
+    else:
+        modules = parse_modules(args.modules)
+
+    topics = list_discussion_topics(base_url, args.course_id, token)
+    updates, problems = plan_batch(payload, modules, topics)
+    for problem in problems:
+        print(f"[!] {problem}")
+
+    store = None if args.force else open_store(args.hash_store)
+    unchanged = 0
+    if store:
+        pending = []
+        for module_num, topic, message_html in updates:
+            if store.is_current(args.course_id, "discussion_topics", topic["id"], message_html, topic_version(topic)):
+                print(f"[=] Module {module_num}: {topic.get('title')!r} unchanged since last push; skipping.")
+                unchanged += 1
+            else:
+                pending.append((module_num, topic, message_html))
+        updates = pending
+
+    if args.dry_run:
+        for module_num, topic, message_html in updates:
+            print(f"[DRY RUN] Module {module_num}: would update course_id={args.course_id} "
+                  f"topic_id={topic['id']} title={topic.get('title')!r}")
+            print(message_html)
+            print()
+        if problems:
+            sys.exit(1)
+        return
+
+    if args.use_async:
+        results = asyncio.run(send_batch_async(base_url, args.course_id, token, updates, args.workers))
+    else:
+        results = send_batch(base_url, args.course_id, token, updates, args.workers)
+
+    errors = 0
+    for (module_num, topic, message_html), (updated, error) in zip(updates, results):
+        if error:
+            errors += 1
+            print(f"[!] Module {module_num}: update failed for {topic.get('title')!r} ({error})")
+            continue
+        print(f"[+] Module {module_num}: updated {topic.get('title')} (id={topic['id']})")
+        if store:
+            store.record(args.course_id, "discussion_topics", topic["id"], message_html, topic_version(updated))
+
+    failed = len(problems) + errors
+    print(f"\nUpdated {len(updates) - errors} of {len(modules)} module(s); {unchanged} unchanged since last push.")
+    if failed:
+        sys.exit(1)
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(
-        description="Update ONE Canvas discussion board at a time from a JSON payload."
+        description="Update Canvas discussion boards from a JSON payload, one module or a batch."
     )
     ap.add_argument("--course-id", required=True, help="Canvas course ID (numeric).")
-    ap.add_argument("--module", type=int, required=True, choices=range(1, 11),
-                    help="Module number 1-10 to select discussion content from payload JSON.")
+    which = ap.add_mutually_exclusive_group(required=True)
+    which.add_argument("--module", type=int, choices=range(1, 11),
+                       help="Module number 1-10 to select discussion content from payload JSON.")
+    which.add_argument("--modules", default=None,
+                       help="Batch: module numbers/ranges, e.g. 1-10 or 1,3,5-7.")
+    which.add_argument("--all", action="store_true",
+                       help="Batch: every module in the payload.")
     ap.add_argument("--payload", default="pentest_discussions_payload.json",
                     help="Path to payload JSON file.")
     ap.add_argument("--topic-id", type=int, default=None,
@@ -111,6 +296,15 @@ def main() -> None:
                     help="Discussion title to search (defaults to the title in payload for that module).")
     ap.add_argument("--dry-run", action="store_true",
                     help="Print what would be updated without calling Canvas.")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                    help="Batch: updates sent at once.")
+    ap.add_argument("--async", dest="use_async", action="store_true",
+                    help="Batch: send updates through the asyncio client instead of a thread pool.")
+    ap.add_argument("--hash-store", default=None,
+                    help=f"Record of pushed message hashes (e.g. {DEFAULT_STORE_PATH}); unchanged topics "
+                         "are skipped. Off unless given.")
+    ap.add_argument("--force", action="store_true",
+                    help="Push even if the message matches what was last pushed.")
     args = ap.parse_args()
 
     token = os.getenv("CANVAS_TOKEN")
@@ -122,6 +316,13 @@ def main() -> None:
     base_url = base_url.rstrip("/")
 
     payload = load_payload(args.payload)
+
+    if args.module is None:
+        if args.topic_id is not None or args.title:
+            die("--topic-id and --title only apply to a single --module.")
+        run_batch(args, base_url, token, payload)
+        return
+
     item = pick_module(payload, args.module)
 
     title = args.title or item.get("discussion_title")
@@ -133,10 +334,20 @@ def main() -> None:
         die("No message_html in payload item.")
 
     topic_id = args.topic_id
+    topic = None
     if topic_id is None:
-        topic_id = find_discussion_topic_id(base_url, args.course_id, token, title)
-        if topic_id is None:
+        topic = find_discussion_topic(base_url, args.course_id, token, title)
+        if topic is None:
             die(f"Could not find a discussion topic matching title: {title!r}")
+        topic_id = int(topic["id"])
+
+    store = None if args.force else open_store(args.hash_store)
+    if store:
+        if topic is None:
+            topic = get_discussion(base_url, args.course_id, token, topic_id)
+        if store.is_current(args.course_id, "discussion_topics", topic_id, message_html, topic_version(topic)):
+            print(f"[=] Unchanged since last push; skipping topic_id={topic_id} title={title!r} (use --force to push).")
+            return
 
     if args.dry_run:
         print(f"[DRY RUN] Would update course_id={args.course_id} topic_id={topic_id} title={title!r}")
@@ -144,6 +355,8 @@ def main() -> None:
         return
 
     updated = update_discussion(base_url, args.course_id, token, topic_id, message_html)
+    if store:
+        store.record(args.course_id, "discussion_topics", topic_id, message_html, topic_version(updated))
     print(f"[+] Updated: {updated.get('title')} (id={updated.get('id')})")
 
 
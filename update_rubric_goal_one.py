@@ -12,9 +12,10 @@ API docs: https://developerdocs.instructure.com/services/canvas/resources/rubric
 """
 
 import configparser
-import requests
 from typing import Dict, List
 
+from canvas_api_utils import get_client
+
 CONFIG_PATH = "etc/config.txt"
 CONFIG_SECTION = "canvas-lms-test"
 
@@ -46,39 +47,21 @@ COURSE_ID = config[CONFIG_SECTION]["COURSE_ID"]
 API_TOKEN = config[CONFIG_SECTION]["API_TOKEN"]
 CANVAS_DOMAIN_URL = config[CONFIG_SECTION]["CANVAS_DOMAIN_URL"].rstrip("/")
 
-
-def headers() -> Dict[str, str]:
-    return {"Authorization": f"Bearer {API_TOKEN}", "Accept": "application/json"}
+CLIENT = get_client(CANVAS_DOMAIN_URL, API_TOKEN)
 
 
 def fetch_rubric(rubric_id: str) -> Dict:
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/rubrics/{rubric_id}"
     params = {"include[]": "criteria"}
-    resp = requests.get(url, headers=headers(), params=params)
+    resp = CLIENT.get(url, params=params)
     resp.raise_for_status()
     return resp.json()
 
 
 def list_rubrics() -> List[Dict]:
-    rubrics: List[Dict] = []
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/rubrics"
-    params = {"per_page": 100, "include[]": "criteria"}
-    while url:
-        resp = requests.get(url, headers=headers(), params=params)
-        resp.raise_for_status()
-        rubrics.extend(resp.json())
-
-        next_url = None
-        link = resp.headers.get("Link", "")
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                next_url = part[part.find("<") + 1: part.find(">")]
-                break
-
-        url = next_url
-        params = {}
-    return rubrics
+    params = {"include[]": "criteria"}
+    return CLIENT.paginate_all(url, params=params)
 
 
 def extract_criteria(rubric: Dict) -> List[Dict]:
@@ -138,7 +121,7 @@ def build_payload(criteria: List[Dict], rubric_meta: Dict) -> Dict:
 
 def update_rubric(rubric_id: str, payload: Dict) -> Dict:
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/rubrics/{rubric_id}"
-    resp = requests.put(url, headers=headers(), data=payload)
+    resp = CLIENT.put(url, data=payload)
     resp.raise_for_status()
     return resp.json()
 
@@ -157,7 +140,7 @@ def create_rubric_with_goal(title: str) -> Dict:
         payload[f"rubric[criteria][0][ratings][{j}][points]"] = rating.get("points", 0)
 
     url = f"{CANVAS_DOMAIN_URL}/api/v1/courses/{COURSE_ID}/rubrics"
-    resp = requests.post(url, headers=headers(), data=payload)
+    resp = CLIENT.post(url, data=payload)
     resp.raise_for_status()
     return resp.json()
 